@@ -0,0 +1,80 @@
+"""Cold vs warm image-search browser latency with the persistent session.
+
+Run from the project root (needs Chrome and selenium):
+    python -m benchmarks.bench_browser_session [--repeat 5]
+
+Cold: a brand-new browser per search (the old behaviour).
+Warm: a new tab in the live session.
+Each iteration loads a local stand-in upload page and sends a file to its input.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image
+from benchmarks.common import print_table
+from benchmarks.standin_server import start_standin_server
+from core.browser_session import BrowserSession
+from core.image_search import DirectImageSearchHandler
+
+
+def upload_once(driver, url, image_path):
+    from selenium.webdriver.common.by import By
+    driver.get(url)
+    driver.find_element(By.CSS_SELECTOR, "input[type='file']").send_keys(image_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    handler = DirectImageSearchHandler()
+    if not handler.selenium_available:
+        print("[INFO] Skipped: selenium not installed")
+        return 0
+    server, base_url = start_standin_server()
+    url = f"{base_url}/upload"
+    image_path = os.path.join(tempfile.gettempdir(), "bench_browser_session.jpg")
+    Image.new("RGB", (320, 200), "gray").save(image_path, "JPEG")
+
+    try:
+        # Launch outside the measurement, like a pre-launched session
+        session = BrowserSession(handler._create_driver)
+        if session.acquire() is None:
+            print("[INFO] Skipped: no Chrome / WebDriver available")
+            return 0
+        warm = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            driver = session.acquire()
+            upload_once(driver, url, image_path)
+            warm.append(time.perf_counter() - start)
+        session.close()
+
+        cold = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            session = BrowserSession(handler._create_driver)
+            driver = session.acquire()
+            upload_once(driver, url, image_path)
+            cold.append(time.perf_counter() - start)
+            session.close()
+    finally:
+        server.shutdown()
+        os.remove(image_path)
+
+    rows = []
+    for label, samples in (("cold (new browser)", cold), ("warm (new tab)", warm)):
+        samples.sort()
+        rows.append([label, f"{samples[len(samples) // 2]:.2f}", f"{samples[0]:.2f}", f"{samples[-1]:.2f}"])
+    print_table(["search", "median s", "min s", "max s"], rows)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
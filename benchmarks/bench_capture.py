@@ -0,0 +1,120 @@
+"""Per-capture latency and allocations: legacy mss-per-call + PIL path vs the reusable zero-copy backend.
+
+Run from the project root on a desktop session:
+    python -m benchmarks.bench_capture [--size 1920x1080]
+
+Without a display (or with --synthetic) the screen grab is replaced by a
+pre-filled BGRA buffer, so only the conversion cost is compared.
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy
+from PIL import Image
+from benchmarks.common import print_table
+from core.screen_capture import CapturedFrame, ScreenCaptureBackend
+
+
+class SyntheticShot:
+    """Stand-in for an mss ScreenShot: a fresh BGRA bytearray per grab"""
+
+    def __init__(self, width, height):
+        self.width, self.height = width, height
+        self.size = (width, height)
+        self.raw = bytearray(width * height * 4)
+
+    @property
+    def bgra(self):
+        return bytes(self.raw)
+
+
+def legacy_capture(rect, synthetic):
+    """What capture_region + extract_text did before: new mss context, PIL RGB copy, numpy copy"""
+    if synthetic:
+        shot = SyntheticShot(rect["width"], rect["height"])
+    else:
+        import mss
+        with mss.mss() as sct:
+            shot = sct.grab(rect)
+    pil_img = Image.frombytes("RGB", shot.size, shot.bgra, "raw", "BGRX")
+    return numpy.array(pil_img)
+
+
+def make_new_capture(synthetic):
+    """Long-lived backend handing OCR a strided RGB view of the raw buffer"""
+    backend = ScreenCaptureBackend()
+
+    def capture(rect):
+        if synthetic:
+            shot = SyntheticShot(rect["width"], rect["height"])
+            bgra = numpy.frombuffer(shot.raw, dtype=numpy.uint8).reshape(shot.height, shot.width, 4)
+            frame = CapturedFrame(bgra)
+        else:
+            frame = backend.grab(rect)
+        return frame.rgb
+
+    return capture, backend
+
+
+def measure(func, rect, repeat):
+    """Median latency, PIL images created and peak traced (Python/NumPy) memory per call
+
+    PIL allocates pixel storage outside the Python allocator, so its copies
+    show up in the PIL image count rather than in the traced peak.
+    """
+    func(rect)  # warm up
+    samples = []
+    peaks = []
+    pil_before = Image.core.get_stats()["new_count"]
+    tracemalloc.start()
+    for _ in range(repeat):
+        baseline = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        start = time.perf_counter()
+        result = func(rect)
+        samples.append(time.perf_counter() - start)
+        peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+        del result
+    tracemalloc.stop()
+    pil_images = Image.core.get_stats()["new_count"] - pil_before
+    samples.sort()
+    return samples[len(samples) // 2], pil_images / repeat, max(peaks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", default="1920x1080")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--synthetic", action="store_true")
+    args = parser.parse_args()
+
+    width, height = (int(v) for v in args.size.lower().split("x"))
+    rect = {"left": 0, "top": 0, "width": width, "height": height}
+
+    synthetic = args.synthetic
+    if not synthetic:
+        try:
+            legacy_capture(rect, False)
+        except Exception as e:
+            print(f"[INFO] Screen grab unavailable ({e}), using synthetic buffers")
+            synthetic = True
+
+    new_capture, backend = make_new_capture(synthetic)
+    rows = []
+    for label, func in (("legacy (mss per call + PIL)", lambda r: legacy_capture(r, synthetic)),
+                        ("reusable backend + view", new_capture)):
+        seconds, pil_images, peak = measure(func, rect, args.repeat)
+        rows.append([label, f"{seconds * 1000:.2f}", f"{pil_images:.1f}", f"{peak / 1e6:.1f}"])
+    backend.close()
+
+    print(f"capture {width}x{height} ({'synthetic' if synthetic else 'screen'})")
+    print_table(["path", "median ms", "PIL images/capture", "peak traced MB"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Capture history lookups at scale: full-text search, near-duplicate matching and retention.
+
+Run from the project root:
+    python -m benchmarks.bench_capture_history [--captures 5000]
+
+Fills a throwaway database with rendered captures, then times text
+searches, hash lookups and inserts, shows how far the perceptual hash of
+a re-capture (shifted, rescaled, recompressed) is from the original
+compared with unrelated captures, and checks that retention keeps the
+store within its byte limit.
+"""
+import argparse
+import io
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy
+from PIL import Image
+
+from benchmarks.common import WORDS, print_table, render_photo_image, render_text_image, time_call
+from config import settings
+from core.capture_history import CaptureHistory, hamming, perceptual_hash
+
+
+def to_bgra(image):
+    return numpy.ascontiguousarray(numpy.array(image.convert("RGBA"))[..., [2, 1, 0, 3]])
+
+
+def recapture_variants(image):
+    """The same content captured again: a pixel off, slightly larger, or JPEG-recompressed"""
+    width, height = image.size
+    padded = Image.new("RGB", (width + 4, height + 4), "white")
+    padded.paste(image, (2, 2))
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality=60)
+    return {
+        "shifted 1px": padded.crop((1, 2, width + 1, height + 2)),
+        "4px larger": padded,
+        "jpeg q60": Image.open(io.BytesIO(buffer.getvalue())).convert("RGB"),
+    }
+
+
+def populate(history, count, seed=0):
+    """Insert count captures (mostly text, some photos), returns the source images of the first few"""
+    rng = random.Random(seed)
+    originals = []
+    for index in range(count):
+        width, height = rng.choice([(400, 120), (640, 200), (800, 300), (320, 240)])
+        if index % 5 == 4:
+            image, text = render_photo_image(width, height, seed=index), ""
+        else:
+            image, lines = render_text_image(width, height, font_size=rng.choice([14, 16, 18]), seed=index)
+            text = "\n".join(lines)
+        history.add(to_bgra(image), text, "text" if text else "image")
+        if len(originals) < 20:
+            originals.append(image)
+    return originals
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--captures", type=int, default=2000)
+    parser.add_argument("--distance", type=int, default=settings.CAPTURE_HISTORY_MATCH_DISTANCE)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench_history_") as temp_dir:
+        path = os.path.join(temp_dir, "history.db")
+        history = CaptureHistory(path, max_bytes=1 << 40, match_distance=args.distance)
+        fill_seconds, originals = time_call(populate, history, args.captures, repeat=1, warmup=0)
+        stats = history.stats()
+        print(f"{stats['captures']} captures, {stats['bytes'] / 1024 / 1024:.1f} MB, "
+              f"filled in {fill_seconds:.1f}s ({fill_seconds / args.captures * 1000:.2f} ms per add)\n")
+
+        rng = random.Random(1)
+        probe = originals[0]
+        probe_bgra = to_bgra(probe)
+        probe_hash = perceptual_hash(probe_bgra)
+        rows = []
+        for name, query in [
+            ("search 1 word", rng.choice(WORDS)),
+            ("search 3 words", " ".join(rng.sample(WORDS, 3))),
+            ("search prefix", rng.choice(WORDS)[:3]),
+            ("search no match", "xylophone"),
+        ]:
+            seconds, found = time_call(history.search, query, repeat=50)
+            rows.append([name, f"{seconds * 1000:.3f}", len(found)])
+        seconds, _ = time_call(perceptual_hash, probe_bgra, repeat=50)
+        rows.append(["perceptual hash", f"{seconds * 1000:.3f}", "-"])
+        seconds, _ = time_call(history.add, probe_bgra, "benchmark insert", "text", repeat=20)
+        rows.append(["add (thumbnail + insert)", f"{seconds * 1000:.3f}", "-"])
+        seconds, match = time_call(history.find_similar, probe_hash, probe.size, repeat=50)
+        rows.append(["near-duplicate lookup", f"{seconds * 1000:.3f}", int(match is not None)])
+        seconds, match = time_call(history.find_same, probe_bgra, repeat=50)
+        rows.append(["reuse lookup (pixel key)", f"{seconds * 1000:.3f}", int(match is not None)])
+        seconds, _ = time_call(history.find_similar, probe_hash ^ 0xFFFFFFFF, probe.size, repeat=50)
+        rows.append(["lookup, no duplicate", f"{seconds * 1000:.3f}", "-"])
+        print_table(["operation", "median ms", "results"], rows)
+
+        # Re-captures should land within the match distance, unrelated captures well outside it
+        rows = []
+        original_hashes = [perceptual_hash(to_bgra(image)) for image in originals]
+        for index, image in enumerate(originals[:8]):
+            others = min(hamming(original_hashes[index], other)
+                         for other_index, other in enumerate(original_hashes) if other_index != index)
+            distances = [hamming(original_hashes[index], perceptual_hash(to_bgra(variant)))
+                         for variant in recapture_variants(image).values()]
+            rows.append([f"capture {index} {image.size[0]}x{image.size[1]}", *distances, others])
+        print()
+        print_table(["capture", *recapture_variants(originals[0]), "nearest other"], rows)
+        history.close()
+
+        # Retention: a store capped at a quarter of the filled size stays under its cap
+        limit = max(1, stats["bytes"] // 4)
+        capped = CaptureHistory(path, max_bytes=limit)
+        capped.add(probe_bgra, "retention check", "text")
+        after = capped.stats()
+        print(f"\nretention at {limit / 1024:.0f} KB: {after['captures']} captures kept, "
+              f"{after['bytes'] / 1024:.0f} KB, database file {os.path.getsize(path) / 1024:.0f} KB")
+        capped.close()
+
+
+if __name__ == "__main__":
+    main()
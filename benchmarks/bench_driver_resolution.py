@@ -0,0 +1,71 @@
+"""chromedriver resolution (cold, cached, offline) against Chrome launch time.
+
+Run from the project root (needs Chrome, selenium and webdriver-manager):
+    python -m benchmarks.bench_driver_resolution [--repeat 5] [--no-launch]
+
+cold:    empty cache, ChromeDriverManager().install() runs
+cached:  cache hit for the installed browser version
+offline: cache keyed by another version and install() failing (no network)
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import print_table
+from core.driver_cache import DriverPathCache
+
+
+def no_network():
+    raise ConnectionError("offline")
+
+
+def time_resolve(cache):
+    start = time.perf_counter()
+    path = cache.resolve()
+    return time.perf_counter() - start, path, dict(cache.timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--no-launch", action="store_true", help="skip timing the browser launch")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="bench_driver_")
+    cache_path = os.path.join(work_dir, "driver_cache.json")
+    rows = []
+    try:
+        seconds, driver_path, timings = time_resolve(DriverPathCache(cache_path))
+        rows.append(["cold", f"{seconds * 1000:.1f}", f"{timings.get('version_probe', 0) * 1000:.1f}", timings.get("source")])
+
+        for _ in range(args.repeat):
+            seconds, _, timings = time_resolve(DriverPathCache(cache_path))
+        rows.append(["cached", f"{seconds * 1000:.1f}", f"{timings.get('version_probe', 0) * 1000:.1f}", timings.get("source")])
+
+        offline = DriverPathCache(cache_path, install_driver=no_network, version_probe=lambda: "0.0.0.0")
+        seconds, offline_path, timings = time_resolve(offline)
+        rows.append(["offline", f"{seconds * 1000:.1f}", f"{timings.get('version_probe', 0) * 1000:.1f}",
+                     f"{timings.get('source')} -> {'found' if offline_path else 'none'}"])
+
+        if not args.no_launch and driver_path:
+            from selenium import webdriver
+            from selenium.webdriver.chrome.service import Service as ChromeService
+            options = webdriver.ChromeOptions()
+            options.add_argument("--headless=new")
+            start = time.perf_counter()
+            driver = webdriver.Chrome(service=ChromeService(driver_path), options=options)
+            rows.append(["browser launch", f"{(time.perf_counter() - start) * 1000:.1f}", "", ""])
+            driver.quit()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print_table(["step", "total ms", "version probe ms", "source"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Hotkey listener idle wakeups and burst coalescing.
+
+Run from the project root:
+    python -m benchmarks.bench_hotkeys [--idle 3] [--presses 50]
+
+Idle: voluntary context switches of the process while nothing is pressed,
+for no listener, the old sleep(0.1) polling loop and the current listener
+(needs pynput and a desktop session; Unix only, Windows has no portable
+counter). Burst: synthetic presses fed to the listener's callback; only
+the first of a burst should reach the app. tests/test_hotkeys.py asserts
+both.
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import print_table
+from utils.hotkey_manager import PYNPUT_AVAILABLE, GlobalHotkeyListener
+
+
+try:
+    import resource
+except ImportError:
+    resource = None  # Windows
+
+
+def context_switches():
+    """Voluntary context switches of all threads of this process, or None where unsupported"""
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_nvcsw
+
+
+def idle_wakeups(seconds, start=None, stop=None):
+    """Voluntary context switches per second while idling with start()/stop() around, or None"""
+    if context_switches() is None:
+        return None
+    if start:
+        start()
+    time.sleep(0.2)  # settle after startup
+    before = context_switches()
+    time.sleep(seconds)
+    wakeups = context_switches() - before
+    if stop:
+        stop()
+    return wakeups / seconds
+
+
+def polling_loop():
+    """The previous listener thread body"""
+    state = {"active": True}
+
+    def run():
+        while state["active"]:
+            time.sleep(0.1)
+
+    thread = threading.Thread(target=run, daemon=True)
+    return (thread.start, lambda: (state.update(active=False), thread.join()))
+
+
+def burst(presses, interval, debounce):
+    """Feed presses to a listener's callback, returns (emitted, dropped)"""
+    listener = GlobalHotkeyListener(debounce_seconds=debounce)
+    listener.active = True  # callbacks only, no OS hook
+    fired = []
+    listener.hotkey_triggered.connect(fired.append)
+    for _ in range(presses):
+        listener._on_hotkey("show_overlay")
+        time.sleep(interval)
+    return len(fired), listener.dropped
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--idle", type=float, default=3.0, help="idle seconds per measurement")
+    parser.add_argument("--presses", type=int, default=50)
+    args = parser.parse_args()
+
+    def rate(*hooks):
+        wakeups = idle_wakeups(args.idle, *hooks)
+        return "n/a (no counter on this OS)" if wakeups is None else f"{wakeups:.1f}"
+
+    rows = [["no listener", rate()], ["old polling loop", rate(*polling_loop())]]
+    if PYNPUT_AVAILABLE:
+        listener = GlobalHotkeyListener()
+        try:
+            rows.append(["event-driven listener", rate(listener.start_listening, listener.stop_listening)])
+        except Exception as e:
+            print(f"[WARNING] Listener could not start here: {e}")
+    else:
+        rows.append(["event-driven listener", "n/a (pynput missing)"])
+    print_table(["idle", "wakeups/s"], rows)
+    print()
+
+    rows = []
+    for interval in (0.005, 0.05, 0.5):
+        fired, dropped = burst(args.presses if interval < 0.5 else 5, interval, 0.3)
+        rows.append([f"every {interval * 1000:.0f}ms", fired + dropped, fired, dropped])
+    print_table(["burst", "presses", "emitted", "coalesced"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Browserless HTTP upload vs the Selenium upload path: latency and memory.
+
+Run from the project root:
+    python -m benchmarks.bench_http_upload [--repeat 10] [--skip-selenium]
+
+Both paths upload the same JPEG to a local stand-in server. HTTP memory is
+the Python peak (tracemalloc) of an upload; Selenium memory is the resident
+size of the chromedriver/Chrome process tree (needs psutil), which the HTTP
+path does not start at all.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import print_table, render_photo_image
+from benchmarks.standin_server import start_standin_server
+from core.http_upload import HTTPUploadBackend
+
+
+def child_rss_mb():
+    """RSS of all child processes (chromedriver, Chrome), or None without psutil"""
+    try:
+        import psutil
+    except ImportError:
+        return None
+    total = 0
+    for child in psutil.Process().children(recursive=True):
+        try:
+            total += child.memory_info().rss
+        except psutil.Error:
+            pass
+    return total / 1024 / 1024
+
+
+def bench_http(base_url, image_bytes, repeat):
+    backend = HTTPUploadBackend(f"{base_url}/searchbyimage/upload")
+    samples = []
+    tracemalloc.start()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        assert backend.upload(image_bytes)
+        samples.append(time.perf_counter() - start)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    backend.close()
+    return samples, f"{peak / 1024 / 1024:.1f} (python peak)"
+
+
+def bench_selenium(base_url, image_path, repeat):
+    from selenium.webdriver.common.by import By
+    from core.image_search import DirectImageSearchHandler
+    handler = DirectImageSearchHandler()
+    samples = []
+    rss = None
+    for index in range(repeat):
+        start = time.perf_counter()
+        driver = handler.session.acquire()
+        driver.get(f"{base_url}/upload")
+        driver.find_element(By.CSS_SELECTOR, "input[type='file']").send_keys(image_path)
+        samples.append(time.perf_counter() - start)
+        if index == 0:
+            rss = child_rss_mb()
+    handler.session.close()
+    return samples, f"{rss:.1f} (browser RSS)" if rss is not None else "n/a (install psutil)"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--skip-selenium", action="store_true")
+    args = parser.parse_args()
+
+    server, base_url = start_standin_server()
+    image = render_photo_image(1200, 800)
+    image_path = os.path.join(tempfile.gettempdir(), "bench_http_upload.jpg")
+    image.save(image_path, "JPEG", quality=85)
+    with open(image_path, "rb") as f:
+        image_bytes = f.read()
+
+    results = [("http (pooled keep-alive)",) + bench_http(base_url, image_bytes, args.repeat)]
+    if not args.skip_selenium:
+        try:
+            results.append(("selenium (first = cold launch)",) + bench_selenium(base_url, image_path, args.repeat))
+        except Exception as e:
+            print(f"[WARNING] Selenium path skipped: {e}")
+    server.shutdown()
+    os.remove(image_path)
+
+    rows = []
+    for label, samples, memory in results:
+        first, rest = samples[0], sorted(samples[1:]) or [samples[0]]
+        rows.append([label, f"{first * 1000:.0f}", f"{rest[len(rest) // 2] * 1000:.1f}", memory])
+    print_table(["path", "first ms", "median next ms", "memory MB"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Search-image encoding: old save-to-file path vs the in-memory encoder.
+
+Run from the project root:
+    python -m benchmarks.bench_image_encoding [--repeat 5]
+
+old: LANCZOS thumbnail, JPEG q85 written to a file, then the fallback's
+     second JPEG q90 encode of the full-size capture
+new: one in-memory ImageEncoder.encode() (box-reduced downscale, PNG for
+     flat captures, JPEG quality stepped down to the byte budget)
+"""
+import argparse
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image
+from benchmarks.common import print_table, render_icon_image, render_photo_image, render_text_image, time_call
+from config import settings
+from utils.image_processing import ImageEncoder
+
+
+def old_encode(image):
+    img = image.copy()
+    if img.size[0] > 1200 or img.size[1] > 800:
+        img.thumbnail((1200, 800), Image.Resampling.LANCZOS)
+    first = io.BytesIO()
+    img.save(first, "JPEG", quality=85)
+    second = io.BytesIO()
+    image.save(second, "JPEG", quality=90)
+    return len(first.getvalue()) + len(second.getvalue())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    encoder = ImageEncoder(settings.IMAGE_SEARCH_MAX_SIZE, settings.IMAGE_SEARCH_BYTE_BUDGET)
+    cases = [
+        ("photo 3840x2160", render_photo_image(3840, 2160)),
+        ("photo 800x600", render_photo_image(800, 600)),
+        ("text 1920x1080", render_text_image(1920, 1080)[0]),
+        ("icon 512x512", render_icon_image(512)),
+    ]
+    rows = []
+    for label, image in cases:
+        old_seconds, old_bytes = time_call(old_encode, image, repeat=args.repeat)
+        new_seconds, encoded = time_call(encoder.encode, image, repeat=args.repeat)
+        rows.append([label, f"{old_seconds * 1000:.1f}", f"{old_bytes // 1024}",
+                     f"{new_seconds * 1000:.1f}", f"{len(encoded.data) // 1024}",
+                     f"{encoded.format} q{encoded.quality}" if encoded.quality else encoded.format])
+    print_table(["image", "old ms", "old KB written", "new ms", "new KB", "choice"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""RSS before and after unloading the OCR reader, with and without returning memory to the OS.
+
+Run from the project root:
+    python -m benchmarks.bench_memory_governor            # real EasyOCR reader
+    python -m benchmarks.bench_memory_governor --synthetic --mb 300
+
+--synthetic stands in for the model with many heap allocations of model-like
+sizes, which is enough to show the allocator holding on to freed memory.
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import ocr_skip_reason, print_table, render_text_image
+from core.memory_governor import MemoryGovernor, get_rss_bytes, release_memory
+from core.ocr_processor import OCRProcessor
+
+
+SURVIVORS = []  # long-lived objects allocated alongside the model
+
+
+def rss_mb():
+    rss = get_rss_bytes()
+    return rss / 1024 / 1024 if rss is not None else float("nan")
+
+
+def load(processor, synthetic_mb):
+    if synthetic_mb:
+        # Small heap blocks with a few survivors interleaved: freed pages sit inside
+        # the heap, where the allocator keeps them until it is asked to trim
+        blocks = [bytearray(8 * 1024) for _ in range(synthetic_mb * 128)]
+        SURVIVORS.extend(blocks[::256])
+        processor.reader = blocks
+        processor.last_used = time.monotonic()
+    else:
+        processor.warm_up()
+        processor.cache = None
+        processor.extract_text(render_text_image(800, 200)[0])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--synthetic", action="store_true")
+    parser.add_argument("--mb", type=int, default=300, help="synthetic model size")
+    args = parser.parse_args()
+    synthetic_mb = args.mb if args.synthetic else 0
+
+    processor = OCRProcessor()
+    skip_reason = None if synthetic_mb else ocr_skip_reason(processor)
+    if skip_reason:
+        print(f"[INFO] Skipped: {skip_reason} (--synthetic measures without it)")
+        return 0
+    processor.cache = None
+    rows = [["baseline", f"{rss_mb():.1f}"]]
+
+    load(processor, synthetic_mb)
+    rows.append(["reader loaded", f"{rss_mb():.1f}"])
+    processor.unload()
+    gc.collect()
+    rows.append(["del reader + gc (old cleanup)", f"{rss_mb():.1f}"])
+    release_memory()
+    rows.append(["+ malloc_trim / EmptyWorkingSet", f"{rss_mb():.1f}"])
+
+    load(processor, synthetic_mb)
+    rows.append(["reloaded on demand", f"{rss_mb():.1f}"])
+    governor = MemoryGovernor(processor, idle_seconds=0.1, rss_watermark_mb=0)
+    time.sleep(0.2)
+    start = time.perf_counter()
+    governor.unload("benchmark")
+    rows.append([f"governor unload ({(time.perf_counter() - start) * 1000:.0f} ms)", f"{rss_mb():.1f}"])
+    print_table(["state", "RSS MB"], rows)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""Throughput of batched vs serial OCR for multi-region captures.
+
+Run from the project root (needs easyocr and torch):
+    python -m benchmarks.bench_multi_region [--counts 2 5 10 15] [--repeat 3]
+
+Each capture is the first N crops of the seeded screenshot corpus
+(core/ocr_corpus.py): UI labels of mixed sizes plus paragraphs. "serial"
+calls extract_text once per region, as separate selections would;
+"batched" is one extract_text_batch call, as a multi-region selection
+does. Reported: regions per second for both, the speedup and the mean
+character accuracy of each (padding must not change what is read).
+"""
+import argparse
+import os
+import statistics
+import sys
+import numpy
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import ocr_skip_reason, print_table, time_call
+from core.ocr_batch import plan_batches
+from core.ocr_corpus import screenshot_corpus, text_accuracy
+from core.ocr_processor import OCRProcessor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--counts", nargs="+", type=int, default=[2, 5, 10, 15])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--pad-ratio", type=float, default=None, help="default: OCR_BATCH_MAX_PAD_RATIO")
+    args = parser.parse_args()
+
+    processor = OCRProcessor()
+    skip_reason = ocr_skip_reason(processor)
+    if skip_reason:
+        print(f"[INFO] Skipped: {skip_reason}")
+        return 0
+    processor.cache = None  # measure inference, not cache hits
+    processor.tiling_enabled = False
+    if args.pad_ratio is not None:
+        processor.batch_max_pad_ratio = args.pad_ratio
+    processor.warm_up()
+
+    corpus = screenshot_corpus()
+    rows = []
+    for count in args.counts:
+        regions = corpus[:count]
+        images = [numpy.asarray(image) for _, image, _ in regions]
+        expected = [text for _, _, text in regions]
+        calls = len(plan_batches([image.shape for image in images], processor.batch_max_pad_ratio,
+                                 processor.batch_max_size))
+
+        serial_s, serial_texts = time_call(lambda: [processor.extract_text(image) for image in images],
+                                           repeat=args.repeat)
+        batched_s, batched_texts = time_call(processor.extract_text_batch, images, repeat=args.repeat)
+        rows.append([
+            len(images),
+            calls,
+            f"{len(images) / serial_s:.1f}",
+            f"{len(images) / batched_s:.1f}",
+            f"{serial_s / batched_s:.2f}x",
+            f"{statistics.mean(map(text_accuracy, expected, serial_texts)) * 100:.1f}%",
+            f"{statistics.mean(map(text_accuracy, expected, batched_texts)) * 100:.1f}%",
+        ])
+
+    print_table(["regions", "batch calls", "serial reg/s", "batched reg/s", "speedup",
+                 "serial acc", "batched acc"], rows)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
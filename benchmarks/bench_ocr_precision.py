@@ -0,0 +1,84 @@
+"""OCR accuracy vs latency per inference precision on a fixed screenshot corpus.
+
+Run from the project root (needs easyocr and torch):
+    python -m benchmarks.bench_ocr_precision [--precisions fp32 int8 int8-bf16] [--repeat 3]
+
+Every mode reads the same seeded corpus of UI labels and paragraphs
+(core/ocr_corpus.py). Reported per mode: mean character accuracy, exact
+matches, median and total latency, load time and the resident size of
+the network weights.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import ocr_skip_reason, print_table
+from core.ocr_corpus import screenshot_corpus, text_accuracy
+from core.ocr_precision import PRECISIONS, model_bytes
+from core.ocr_processor import OCRProcessor
+
+
+def evaluate(precision, corpus, repeat):
+    processor = OCRProcessor()
+    processor.cache = None  # measure inference, not cache hits
+    processor.tiling_enabled = False
+    processor.precision = precision
+    load_seconds = processor.warm_up()
+    latencies, scores, exact = [], [], 0
+    for _, image, expected in corpus:
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            text = processor.extract_text(image)
+            samples.append(time.perf_counter() - start)
+        latencies.append(statistics.median(samples))
+        score = text_accuracy(expected, text)
+        scores.append(score)
+        exact += score == 1.0
+    weights = model_bytes(processor.reader)
+    processor.cleanup()
+    return {
+        "accuracy": statistics.mean(scores),
+        "exact": exact,
+        "median_ms": statistics.median(latencies) * 1000,
+        "total_s": sum(latencies),
+        "load_s": load_seconds,
+        "weights_mb": weights / 1024 / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--precisions", nargs="+", default=list(PRECISIONS), choices=PRECISIONS)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    skip_reason = ocr_skip_reason(OCRProcessor())
+    if skip_reason:
+        print(f"[INFO] Skipped: {skip_reason}")
+        return 0
+    corpus = screenshot_corpus()
+    rows = []
+    baseline = None
+    for precision in args.precisions:
+        result = evaluate(precision, corpus, args.repeat)
+        baseline = baseline or result
+        rows.append([
+            precision,
+            f"{result['accuracy'] * 100:.1f}%",
+            f"{result['exact']}/{len(corpus)}",
+            f"{result['median_ms']:.0f}",
+            f"{result['total_s']:.2f}",
+            f"{baseline['total_s'] / result['total_s']:.2f}x",
+            f"{result['load_s']:.1f}",
+            f"{result['weights_mb']:.1f}",
+        ])
+    print_table(["precision", "char acc", "exact", "median ms", "corpus s", "speedup", "load s", "weights MB"], rows)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+"""Latency of whole-image vs tiled OCR against selection area.
+
+Run from the project root:
+    python -m benchmarks.bench_ocr_tiling
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import ocr_skip_reason, render_text_image, time_call, print_table
+from core.ocr_processor import OCRProcessor
+
+SIZES = [(800, 600), (1920, 1080), (2560, 1440), (3840, 2160), (5760, 2160)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--tile-size", type=int, default=1024)
+    parser.add_argument("--overlap", type=int, default=96)
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) // 2))
+    args = parser.parse_args()
+
+    processor = OCRProcessor()
+    skip_reason = ocr_skip_reason(processor)
+    if skip_reason:
+        print(f"[INFO] Skipped: {skip_reason}")
+        return 0
+    processor.cache = None  # measure inference, not cache hits
+    processor.warm_up()
+    processor.tile_size = args.tile_size
+    processor.tile_overlap = args.overlap
+    processor.tile_workers = args.workers
+    processor.tiling_min_pixels = 0
+
+    rows = []
+    for width, height in SIZES:
+        image, _ = render_text_image(width, height)
+        timings = {}
+        for label, enabled, mode in (("full", False, "threads"), ("tiled", True, "threads"), ("batched", True, "batched")):
+            processor.tiling_enabled = enabled
+            processor.tile_mode = mode
+            seconds, _ = time_call(processor.extract_text, image, repeat=args.repeat, warmup=0)
+            timings[label] = seconds
+        rows.append([
+            f"{width}x{height}",
+            f"{width * height / 1e6:.1f}",
+            f"{timings['full']:.2f}",
+            f"{timings['tiled']:.2f}",
+            f"{timings['batched']:.2f}",
+            f"{timings['full'] / timings['tiled']:.2f}x",
+        ])
+
+    print_table(["selection", "Mpx", "full s", "tiled s", "batched s", "speedup"], rows)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+"""Overlay paint cost while dragging a selection on a large virtual desktop.
+
+Run from the project root (works headless):
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_overlay_paint [--width 11520 --height 2160]
+
+A 1000 Hz mouse drag is replayed against the old overlay (full-window
+repaint on every move) and the current one (dirty-rect repaint from a
+cached dim tile, moves coalesced to the refresh rate). Reported are the
+frames painted, paint time per frame and process CPU time for the drag.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtCore import QEvent, QEventLoop, QPoint, QPointF, QRect, QTimer, Qt
+from PySide6.QtGui import QColor, QMouseEvent, QPainter, QPen
+from PySide6.QtWidgets import QApplication
+
+from benchmarks.common import print_table
+from overlay import OverlayWindow
+
+
+class LegacyOverlay(OverlayWindow):
+    """The previous behaviour: repaint the whole window on every mouse move"""
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.fillRect(self.rect(), QColor(0, 0, 0, 80))
+        if self.is_selecting:
+            selection_rect = QRect(self.begin_pos, self.end_pos).normalized()
+            painter.setCompositionMode(QPainter.CompositionMode_Clear)
+            painter.fillRect(selection_rect, Qt.transparent)
+            painter.setCompositionMode(QPainter.CompositionMode_SourceOver)
+            painter.setPen(QPen(QColor("#FFFFFF"), 2, Qt.SolidLine))
+            painter.setBrush(Qt.NoBrush)
+            painter.drawRect(selection_rect)
+
+    def mouseMoveEvent(self, event):
+        if self.is_selecting:
+            self.end_pos = event.position().toPoint()
+            self.update()
+
+
+class PaintTimer:
+    """Wraps an overlay's paintEvent to record per-frame paint time"""
+
+    def __init__(self, overlay):
+        self.samples = []
+        paint = overlay.paintEvent
+
+        def timed_paint(event):
+            start = time.perf_counter()
+            paint(event)
+            self.samples.append(time.perf_counter() - start)
+        overlay.paintEvent = timed_paint
+
+
+def mouse_event(kind, point):
+    button = Qt.NoButton if kind == QEvent.MouseMove else Qt.LeftButton
+    buttons = Qt.NoButton if kind == QEvent.MouseButtonRelease else Qt.LeftButton
+    position = QPointF(point)
+    return QMouseEvent(kind, position, position, button, buttons, Qt.NoModifier)
+
+
+def drag(app, overlay, width, height, moves, move_interval):
+    """Replay a diagonal drag inside the event loop; returns (wall seconds, cpu seconds)"""
+    start_point = QPoint(width // 8, height // 8)
+    press = mouse_event(QEvent.MouseButtonPress, start_point)
+    app.sendEvent(overlay, press)
+    state = {"step": 0}
+
+    def next_move():
+        state["step"] += 1
+        step = state["step"]
+        point = QPoint(start_point.x() + step * width // (2 * moves), start_point.y() + step * height // (2 * moves))
+        move = mouse_event(QEvent.MouseMove, point)
+        app.sendEvent(overlay, move)
+        if step >= moves:
+            mouse_timer.stop()
+            # Let the last coalesced frame paint
+            QTimer.singleShot(50, loop.quit)
+
+    loop = QEventLoop()
+    mouse_timer = QTimer()
+    mouse_timer.setTimerType(Qt.PreciseTimer)
+    mouse_timer.setInterval(max(1, round(move_interval * 1000)))
+    mouse_timer.timeout.connect(next_move)
+    wall, cpu = time.perf_counter(), time.process_time()
+    mouse_timer.start()
+    loop.exec()
+    return time.perf_counter() - wall, time.process_time() - cpu
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--width", type=int, default=11520, help="virtual desktop width (3 x 4K)")
+    parser.add_argument("--height", type=int, default=2160)
+    parser.add_argument("--moves", type=int, default=500)
+    parser.add_argument("--mouse-hz", type=float, default=1000.0)
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    rows = []
+    for label, overlay_class in (("old (full repaint)", LegacyOverlay), ("new (dirty rect)", OverlayWindow)):
+        overlay = overlay_class()
+        overlay.setGeometry(0, 0, args.width, args.height)
+        overlay.show()
+        timer = PaintTimer(overlay)
+        wall, cpu = drag(app, overlay, args.width, args.height, args.moves, 1.0 / args.mouse_hz)
+        overlay.hide()
+        samples = sorted(timer.samples) or [0.0]
+        rows.append([label, len(timer.samples), f"{statistics.mean(samples) * 1000:.2f}",
+                     f"{samples[int(len(samples) * 0.95) - 1 if len(samples) > 1 else 0] * 1000:.2f}",
+                     f"{cpu:.2f}", f"{cpu / wall * 100:.0f}%"])
+        overlay.deleteLater()
+    print(f"{args.width}x{args.height} desktop, {args.moves} moves at {args.mouse_hz:.0f} Hz")
+    print_table(["overlay", "frames", "mean paint ms", "p95 paint ms", "cpu s", "cpu load"], rows)
+
+
+if __name__ == "__main__":
+    main()
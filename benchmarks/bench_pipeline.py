@@ -0,0 +1,261 @@
+"""Per-stage and end-to-end latency of capture -> OCR -> dispatch, checked against baselines.
+
+Run from the project root (headless; no display, GPU or network needed):
+    python -m benchmarks.bench_pipeline [--stages ...] [--repeat 20] [--json results.json]
+    python -m benchmarks.bench_pipeline --update-baseline
+
+Screens are synthetic rendered text and photos. The screen grab reads a
+pre-rendered BGRA desktop, and webbrowser, the clipboard and the browser
+upload are stubbed, so only this project's own work is timed. OCR stages
+need easyocr and are skipped without it.
+
+Every stage's median is compared with benchmarks/baselines.json:
+``budgets_ms`` are absolute limits for any machine, and a machine that
+recorded a baseline with --update-baseline must also stay within
+``tolerance`` of its own medians (and ``min_regression_ms``, so jitter
+in sub-millisecond stages is not a regression). The exit code is 1 when a stage is over
+budget or regressed.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import webbrowser
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy
+from benchmarks.common import print_table, render_photo_image, render_text_image
+
+BASELINES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+SCREEN_SIZE = (1920, 1080)
+TEXT_RECT = {"left": 40, "top": 40, "width": 800, "height": 300}
+PHOTO_RECT = {"left": 1000, "top": 100, "width": 640, "height": 480}
+
+
+class SyntheticScreen:
+    """Stand-in for an mss instance: grabs copy out of a pre-rendered BGRA desktop, like mss does"""
+
+    class Shot:
+        def __init__(self, raw, width, height):
+            self.raw, self.width, self.height = raw, width, height
+
+    def __init__(self):
+        text, _ = render_text_image(*SCREEN_SIZE, font_size=16)
+        desktop = numpy.array(text.convert("RGBA"))[..., [2, 1, 0, 3]]
+        photo = render_photo_image(PHOTO_RECT["width"], PHOTO_RECT["height"])
+        top, left = PHOTO_RECT["top"], PHOTO_RECT["left"]
+        desktop[top:top + PHOTO_RECT["height"], left:left + PHOTO_RECT["width"]] = \
+            numpy.array(photo.convert("RGBA"))[..., [2, 1, 0, 3]]
+        self.desktop = numpy.ascontiguousarray(desktop)
+
+    def grab(self, rect):
+        box = self.desktop[rect["top"]:rect["top"] + rect["height"], rect["left"]:rect["left"] + rect["width"]]
+        return self.Shot(bytearray(box.tobytes()), rect["width"], rect["height"])
+
+    def close(self):
+        pass
+
+
+class StubClipboard:
+    def __init__(self):
+        self.text = None
+
+    def copy(self, text):
+        self.text = text
+
+
+def machine_fingerprint():
+    """Identifies a machine's baseline: OS, architecture, CPU model and count, Python version"""
+    cpu = platform.processor()
+    try:
+        with open("/proc/cpuinfo") as f:
+            cpu = next((line.split(":", 1)[1].strip() for line in f if line.startswith("model name")), cpu)
+    except OSError:
+        pass
+    return f"{platform.system()} {platform.machine()} {cpu or 'cpu'} x{os.cpu_count()} py{sys.version_info[0]}.{sys.version_info[1]}"
+
+
+def build_pipeline(temp_dir):
+    """Engine and image handler wired to the synthetic screen and stubbed outside world"""
+    import core.direct_search_engine as engine_module
+    from core.direct_search_engine import DirectSearchEngine
+    from core.image_search import DirectImageSearchHandler
+    from core.ocr_processor import OCRProcessor
+    from utils.temp_store import TempFileStore
+
+    webbrowser.open = lambda url, *args, **kwargs: True
+    engine_module.pyperclip = StubClipboard()
+
+    ocr_processor = OCRProcessor(use_daemon=False)
+    ocr_processor.cache = None  # measure inference, not cache hits
+    engine = DirectSearchEngine(ocr_processor=ocr_processor)
+    engine.history_enabled = False  # repeats would be served from the capture history
+    engine.capture_backend._local.sct = SyntheticScreen()
+
+    handler = DirectImageSearchHandler()
+    handler.upload_backend = None       # no network upload
+    handler.selenium_available = False  # no browser: encode, save and open the page
+    handler.temp_store = TempFileStore(temp_dir)
+    engine.image_handler = handler
+    return engine
+
+
+def define_stages(engine):
+    """name -> (setup returning a zero-argument callable, skip reason or None)"""
+    from core.job_pipeline import SearchJob
+    from core.ocr_backends import BACKENDS
+
+    backend = engine.ocr_processor.backend_name
+    ocr_missing = None if BACKENDS[backend].is_available() else f"{backend} not installed"
+    text_pixels = engine.grab_region(TEXT_RECT).rgb
+    photo_image = engine.grab_region(PHOTO_RECT).to_pil()
+    ocr_input = engine._prepare_for_ocr(text_pixels)
+    encoded = engine.image_handler.encoder.encode(photo_image)
+
+    def run_job(rect):
+        success, _ = engine._run_job(SearchJob(dict(rect)))
+        if not success:
+            raise RuntimeError("job failed")
+
+    return {
+        "capture_region": (lambda: (lambda: engine.grab_region(TEXT_RECT).to_pil()), None),
+        "precheck": (lambda: (lambda: engine._may_contain_text(text_pixels)), None),
+        "preprocess": (lambda: (lambda: engine._prepare_for_ocr(text_pixels)), None),
+        "ocr": (lambda: (lambda: engine.ocr_processor.extract_text(ocr_input)), ocr_missing),
+        "encode_image": (lambda: (lambda: engine.image_handler.encoder.encode(photo_image)), None),
+        "save_temp_image": (lambda: (lambda: engine.image_handler._save_temp_image(encoded)), None),
+        "search_text": (lambda: (lambda: engine.search_text("connection timed out python module import")), None),
+        "end_to_end_text": (lambda: (lambda: run_job(TEXT_RECT)), ocr_missing),
+        "end_to_end_image": (lambda: (lambda: run_job(PHOTO_RECT)), None),
+    }
+
+
+def measure(func, repeat, warmup=1):
+    """Median, p95 and min milliseconds of func over repeat runs (logs of the code under test suppressed)"""
+    stdout = sys.stdout
+    samples = []
+    try:
+        sys.stdout = open(os.devnull, "w")
+        for _ in range(warmup):
+            func()
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            samples.append((time.perf_counter() - start) * 1000)
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+    samples.sort()
+    return {
+        "median_ms": statistics.median(samples),
+        "p95_ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        "min_ms": samples[0],
+    }
+
+
+def load_baselines(path=BASELINES_PATH):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def check(results, baselines, fingerprint, tolerance):
+    """Add each stage's verdict: ok, over budget, regressed or skipped; returns True if all passed"""
+    recorded = baselines.get("machines", {}).get(fingerprint, {}).get("median_ms", {})
+    # Sub-millisecond stages jitter by more than any sane tolerance
+    min_regression_ms = baselines.get("min_regression_ms", 0.5)
+    passed = True
+    for name, result in results.items():
+        if result.get("skipped"):
+            result["status"] = "skipped"
+            continue
+        budget = baselines.get("budgets_ms", {}).get(name)
+        baseline = recorded.get(name)
+        result["budget_ms"] = budget
+        result["baseline_ms"] = baseline
+        if budget is not None and result["median_ms"] > budget:
+            result["status"] = "over budget"
+        elif (baseline is not None and result["median_ms"] > baseline * (1 + tolerance)
+              and result["median_ms"] - baseline > min_regression_ms):
+            result["status"] = "regressed"
+        else:
+            result["status"] = "ok"
+        passed &= result["status"] == "ok"
+    return passed
+
+
+def update_baselines(results, baselines, fingerprint, path=BASELINES_PATH):
+    """Record this machine's medians as its baseline"""
+    machine = baselines.setdefault("machines", {}).setdefault(fingerprint, {"median_ms": {}})
+    machine["recorded"] = time.strftime("%Y-%m-%d")
+    for name, result in results.items():
+        if not result.get("skipped"):
+            machine["median_ms"][name] = round(result["median_ms"], 3)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baselines, f, indent=2)
+        f.write("\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--stages", nargs="+", help="default: all")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--ocr-repeat", type=int, default=5, help="repeats for the stages that run OCR")
+    parser.add_argument("--tolerance", type=float, default=None, help="allowed slowdown vs this machine's baseline")
+    parser.add_argument("--baselines", default=BASELINES_PATH)
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--update-baseline", action="store_true", help="record these medians for this machine")
+    args = parser.parse_args()
+
+    baselines = load_baselines(args.baselines)
+    tolerance = baselines.get("tolerance", 0.25) if args.tolerance is None else args.tolerance
+    fingerprint = machine_fingerprint()
+
+    with tempfile.TemporaryDirectory(prefix="bench_pipeline_") as temp_dir:
+        engine = build_pipeline(temp_dir)
+        stages = define_stages(engine)
+        results = {}
+        for name in args.stages or stages:
+            setup, skip_reason = stages[name]
+            if skip_reason:
+                results[name] = {"skipped": skip_reason}
+                continue
+            repeat = args.ocr_repeat if name in ("ocr", "end_to_end_text") else args.repeat
+            results[name] = measure(setup(), repeat)
+        engine.cleanup()
+
+    passed = check(results, baselines, fingerprint, tolerance)
+    rows = []
+    for name, result in results.items():
+        if result.get("skipped"):
+            rows.append([name, "-", "-", "-", "-", f"skipped ({result['skipped']})"])
+            continue
+        rows.append([
+            name,
+            f"{result['median_ms']:.2f}",
+            f"{result['p95_ms']:.2f}",
+            "-" if result["baseline_ms"] is None else f"{result['baseline_ms']:.2f}",
+            "-" if result["budget_ms"] is None else f"{result['budget_ms']:.0f}",
+            result["status"],
+        ])
+    print(f"Machine: {fingerprint} (tolerance {tolerance * 100:.0f}%)")
+    print_table(["stage", "median ms", "p95 ms", "baseline ms", "budget ms", "status"], rows)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"machine": fingerprint, "tolerance": tolerance, "passed": passed, "stages": results}, f, indent=2)
+    if args.update_baseline:
+        update_baselines(results, baselines, fingerprint, args.baselines)
+        print(f"Baseline for this machine written to {args.baselines}")
+    elif not passed:
+        print("FAILED: stages over budget or slower than this machine's baseline")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""Per-stage cost of the OCR preprocessing pipeline and end-to-end OCR latency with it on and off.
+
+Run from the project root:
+    python -m benchmarks.bench_preprocessing [--no-ocr]
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image
+from benchmarks.common import ocr_skip_reason, render_text_image, time_call, print_table
+from utils.image_processing import OCRPreprocessor
+
+# (capture size, font size): small UI text, normal text, big headings, full 4K screen
+CASES = [((600, 240), 10), ((1000, 600), 16), ((1600, 900), 40), ((3840, 2160), 14)]
+MARGIN = 60
+
+
+def make_capture(size, font_size):
+    """Rendered text surrounded by a uniform margin, like a loose selection"""
+    text, _ = render_text_image(size[0] - 2 * MARGIN, size[1] - 2 * MARGIN, font_size=font_size)
+    capture = Image.new("RGB", size, "white")
+    capture.paste(text, (MARGIN, MARGIN))
+    return capture
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--no-ocr", action="store_true", help="only time the preprocessing stages")
+    parser.add_argument("--contrast", action="store_true", help="enable contrast normalization")
+    args = parser.parse_args()
+
+    preprocessor = OCRPreprocessor(normalize_contrast=args.contrast)
+    processor = None
+    if not args.no_ocr:
+        from core.ocr_processor import OCRProcessor
+        processor = OCRProcessor()
+        skip_reason = ocr_skip_reason(processor)
+        if skip_reason:
+            print(f"[INFO] OCR columns skipped: {skip_reason}")
+            processor = None
+        else:
+            processor.cache = None
+            processor.warm_up()
+
+    stage_names = ["grayscale", "trim", "rescale"] + (["contrast"] if args.contrast else [])
+    stage_rows = []
+    ocr_rows = []
+    for size, font_size in CASES:
+        capture = make_capture(size, font_size)
+        total, output = time_call(preprocessor.process, capture, repeat=args.repeat)
+        stages = dict(preprocessor.stage_seconds)
+        label = f"{size[0]}x{size[1]}@{font_size}px"
+        stage_rows.append(
+            [label, f"{output.shape[1]}x{output.shape[0]}", f"{preprocessor.last_scale:.2f}"]
+            + [f"{stages.get(name, 0) * 1000:.2f}" for name in stage_names]
+            + [f"{total * 1000:.2f}"]
+        )
+        if processor is not None:
+            raw_seconds, raw_text = time_call(processor.extract_text, capture, repeat=1, warmup=0)
+            pre_seconds, pre_text = time_call(
+                lambda: processor.extract_text(preprocessor.process(capture)), repeat=1, warmup=0)
+            ocr_rows.append([
+                label,
+                f"{size[0] * size[1] / 1e6:.2f}",
+                f"{output.size / 1e6:.2f}",
+                f"{raw_seconds:.2f}",
+                f"{pre_seconds:.2f}",
+                len(raw_text.split()),
+                len(pre_text.split()),
+            ])
+
+    print_table(["capture", "ocr input", "scale"] + [f"{n} ms" for n in stage_names] + ["total ms"], stage_rows)
+    if ocr_rows:
+        print()
+        print_table(["capture", "raw Mpx", "pre Mpx", "ocr off s", "ocr on s", "words off", "words on"], ocr_rows)
+
+
+if __name__ == "__main__":
+    main()
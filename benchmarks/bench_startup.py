@@ -0,0 +1,115 @@
+"""Startup import budget: time-to-tray and time-to-first-overlay.
+
+Run from the project root:
+    python -m benchmarks.bench_startup [--tray-budget-ms 1500] [--overlay-budget-ms 800] [--offscreen]
+
+A fresh interpreter is started with ``-X importtime``; it builds the tray
+app, then opens the overlay once. The slowest imports of each phase are
+listed, and the run fails (exit code 1) if a phase is over budget or a
+heavy dependency (selenium, easyocr, torch, pyperclip, mss,
+webdriver_manager) was imported before the first overlay was on screen.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import print_table
+
+HEAVY_MODULES = ("selenium", "easyocr", "torch", "pyperclip", "mss", "webdriver_manager")
+
+CHILD = r"""
+import sys, time
+start = time.perf_counter()
+def mark(name):
+    sys.stderr.write(f"MARK {name} {(time.perf_counter() - start) * 1000:.1f}\n")
+    sys.stderr.flush()
+sys.argv = ["main.py", "--no-prewarm"]
+from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import QTimer
+import main
+app = QApplication(sys.argv)
+app.setQuitOnLastWindowClosed(False)
+controller = main.DirectSearchApplication(app, start_minimized=True)
+mark("tray")
+controller.handle_show_overlay()
+mark("overlay")
+def finish():
+    mark("engine")
+    controller.overlay.hide()
+    controller.cleanup()
+    app.quit()
+QTimer.singleShot(0, lambda: QTimer.singleShot(0, finish))
+app.exec()
+"""
+
+
+def run_child(root):
+    env = dict(os.environ)
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", CHILD], cwd=root, env=env,
+                               capture_output=True, text=True, timeout=300)
+    return completed.stderr
+
+
+def parse(stderr):
+    """Split importtime output into phases: {phase: [(cumulative_us, depth, name)]}, {phase: ms}"""
+    phases = {"tray": [], "overlay": [], "engine": []}
+    marks = {}
+    order = iter(phases)
+    current = next(order)
+    for line in stderr.splitlines():
+        if line.startswith("MARK "):
+            _, name, ms = line.split()
+            marks[name] = float(ms)
+            current = next(order, None)
+        elif line.startswith("import time:") and current and "|" in line and "cumulative" not in line:
+            _, cumulative, name = line[len("import time:"):].split("|")
+            depth = (len(name) - len(name.lstrip()) - 1) // 2
+            phases[current].append((int(cumulative), depth, name.strip()))
+    return phases, marks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tray-budget-ms", type=float, default=1500.0)
+    parser.add_argument("--overlay-budget-ms", type=float, default=800.0)
+    parser.add_argument("--top", type=int, default=8, help="slowest top-level imports shown per phase")
+    parser.add_argument("--offscreen", action="store_true", help="use Qt's offscreen platform (headless)")
+    args = parser.parse_args()
+
+    if args.offscreen:
+        os.environ["QT_QPA_PLATFORM"] = "offscreen"
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    stderr = run_child(root)
+    phases, marks = parse(stderr)
+    if "overlay" not in marks:
+        print(stderr[-3000:])
+        print("[ERROR] Startup run did not reach the overlay")
+        return 1
+
+    for phase, imports in phases.items():
+        top_level = sorted((item for item in imports if item[1] == 0), reverse=True)[:args.top]
+        print(f"\n{phase}: slowest top-level imports")
+        print_table(["module", "cumulative ms"], [[name, f"{us / 1000:.1f}"] for us, _, name in top_level] or [["-", "-"]])
+
+    early = sorted({name.split(".")[0] for phase in ("tray", "overlay") for _, _, name in phases[phase]
+                    if name.split(".")[0] in HEAVY_MODULES})
+    tray_ms = marks["tray"]
+    overlay_ms = marks["overlay"] - marks["tray"]
+    rows = [
+        ["time-to-tray", f"{tray_ms:.0f}", f"{args.tray_budget_ms:.0f}", "ok" if tray_ms <= args.tray_budget_ms else "OVER"],
+        ["time-to-first-overlay", f"{overlay_ms:.0f}", f"{args.overlay_budget_ms:.0f}",
+         "ok" if overlay_ms <= args.overlay_budget_ms else "OVER"],
+        ["search engine (deferred)", f"{marks.get('engine', 0) - marks['overlay']:.0f}", "-", "-"],
+    ]
+    print()
+    print_table(["phase", "ms", "budget ms", "result"], rows)
+    print(f"\nheavy modules imported before the first overlay: {', '.join(early) or 'none'}")
+    failed = tray_ms > args.tray_budget_ms or overlay_ms > args.overlay_budget_ms or early
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
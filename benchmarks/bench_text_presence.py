@@ -0,0 +1,77 @@
+"""Accuracy of the text-presence pre-check and latency saved per routing decision.
+
+Run from the project root:
+    python -m benchmarks.bench_text_presence [--with-ocr]
+
+The labelled sample set is rendered procedurally so it needs no data files.
+With --with-ocr the full OCR time of every sample is measured too, which
+gives the time saved each time a capture is routed straight to image search.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import (
+    render_text_image, render_word_image, render_photo_image, render_icon_image,
+    time_call, print_table,
+)
+from config import settings
+from core.text_presence import TextPresenceDetector
+
+
+def labelled_samples():
+    """Yield (name, image, has_text) covering the captures users actually make"""
+    for i, (w, h, size) in enumerate([(400, 200, 14), (800, 600, 18), (1920, 1080, 12), (300, 60, 24), (1200, 300, 16)]):
+        yield f"text {w}x{h}@{size}px", render_text_image(w, h, font_size=size, seed=i)[0], True
+    for caption in ["OK", "Cancel", "Settings", "def main():", "FileNotFoundError: config.json"]:
+        yield f"label '{caption}'", render_word_image(caption), True
+    for i, (w, h) in enumerate([(400, 300), (1920, 1080), (128, 128), (640, 480)]):
+        yield f"photo {w}x{h}", render_photo_image(w, h, seed=i), False
+    for size in (32, 64, 256):
+        yield f"icon {size}px", render_icon_image(size, seed=size), False
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--min-score", type=float, default=settings.TEXT_PRESENCE_MIN_SCORE)
+    parser.add_argument("--with-ocr", action="store_true", help="also time full OCR per sample")
+    args = parser.parse_args()
+
+    detector = TextPresenceDetector(
+        min_score=args.min_score,
+        edge_threshold=settings.TEXT_PRESENCE_EDGE_THRESHOLD,
+        min_row_transitions=settings.TEXT_PRESENCE_MIN_ROW_TRANSITIONS,
+    )
+    processor = None
+    if args.with_ocr:
+        from core.ocr_processor import OCRProcessor
+        processor = OCRProcessor()
+        processor.cache = None
+        processor.warm_up()
+
+    rows = []
+    correct = 0
+    saved_total = 0.0
+    for name, image, expected in labelled_samples():
+        seconds, (predicted, score, _) = time_call(detector.has_text, image)
+        correct += predicted == expected
+        ocr_cell = saved_cell = "-"
+        if processor is not None:
+            ocr_seconds, _ = time_call(processor.extract_text, image, repeat=1, warmup=0)
+            ocr_cell = f"{ocr_seconds * 1000:.0f}"
+            # Routing to image search skips OCR; a text verdict adds the check on top
+            saved = ocr_seconds - seconds if not predicted else -seconds
+            saved_total += saved
+            saved_cell = f"{saved * 1000:+.0f}"
+        rows.append([name, expected, predicted, f"{score:.3f}", f"{seconds * 1000:.2f}", ocr_cell, saved_cell])
+
+    print_table(["sample", "text", "predicted", "score", "check ms", "ocr ms", "saved ms"], rows)
+    print(f"\naccuracy: {correct}/{len(rows)} at min_score={args.min_score}")
+    if processor is not None:
+        print(f"net OCR time saved over the set: {saved_total:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
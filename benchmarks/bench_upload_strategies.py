@@ -0,0 +1,99 @@
+"""Time-to-upload of each image-upload strategy against a local stand-in.
+
+Run from the project root (needs Chrome and selenium):
+    python -m benchmarks.bench_upload_strategies [--repeat 3]
+
+Each strategy is pointed at a stand-in page that behaves like the real one:
+lens adds its file input by script after a delay, images needs a click on
+the camera icon, endpoint serves the input straight away. Reported are the
+per-strategy condition-wait times, the sequential fallback chain and the
+parallel race across tabs, then both again with every page lacking a file
+input: they should give up after the shared wait budget and the race should
+leave no extra tabs open.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image
+from benchmarks.common import print_table
+from benchmarks.standin_server import start_standin_server
+from core.image_search import DirectImageSearchHandler
+
+STANDIN_PATHS = {"lens": "/slow-upload", "images": "/camera", "endpoint": "/upload"}
+NO_INPUT_PATHS = {name: "/no-input" for name in STANDIN_PATHS}
+
+
+def timed(handler, method, image_path):
+    handler.driver = handler.session.acquire()
+    start = time.perf_counter()
+    success = method(image_path)
+    return time.perf_counter() - start, success
+
+
+def summarize(label, samples):
+    seconds = sorted(s for s, _ in samples)
+    ok = sum(1 for _, success in samples if success)
+    return [label, f"{seconds[len(seconds) // 2]:.2f}", f"{seconds[0]:.2f}", f"{seconds[-1]:.2f}", f"{ok}/{len(samples)}"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    server, base_url = start_standin_server()
+    handler = DirectImageSearchHandler({name: base_url + path for name, path in STANDIN_PATHS.items()})
+    if not handler.selenium_available or handler.session.acquire() is None:
+        print("[INFO] Skipped: needs selenium and a launchable Chrome / WebDriver")
+        handler.session.close()
+        server.shutdown()
+        return 0
+    image_path = os.path.join(tempfile.gettempdir(), "bench_upload_strategies.jpg")
+    Image.new("RGB", (320, 200), "gray").save(image_path, "JPEG")
+
+    strategies = [
+        ("lens (wait for input)", handler._try_direct_lens_upload),
+        ("images (click camera, wait)", handler._try_google_images_upload),
+        ("endpoint (wait for input)", handler._try_direct_upload_endpoint),
+    ]
+    rows = []
+    leftover_tabs = 0
+    try:
+        for label, method in strategies:
+            rows.append(summarize(label, [timed(handler, method, image_path) for _ in range(args.repeat)]))
+
+        rows.append(summarize("sequential chain",
+                              [timed(handler, handler._upload_chain, image_path) for _ in range(args.repeat)]))
+        rows.append(summarize("race (parallel tabs)",
+                              [timed(handler, handler._race_upload_strategies, image_path) for _ in range(args.repeat)]))
+
+        handler.upload_urls = {name: base_url + path for name, path in NO_INPUT_PATHS.items()}
+        # Lens falls back to the scripted input once its wait runs out, so this still "uploads"
+        rows.append(summarize("chain, no input anywhere",
+                              [timed(handler, handler._upload_chain, image_path) for _ in range(args.repeat)]))
+        samples = []
+        for _ in range(args.repeat):
+            handler.driver = handler.session.acquire()
+            tabs_before = len(handler.driver.window_handles)
+            start = time.perf_counter()
+            success = handler._race_upload_strategies(image_path)
+            samples.append((time.perf_counter() - start, success))
+            leftover_tabs = max(leftover_tabs, len(handler.driver.window_handles) - tabs_before)
+        rows.append(summarize("race, no input anywhere", samples))
+    finally:
+        handler.session.close()
+        server.shutdown()
+        os.remove(image_path)
+
+    print_table(["strategy", "median s", "min s", "max s", "uploaded"], rows)
+    print(f"\nwait budget {handler.wait_seconds}s; tabs left open by a losing race: {leftover_tabs}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+import random
+import statistics
+import time
+from PIL import Image, ImageDraw, ImageFilter
+
+# Text renderers live with the OCR test corpus; re-exported for the benchmarks
+from core.ocr_corpus import WORDS, load_font, render_text_image, render_word_image
+
+
+def render_photo_image(width, height, seed=0):
+    """Render a text-free, photo-like image (smooth gradient with blurred shapes)"""
+    rng = random.Random(seed)
+    image = Image.linear_gradient("L").resize((width, height)).convert("RGB")
+    draw = ImageDraw.Draw(image)
+    for _ in range(12):
+        x, y = rng.randrange(width), rng.randrange(height)
+        radius = rng.randrange(10, max(11, min(width, height) // 2))
+        color = tuple(rng.randrange(256) for _ in range(3))
+        draw.ellipse((x - radius, y - radius, x + radius, y + radius), fill=color)
+    return image.filter(ImageFilter.GaussianBlur(6))
+
+
+def render_icon_image(size, seed=0):
+    """Render a flat app-icon style image with hard outlines but no text"""
+    rng = random.Random(seed)
+    image = Image.new("RGB", (size, size), "white")
+    draw = ImageDraw.Draw(image)
+    color = tuple(rng.randrange(256) for _ in range(3))
+    draw.rounded_rectangle((size * 0.1, size * 0.1, size * 0.9, size * 0.9), radius=size // 6, fill=color)
+    draw.ellipse((size * 0.3, size * 0.3, size * 0.7, size * 0.7), fill="white")
+    return image
+
+
+def ocr_skip_reason(processor):
+    """Why OCR benchmarks cannot run with this processor (its backend is not installed), or None"""
+    from core.ocr_backends import BACKENDS
+    backend = processor.backend_name
+    return None if BACKENDS[backend].is_available() else f"{backend} not installed"
+
+
+def time_call(func, *args, repeat=5, warmup=1, **kwargs):
+    """Run func repeatedly and return (median_seconds, last_result)"""
+    result = None
+    for _ in range(warmup):
+        result = func(*args, **kwargs)
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples), result
+
+
+def print_table(headers, rows):
+    """Print rows as a fixed-width text table"""
+    widths = [max(len(str(h)), *(len(str(r[i])) for r in rows)) for i, h in enumerate(headers)]
+    print("  ".join(str(h).ljust(w) for h, w in zip(headers, widths)))
+    print("  ".join("-" * w for w in widths))
+    for row in rows:
+        print("  ".join(str(c).ljust(w) for c, w in zip(row, widths)))
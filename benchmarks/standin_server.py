@@ -0,0 +1,72 @@
+"""Local HTTP stand-in for the Google pages used by image search.
+
+Serves pages with and without file inputs so upload strategies can be
+exercised and timed without network access.
+"""
+import itertools
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PAGES = {
+    "/upload": "<html><body><h1>Upload</h1><input type='file' name='encoded_image'></body></html>",
+    "/no-input": "<html><body><h1>Nothing to upload to</h1></body></html>",
+    # Google Images style: the file input only appears after clicking the camera icon
+    "/camera": (
+        "<html><body><div role='button' aria-label='Search by image' "
+        "onclick=\"var i=document.createElement('input');i.type='file';document.body.appendChild(i);\">"
+        "camera</div></body></html>"
+    ),
+    # Lens style: the file input is added by script some time after load
+    "/slow-upload": (
+        "<html><body><script>setTimeout(function(){var i=document.createElement('input');"
+        "i.type='file';document.body.appendChild(i);}, 1500);</script></body></html>"
+    ),
+}
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real endpoint
+    upload_ids = itertools.count(1)
+    uploads = []  # (upload id, request body size) of every POST received
+
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        if path == "/results":
+            self._send_html("<html><body><h1>Results</h1></body></html>")
+            return
+        body = PAGES.get(path)
+        if body is None:
+            self.send_error(404)
+            return
+        self._send_html(body)
+
+    def do_POST(self):
+        """Reverse image upload: accept a multipart image and redirect to its results page"""
+        data = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.path.split("?")[0] != "/searchbyimage/upload" or b'name="encoded_image"' not in data:
+            self.send_error(400)
+            return
+        upload_id = next(self.upload_ids)
+        self.uploads.append((upload_id, len(data)))
+        self.send_response(302)
+        self.send_header("Location", f"/results?id={upload_id}")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _send_html(self, body):
+        data = body.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_standin_server(handler=StandinHandler):
+    """Start the stand-in on a free localhost port, returns (server, base_url)"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, name="standin-http", daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
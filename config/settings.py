@@ -0,0 +1,205 @@
+"""Application settings for Direct Search.
+
+Plain module-level constants so they can be tweaked per deployment
+without touching the code that uses them.
+"""
+
+import os
+
+# OCR prewarm
+# Load the EasyOCR reader in the background so the first capture does not
+# pay the model start-up cost.
+OCR_PREWARM_ENABLED = True
+# Seconds to wait after a normal start before warming up
+OCR_PREWARM_DELAY_SECONDS = 20
+# Seconds to wait when started with --minimized (login autostart)
+OCR_PREWARM_AUTOSTART_DELAY_SECONDS = 90
+# Warm up early if the user has been idle this long (0 disables idle trigger)
+OCR_PREWARM_IDLE_SECONDS = 30
+# How often the idle state is polled, in milliseconds
+OCR_PREWARM_IDLE_POLL_MS = 5000
+
+# Per-user data directory for caches and history
+APP_DATA_DIR = os.path.join(
+    os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "DirectSearch",
+)
+
+# OCR result cache
+# Repeated captures of identical pixels reuse the earlier OCR result
+OCR_CACHE_ENABLED = True
+OCR_CACHE_MAX_ENTRIES = 256
+# Upper bound on the cached text held in memory
+OCR_CACHE_MAX_BYTES = 2 * 1024 * 1024
+# Keep the cache across restarts
+OCR_CACHE_PERSIST = True
+OCR_CACHE_PATH = os.path.join(APP_DATA_DIR, "ocr_cache.json")
+
+# Tiled OCR for very large selections
+OCR_TILING_ENABLED = True
+# Selections with more pixels than this are split into tiles
+OCR_TILING_MIN_PIXELS = 2_500_000
+OCR_TILE_SIZE = 1024
+# Overlap between neighbouring tiles; should exceed the tallest expected line of text
+OCR_TILE_OVERLAP = 96
+# "threads" runs tiles across a worker pool, "batched" uses readtext_batched
+OCR_TILE_MODE = "threads"
+OCR_TILE_WORKERS = max(1, (os.cpu_count() or 2) // 2)
+
+# Text-presence pre-check
+# Captures that clearly contain no text skip OCR and go straight to image search
+TEXT_PRESENCE_ENABLED = True
+# Fraction of rows that must look like text; raise to route more captures to image search
+TEXT_PRESENCE_MIN_SCORE = 0.04
+# Minimum brightness step (0-255) between neighbouring pixels counted as a stroke edge
+TEXT_PRESENCE_EDGE_THRESHOLD = 48
+# Minimum stroke edges on a row for it to count as a text row
+TEXT_PRESENCE_MIN_ROW_TRANSITIONS = 6
+
+# OCR preprocessing
+# Grayscale, border trim and adaptive rescale before OCR
+OCR_PREPROCESS_ENABLED = True
+OCR_PREPROCESS_TRIM_BORDERS = True
+# Max brightness difference from the background still treated as border
+OCR_PREPROCESS_TRIM_TOLERANCE = 8
+# Text lines are rescaled towards this height in pixels
+OCR_PREPROCESS_TARGET_LINE_HEIGHT = 20
+OCR_PREPROCESS_MIN_SCALE = 0.5
+OCR_PREPROCESS_MAX_SCALE = 3.0
+# Pixel budget for the OCR input (text is never shrunk below legibility to meet it)
+OCR_PREPROCESS_MAX_PIXELS = 4_000_000
+OCR_PREPROCESS_NORMALIZE_CONTRAST = False
+
+# Search job pipeline (capture -> preprocess -> OCR -> dispatch off the GUI thread)
+SEARCH_JOB_WORKERS = 1
+# A new selection cancels older jobs that have not finished
+SEARCH_JOB_SUPERSEDE = True
+# Queue bound when not superseding; the oldest queued job is dropped on overflow
+SEARCH_JOB_MAX_PENDING = 2
+
+# Screen capture
+# Snapshot all screens when the overlay opens and crop the selection from
+# memory instead of grabbing the screen again after selection
+CAPTURE_FREEZE_FRAME = True
+
+# Browser session for direct image search
+# Start Chrome (minimized) in the background the first time the overlay opens,
+# so an image search finds a warm browser
+BROWSER_PRELAUNCH = False
+# Time budget shared by all condition waits (page ready, camera icon, file input)
+# of one image search, so the whole fallback chain or race gives up after this
+IMAGE_UPLOAD_WAIT_SECONDS = 4
+# Load all upload strategies at once in separate tabs and use the first ready one
+IMAGE_UPLOAD_RACE = False
+
+# Browserless image upload
+# "http": multipart POST to IMAGE_UPLOAD_HTTP_URL and open the results page,
+# falling back to Selenium; "selenium": always drive Chrome
+IMAGE_UPLOAD_BACKEND = "http"
+IMAGE_UPLOAD_HTTP_URL = "https://www.google.com/searchbyimage/upload"
+IMAGE_UPLOAD_HTTP_FIELD = "encoded_image"
+IMAGE_UPLOAD_HTTP_TIMEOUT = 10.0
+
+# Resolved chromedriver path per installed Chrome version (works offline once filled)
+DRIVER_CACHE_PATH = os.path.join(APP_DATA_DIR, "driver_cache.json")
+
+# Search image encoding and temp files
+IMAGE_SEARCH_MAX_SIZE = (1200, 800)
+# Target encoded size; JPEG quality steps down (or PNG is used for flat captures) to meet it
+IMAGE_SEARCH_BYTE_BUDGET = 400_000
+# Temp images live in their own folder, evicted oldest-first by count, total size and age
+TEMP_STORE_MAX_FILES = 20
+TEMP_STORE_MAX_BYTES = 50 * 1024 * 1024
+TEMP_STORE_MAX_AGE_SECONDS = 3600
+
+# Global hotkeys: pynput hotkey string -> action ("show_overlay", "quit")
+HOTKEYS = {
+    "<ctrl>+<shift>+<space>": "show_overlay",
+}
+# Repeated presses of the same hotkey within this window are ignored
+HOTKEY_DEBOUNCE_SECONDS = 0.3
+
+# Memory governor: unload the OCR reader (it reloads on the next capture)
+MEMORY_GOVERNOR_ENABLED = True
+# Unload after this many seconds without OCR (0 disables)
+OCR_IDLE_UNLOAD_SECONDS = 600
+# Unload as soon as process RSS reaches this many MB (0 disables)
+OCR_RSS_WATERMARK_MB = 1200
+# How often the loaded reader is checked, in milliseconds
+MEMORY_CHECK_INTERVAL_MS = 30_000
+
+# OCR inference precision on CPU
+# "int8": dynamic int8 recognizer (EasyOCR's own CPU default), "fp32": no
+# quantization, "int8-bf16": int8 recognizer plus bf16 detector (fast on
+# CPUs with bf16 support). Compare with benchmarks/bench_ocr_precision.py
+OCR_PRECISION = "int8"
+
+# OCR backend: "easyocr", "tesseract" (pytesseract + tesseract binary),
+# "onnx" (rapidocr_onnxruntime) or "auto" for the pick of
+# `main.py --calibrate-ocr` on this machine (easyocr until calibrated)
+OCR_BACKEND = "auto"
+OCR_CALIBRATION_PATH = os.path.join(APP_DATA_DIR, "ocr_calibration.json")
+# Calibration picks the fastest backend reaching this corpus character accuracy
+OCR_ACCURACY_FLOOR = 0.9
+
+# Multi-region capture: shift-drag adds regions to one overlay session,
+# Enter runs OCR over all of them together
+# Regions of similar size share one batched model call, up to this many
+OCR_BATCH_MAX_SIZE = 8
+# Smaller regions are padded to the largest in their batch; a batch's padded
+# area may be at most this multiple of its real pixel area
+OCR_BATCH_MAX_PAD_RATIO = 2.0
+
+# Headless batch OCR (`main.py --batch DIR...` or `python -m core.batch_ocr`)
+# Each worker process loads its own OCR reader (hundreds of MB with easyocr)
+BATCH_OCR_WORKERS = max(1, min(4, (os.cpu_count() or 2) // 2))
+# A worker dying mid-image fails the images in flight; the pool is rebuilt this often before the run stops
+BATCH_OCR_MAX_RESTARTS = 3
+
+# Out-of-process OCR: a local daemon (`python -m core.ocr_daemon`) keeps the
+# reader warm for the tray app and other tools; frames travel through shared
+# memory. Off by default: OCR runs inside the app
+OCR_DAEMON_ENABLED = False
+OCR_DAEMON_SOCKET = os.path.join(APP_DATA_DIR, "ocr_daemon.sock")
+# Windows has no asyncio Unix sockets; the daemon listens on localhost instead
+OCR_DAEMON_PORT = 47813
+OCR_DAEMON_LOG_PATH = os.path.join(APP_DATA_DIR, "ocr_daemon.log")
+# Per-user secret the daemon writes on start; clients present it on every connection
+OCR_DAEMON_TOKEN_PATH = os.path.join(APP_DATA_DIR, "ocr_daemon.token")
+# Start the daemon when it is not running, and wait this long for it to listen
+OCR_DAEMON_AUTOSTART = True
+OCR_DAEMON_CONNECT_TIMEOUT = 10
+# Covers the model load on the daemon's first request
+OCR_DAEMON_REQUEST_TIMEOUT = 120
+# After failing to reach the daemon, skip it for this long
+OCR_DAEMON_RETRY_SECONDS = 30
+# Run OCR in-process while the daemon cannot be reached
+OCR_DAEMON_FALLBACK_LOCAL = True
+# OCR requests waiting beyond this many are rejected as busy
+OCR_DAEMON_MAX_QUEUE = 32
+
+# Per-stage latency spans (hotkey -> overlay, capture, OCR, encode, upload, ...)
+# kept as rolling p50/p95/p99 histograms, shown from the tray menu
+TRACING_ENABLED = True
+# Most recent durations kept per span
+TRACE_HISTOGRAM_SAMPLES = 500
+# Spans as JSON lines (None to keep them in memory only); rotated at the size limit
+TRACE_LOG_PATH = os.path.join(APP_DATA_DIR, "trace.jsonl")
+TRACE_LOG_MAX_BYTES = 1024 * 1024
+
+# Capture history: OCR text, a thumbnail and a perceptual hash of every
+# capture in a local SQLite database with a full-text index
+# (`python main.py --history search <words>`). Opt-in, since it keeps
+# whatever was on screen on disk
+CAPTURE_HISTORY_ENABLED = False
+CAPTURE_HISTORY_PATH = os.path.join(APP_DATA_DIR, "capture_history.db")
+# Least recently used captures are dropped beyond this much thumbnail + text
+CAPTURE_HISTORY_MAX_BYTES = 64 * 1024 * 1024
+CAPTURE_HISTORY_THUMBNAIL_SIZE = 256
+CAPTURE_HISTORY_THUMBNAIL_QUALITY = 70
+# Reuse an earlier capture's result instead of running OCR when the pixels
+# are identical (exact pixel key; a perceptual hash sees layout, not letters).
+# Off by default
+CAPTURE_HISTORY_REUSE = False
+# Near-duplicate lookups (find_similar): differing bits of the 64-bit dHash
+CAPTURE_HISTORY_MATCH_DISTANCE = 3
@@ -0,0 +1,227 @@
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from config import settings
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".gif", ".webp", ".tif", ".tiff")
+
+# The pool process's BatchWorker, created once by _init_worker
+_worker = None
+
+
+def iter_images(inputs):
+    """Yield image paths from files, directories (recursively) and "-" (paths on stdin), lazily"""
+    for source in inputs:
+        if source == "-":
+            for line in sys.stdin:
+                path = line.strip()
+                if path:
+                    yield path
+        elif os.path.isdir(source):
+            yield from _walk(source)
+        else:
+            yield source
+
+
+def _walk(directory):
+    # scandir streams entries, so a huge folder is never listed into memory at once
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _walk(entry.path)
+            elif entry.name.lower().endswith(IMAGE_EXTENSIONS):
+                yield entry.path
+
+
+class BatchWorker:
+    """Warm OCR reader and search router held by one pool process"""
+
+    def __init__(self):
+        # Imported here so the parent process never loads OCR dependencies
+        from core.ocr_processor import OCRProcessor
+        from core.routing import SearchRouter
+        self.ocr_processor = OCRProcessor(use_daemon=False)
+        # Archived screenshots rarely repeat, and processes must not share the cache file
+        self.ocr_processor.cache = None
+        self.router = SearchRouter()
+
+    def process(self, path):
+        """Route one image the way DirectSearchEngine routes a selection, returns a JSON-ready record"""
+        from PIL import Image
+        import numpy
+
+        record = {"path": path, "worker": os.getpid()}
+        timings = {}
+        start = time.perf_counter()
+
+        def timed(name, func, *args):
+            stage_start = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                timings[name] = round((time.perf_counter() - stage_start) * 1000, 2)
+
+        try:
+            with Image.open(path) as image:
+                pixels = timed("load", lambda: numpy.asarray(image.convert("RGB")))
+            record["width"], record["height"] = pixels.shape[1], pixels.shape[0]
+            lines = []
+            record["has_text"] = timed("precheck", self.router.may_contain_text, pixels, self.ocr_processor)
+            if record["has_text"]:
+                ocr_input = timed("preprocess", self.router.prepare_for_ocr, pixels)
+                lines = timed("ocr", self.ocr_processor.extract_lines, ocr_input)
+            text = "\n".join(line for line, _ in lines).strip()
+            # Same rule as the tray app: text search when OCR found text, else reverse image search
+            record["route"] = "text" if text else "image"
+            record["text"] = text
+            record["lines"] = [{"text": line, "confidence": round(confidence, 4)} for line, confidence in lines]
+        except Exception as e:
+            record["route"] = None
+            record["error"] = f"{type(e).__name__}: {e}"
+        timings["total"] = round((time.perf_counter() - start) * 1000, 2)
+        record["timings_ms"] = timings
+        return record
+
+
+def _init_worker(torch_threads, quiet):
+    """Pool initializer: keep logs off the JSONL stream, size torch's pool and load the reader"""
+    global _worker
+    # Workers share the CPU; one big intra-op pool each would oversubscribe it
+    os.environ["OMP_NUM_THREADS"] = str(torch_threads)
+    sys.stdout = open(os.devnull, "w") if quiet else sys.stderr
+    # Stage timings are already in each record; the trace log belongs to the tray app
+    from utils.tracing import tracer
+    tracer.log_path = None
+    _worker = BatchWorker()
+    try:
+        _worker.ocr_processor.warm_up()
+        if "torch" in sys.modules:
+            sys.modules["torch"].set_num_threads(torch_threads)
+    except Exception as e:
+        # Loading is retried by the first image that needs OCR
+        print(f"[WARNING] OCR warm-up failed in worker {os.getpid()}: {e}")
+
+
+def _process(index, path):
+    record = _worker.process(path)
+    record["index"] = index
+    return record
+
+
+def run_batch(paths, output, workers=None, max_in_flight=None, quiet=False, max_restarts=None):
+    """Stream paths through a process pool, writing one JSON line per image as results arrive
+
+    At most ``max_in_flight`` images are queued or processing at a time, so
+    memory stays flat however many paths the iterator yields. A worker that
+    dies (a crash or OOM on a bad image) breaks the pool and fails every
+    image in flight: each gets an error record and the pool is rebuilt, at
+    most ``max_restarts`` times before the run stops. Returns a summary dict.
+    """
+    workers = workers or settings.BATCH_OCR_WORKERS
+    max_in_flight = max_in_flight or workers * 2
+    max_restarts = settings.BATCH_OCR_MAX_RESTARTS if max_restarts is None else max_restarts
+    torch_threads = max(1, (os.cpu_count() or 1) // workers)
+    summary = {"images": 0, "text": 0, "image": 0, "errors": 0, "restarts": 0, "aborted": False}
+    in_flight = {}  # future -> (index, path)
+
+    def emit(futures):
+        """Write the finished futures' records, returns True if the pool broke"""
+        broken = False
+        for future in futures:
+            index, path = in_flight.pop(future)
+            try:
+                record = future.result()
+            except BrokenProcessPool as e:
+                broken = True
+                record = {"index": index, "path": path, "route": None, "error": f"worker process died: {e}"}
+            except Exception as e:
+                record = {"index": index, "path": path, "route": None, "error": f"{type(e).__name__}: {e}"}
+            output.write(json.dumps(record, ensure_ascii=False) + "\n")
+            summary["images"] += 1
+            if record.get("error"):
+                summary["errors"] += 1
+            else:
+                summary[record["route"]] += 1
+        output.flush()
+        return broken
+
+    def new_pool():
+        # spawn: workers start clean instead of forking a parent that may hold threads
+        return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                   initializer=_init_worker, initargs=(torch_threads, quiet))
+
+    start = time.perf_counter()
+    items = enumerate(paths)
+    retry = deque()  # submitted to a pool that broke before accepting them
+    pool = new_pool()
+    try:
+        while True:
+            broken = False
+            while len(in_flight) < max_in_flight:
+                item = retry.popleft() if retry else next(items, None)
+                if item is None:
+                    break
+                try:
+                    in_flight[pool.submit(_process, *item)] = item
+                except BrokenProcessPool:
+                    retry.appendleft(item)
+                    broken = True
+                    break
+            if not in_flight and not broken:
+                break
+            if in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                broken = emit(done) or broken
+            if broken:
+                # Every task of a broken pool fails; record them all before replacing it
+                emit(wait(in_flight)[0])
+                pool.shutdown(wait=True)
+                if summary["restarts"] >= max_restarts:
+                    print(f"[ERROR] OCR workers keep dying, stopping after {summary['restarts']} restarts",
+                          file=sys.stderr)
+                    summary["aborted"] = True
+                    break
+                summary["restarts"] += 1
+                print("[WARNING] An OCR worker died, restarting the pool", file=sys.stderr)
+                pool = new_pool()
+    finally:
+        pool.shutdown(wait=True)
+    summary["seconds"] = time.perf_counter() - start
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="OCR and route screenshots headlessly, streaming JSON lines")
+    parser.add_argument("inputs", nargs="+", help="image files, directories (recursive) or - for paths on stdin")
+    parser.add_argument("-o", "--output", default="-", help="JSONL file (default: stdout)")
+    parser.add_argument("-w", "--workers", type=int, default=settings.BATCH_OCR_WORKERS,
+                        help="OCR processes, each holding its own reader")
+    parser.add_argument("--max-in-flight", type=int, default=None, help="default: 2 per worker")
+    parser.add_argument("-q", "--quiet", action="store_true", help="silence worker logs")
+    args = parser.parse_args(argv)
+
+    output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    # Progress and logs go to stderr, stdout carries only JSON lines
+    log = sys.stderr
+    print(f"[INFO] Batch OCR with {args.workers} workers", file=log)
+    try:
+        summary = run_batch(iter_images(args.inputs), output, args.workers, args.max_in_flight, args.quiet)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    rate = summary["images"] / summary["seconds"] if summary["seconds"] else 0.0
+    print(f"[INFO] {'❌ Aborted after' if summary['aborted'] else '✅'} {summary['images']} images in "
+          f"{summary['seconds']:.1f}s ({rate:.1f} images/s): {summary['text']} text, {summary['image']} image, "
+          f"{summary['errors']} errors, {summary['restarts']} worker restarts", file=log)
+    return 1 if summary["errors"] or summary["aborted"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
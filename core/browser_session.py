@@ -0,0 +1,103 @@
+import threading
+import time
+
+
+class BrowserSession:
+    """One long-lived WebDriver reused across image searches
+
+    The driver is launched once (optionally ahead of time on a background
+    thread), health-checked before every use and relaunched if the user
+    closed the browser or the session died. Each search gets its own tab.
+    """
+
+    def __init__(self, launch_driver):
+        self.launch_driver = launch_driver
+        self.driver = None
+        self.launch_seconds = None
+        self._fresh = False  # launched but its first tab not used yet
+        self._lock = threading.RLock()
+        self._prelaunch_thread = None
+
+    def is_alive(self):
+        """Cheap health check: a dead session raises on any command"""
+        if self.driver is None:
+            return False
+        try:
+            return len(self.driver.window_handles) > 0
+        except Exception:
+            return False
+
+    def _launch(self):
+        """Start a new driver, replacing (and quitting) a dead one"""
+        self._quit_driver()
+        start = time.perf_counter()
+        self.driver = self.launch_driver()
+        self.launch_seconds = time.perf_counter() - start if self.driver else None
+        self._fresh = self.driver is not None
+        if self.driver:
+            print(f"[INFO] Browser session started in {self.launch_seconds:.2f}s")
+        return self.driver
+
+    def acquire(self):
+        """Return a live driver switched to a tab ready for a new search, or None"""
+        with self._lock:
+            if not self.is_alive():
+                if self.driver is not None:
+                    print("[INFO] Browser session died, restarting...")
+                if self._launch() is None:
+                    return None
+            try:
+                if self._fresh:
+                    # Reuse the blank tab of a just-launched browser
+                    self._fresh = False
+                    self.driver.switch_to.window(self.driver.window_handles[0])
+                else:
+                    self.driver.switch_to.new_window("tab")
+                self._bring_to_front()
+                return self.driver
+            except Exception as e:
+                print(f"[WARNING] Could not open a new tab ({e}), restarting browser")
+                if self._launch() is None:
+                    return None
+                self._fresh = False
+                return self.driver
+
+    def _bring_to_front(self):
+        """Restore the window if it was pre-launched minimized"""
+        try:
+            self.driver.maximize_window()
+        except Exception:
+            pass
+
+    def prelaunch(self, minimized=True):
+        """Launch the browser on a background thread so the first search finds it warm"""
+        with self._lock:
+            if self.driver is not None or (self._prelaunch_thread and self._prelaunch_thread.is_alive()):
+                return
+            self._prelaunch_thread = threading.Thread(
+                target=self._run_prelaunch, args=(minimized,), name="browser-prelaunch", daemon=True)
+            self._prelaunch_thread.start()
+
+    def _run_prelaunch(self, minimized):
+        with self._lock:
+            if self.is_alive():
+                return
+            print("[INFO] Pre-launching browser session in background...")
+            try:
+                if self._launch() is not None and minimized:
+                    self.driver.minimize_window()
+            except Exception as e:
+                print(f"[WARNING] Browser pre-launch failed: {e}")
+
+    def _quit_driver(self):
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+            except Exception:
+                pass
+            self.driver = None
+
+    def close(self):
+        """Quit the browser and its driver process"""
+        with self._lock:
+            self._quit_driver()
@@ -0,0 +1,378 @@
+import argparse
+import io
+import os
+import sqlite3
+import threading
+import time
+
+import numpy
+from PIL import Image
+
+from config import settings
+from core.ocr_cache import OCRResultCache
+
+HASH_BITS = 64
+_SIGN_BIT = 1 << (HASH_BITS - 1)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS captures (
+    id INTEGER PRIMARY KEY,
+    created REAL NOT NULL,
+    used REAL NOT NULL,
+    width INTEGER NOT NULL,
+    height INTEGER NOT NULL,
+    phash INTEGER NOT NULL,
+    content_key TEXT,
+    route TEXT NOT NULL,
+    text TEXT NOT NULL DEFAULT '',
+    thumbnail BLOB,
+    bytes INTEGER NOT NULL,
+    ocr_seconds REAL NOT NULL DEFAULT 0,
+    reuses INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS captures_used ON captures(used);
+CREATE VIRTUAL TABLE IF NOT EXISTS captures_fts USING fts5(
+    text, content='captures', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS captures_ai AFTER INSERT ON captures BEGIN
+    INSERT INTO captures_fts(rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS captures_ad AFTER DELETE ON captures BEGIN
+    INSERT INTO captures_fts(captures_fts, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+"""
+
+
+def _downsample(bgra, longest):
+    """RGB PIL image of a BGRA array, strided down to about longest pixels first so big captures stay cheap"""
+    step = max(1, max(bgra.shape[:2]) // longest)
+    small = numpy.ascontiguousarray(bgra[::step, ::step])
+    return Image.frombuffer("RGB", (small.shape[1], small.shape[0]), small, "raw", "BGRX", 0, 1)
+
+
+def make_thumbnail(bgra, size=None):
+    """Thumbnail of a BGRA capture, at most size pixels on its longer side"""
+    size = size or settings.CAPTURE_HISTORY_THUMBNAIL_SIZE
+    thumbnail = _downsample(bgra, size)
+    thumbnail.thumbnail((size, size), Image.BILINEAR)
+    return thumbnail
+
+
+def perceptual_hash(bgra):
+    """64-bit difference hash of a BGRA capture: brightness gradients of a 9x8 grayscale image"""
+    # Box-averaged from a fine grid so a re-capture a few pixels off still hashes alike
+    gray = _downsample(bgra, 512).convert("L").resize((9, 8), Image.BOX)
+    gray = numpy.asarray(gray, dtype=numpy.int16)
+    bits = (gray[:, 1:] > gray[:, :-1]).flatten()
+    return int.from_bytes(numpy.packbits(bits).tobytes(), "big")
+
+
+def hamming(a, b):
+    # int.bit_count() needs Python 3.10
+    return bin(a ^ b).count("1")
+
+
+def content_key(bgra):
+    """Exact pixel key of a capture (the OCR result cache's key)"""
+    return OCRResultCache.make_key(bgra)
+
+
+def _to_signed(value):
+    # SQLite integers are signed 64-bit
+    return value - (1 << HASH_BITS) if value & _SIGN_BIT else value
+
+
+def _to_unsigned(value):
+    return value + (1 << HASH_BITS) if value < 0 else value
+
+
+class BKTree:
+    """Burkhard-Keller tree over hashes under Hamming distance
+
+    A radius query only descends into children whose edge distance is
+    within ``radius`` of the query's distance to the node (triangle
+    inequality), so near-duplicate lookups touch a small part of the tree.
+    Removing an id leaves its node in place as a routing node.
+    """
+
+    def __init__(self):
+        self.root = None  # [hash, ids, {distance: child}]
+        self.size = 0
+
+    def add(self, value, item):
+        self.size += 1
+        if self.root is None:
+            self.root = [value, {item}, {}]
+            return
+        node = self.root
+        while True:
+            distance = hamming(value, node[0])
+            if distance == 0:
+                node[1].add(item)
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [value, {item}, {}]
+                return
+            node = child
+
+    def remove(self, value, item):
+        node = self.root
+        while node is not None:
+            distance = hamming(value, node[0])
+            if distance == 0:
+                if item in node[1]:
+                    node[1].discard(item)
+                    self.size -= 1
+                return
+            node = node[2].get(distance)
+
+    def search(self, value, radius):
+        """[(distance, item), ...] within radius, nearest first"""
+        found = []
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            node = stack.pop()
+            distance = hamming(value, node[0])
+            if distance <= radius:
+                found.extend((distance, item) for item in node[1])
+            for edge, child in node[2].items():
+                if distance - radius <= edge <= distance + radius:
+                    stack.append(child)
+        found.sort()
+        return found
+
+
+class CaptureHistory:
+    """Local store of past captures: OCR text, a thumbnail and a perceptual hash
+
+    Text is indexed with SQLite FTS5. Reuse looks captures up by their exact
+    pixel key (an indexed column): a dHash sees layout, not glyphs, so it
+    cannot decide that two captures read the same. Hashes live in an
+    in-memory BK-tree rebuilt on open, for near-duplicate lookups only. The
+    least recently used captures are dropped once thumbnails and text
+    exceed ``max_bytes``.
+    """
+
+    def __init__(self, path=None, max_bytes=None, match_distance=None):
+        self.path = path or settings.CAPTURE_HISTORY_PATH
+        self.max_bytes = settings.CAPTURE_HISTORY_MAX_BYTES if max_bytes is None else max_bytes
+        self.match_distance = settings.CAPTURE_HISTORY_MATCH_DISTANCE if match_distance is None else match_distance
+        self.tree = BKTree()
+        self.sizes = {}  # id -> (width, height, phash) for the lookup filters and removal
+        self.total_bytes = 0
+        self._lock = threading.Lock()
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        # Written from the search-job threads, always under self._lock
+        self.db = sqlite3.connect(self.path, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        # Must precede table creation to take effect; lets retention give space back
+        self.db.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        self.db.execute("PRAGMA journal_mode = WAL")
+        self.db.execute("PRAGMA synchronous = NORMAL")
+        self.db.executescript(SCHEMA)
+        columns = {row["name"] for row in self.db.execute("PRAGMA table_info(captures)")}
+        if "content_key" not in columns:
+            # Databases from before exact matching; their captures are never reused
+            self.db.execute("ALTER TABLE captures ADD COLUMN content_key TEXT")
+        # After the migration, which may have just added the column
+        self.db.execute("CREATE INDEX IF NOT EXISTS captures_content_key ON captures(content_key)")
+        self.db.commit()
+        self._load()
+
+    def _load(self):
+        rows = self.db.execute("SELECT id, width, height, phash, bytes FROM captures").fetchall()
+        for row in rows:
+            phash = _to_unsigned(row["phash"])
+            self.tree.add(phash, row["id"])
+            self.sizes[row["id"]] = (row["width"], row["height"], phash)
+            self.total_bytes += row["bytes"]
+
+    def find_similar(self, phash, size, max_distance=None):
+        """Closest earlier capture of about the same size within max_distance bits, or None"""
+        max_distance = self.match_distance if max_distance is None else max_distance
+        width, height = size
+        with self._lock:
+            for distance, capture_id in self.tree.search(phash, max_distance):
+                other_width, other_height, _ = self.sizes[capture_id]
+                # A hash only sees the layout; a differently sized region is a different capture
+                if abs(other_width - width) > width * 0.05 or abs(other_height - height) > height * 0.05:
+                    continue
+                row = self.db.execute(
+                    "SELECT id, created, route, text, ocr_seconds FROM captures WHERE id = ?", (capture_id,)
+                ).fetchone()
+                if row is not None:
+                    return dict(row, distance=distance)
+        return None
+
+    def find_same(self, bgra):
+        """Most recently used earlier capture with exactly these pixels, or None"""
+        key = content_key(bgra)
+        with self._lock:
+            row = self.db.execute(
+                "SELECT id, created, route, text, ocr_seconds FROM captures WHERE content_key = ?"
+                " ORDER BY used DESC LIMIT 1",
+                (key,),
+            ).fetchone()
+        return dict(row) if row is not None else None
+
+    def add(self, bgra, text, route, phash=None, ocr_seconds=0.0):
+        """Store a BGRA capture's text and thumbnail and apply retention, returns its id"""
+        phash = perceptual_hash(bgra) if phash is None else phash
+        key = content_key(bgra)
+        size = bgra.shape[1], bgra.shape[0]
+        buffer = io.BytesIO()
+        make_thumbnail(bgra).save(buffer, "JPEG", quality=settings.CAPTURE_HISTORY_THUMBNAIL_QUALITY)
+        blob = buffer.getvalue()
+        nbytes = len(blob) + len(text.encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            cursor = self.db.execute(
+                "INSERT INTO captures (created, used, width, height, phash, content_key, route, text, thumbnail,"
+                " bytes, ocr_seconds) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (now, now, size[0], size[1], _to_signed(phash), key, route, text, blob, nbytes, ocr_seconds),
+            )
+            capture_id = cursor.lastrowid
+            self.tree.add(phash, capture_id)
+            self.sizes[capture_id] = (size[0], size[1], phash)
+            self.total_bytes += nbytes
+            pruned = self._prune()
+            self.db.commit()
+            if pruned:
+                self._vacuum()
+        return capture_id
+
+    def mark_reused(self, capture_id):
+        """Count a reuse and keep the capture from being pruned soon"""
+        with self._lock:
+            self.db.execute("UPDATE captures SET used = ?, reuses = reuses + 1 WHERE id = ?", (time.time(), capture_id))
+            self.db.commit()
+
+    def _prune(self):
+        """Drop least recently used captures until within max_bytes (lock held)"""
+        if self.total_bytes <= self.max_bytes:
+            return 0
+        removed = 0
+        for row in self.db.execute("SELECT id, bytes FROM captures ORDER BY used").fetchall():
+            if self.total_bytes <= self.max_bytes:
+                break
+            self._delete(row["id"], row["bytes"])
+            removed += 1
+        return removed
+
+    def _vacuum(self):
+        # Returns freed pages to the file system; executescript steps the pragma to completion
+        self.db.executescript("PRAGMA incremental_vacuum;")
+
+    def _delete(self, capture_id, nbytes):
+        self.db.execute("DELETE FROM captures WHERE id = ?", (capture_id,))
+        _, _, phash = self.sizes.pop(capture_id)
+        self.tree.remove(phash, capture_id)
+        self.total_bytes -= nbytes
+
+    def search(self, query, limit=20):
+        """Captures whose text matches all words of query (last word as a prefix), newest first"""
+        words = query.split()
+        if not words:
+            return []
+        # Quoted terms, so FTS syntax in the user's words is taken literally
+        match = " ".join('"' + word.replace('"', '""') + '"' for word in words) + "*"
+        with self._lock:
+            rows = self.db.execute(
+                "SELECT captures.id, captures.created, captures.route, captures.text,"
+                " snippet(captures_fts, 0, '[', ']', '...', 12) AS snippet"
+                " FROM captures_fts JOIN captures ON captures.id = captures_fts.rowid"
+                # Rowid order lets FTS5 stop after limit matches; ranking would score every match
+                " WHERE captures_fts MATCH ? ORDER BY captures_fts.rowid DESC LIMIT ?",
+                (match, limit),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def recent(self, limit=20):
+        """Most recently used captures first"""
+        with self._lock:
+            rows = self.db.execute(
+                "SELECT id, created, route, text, reuses FROM captures ORDER BY used DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def thumbnail(self, capture_id):
+        """JPEG bytes of a capture's thumbnail, or None"""
+        with self._lock:
+            row = self.db.execute("SELECT thumbnail FROM captures WHERE id = ?", (capture_id,)).fetchone()
+        return row["thumbnail"] if row is not None else None
+
+    def stats(self):
+        with self._lock:
+            row = self.db.execute("SELECT COUNT(*) AS captures, COALESCE(SUM(reuses), 0) AS reuses FROM captures").fetchone()
+        return {"captures": row["captures"], "reuses": row["reuses"], "bytes": self.total_bytes, "max_bytes": self.max_bytes}
+
+    def clear(self):
+        """Delete every capture"""
+        with self._lock:
+            self.db.execute("DELETE FROM captures")
+            self.db.execute("INSERT INTO captures_fts(captures_fts) VALUES ('rebuild')")
+            self.db.commit()
+            self._vacuum()
+            self.tree = BKTree()
+            self.sizes.clear()
+            self.total_bytes = 0
+
+    def close(self):
+        with self._lock:
+            self.db.close()
+
+
+def _print_rows(rows, text_key="text"):
+    for row in rows:
+        created = time.strftime("%Y-%m-%d %H:%M", time.localtime(row["created"]))
+        text = " ".join(row[text_key].split()) or "(no text, image search)"
+        print(f"#{row['id']:<6} {created}  {row['route']:<5}  {text[:100]}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Search and manage the local capture history")
+    commands = parser.add_subparsers(dest="command", required=True)
+    search = commands.add_parser("search", help="full-text search of captured text")
+    search.add_argument("query", nargs="+")
+    search.add_argument("-n", "--limit", type=int, default=20)
+    recent = commands.add_parser("recent", help="most recent captures")
+    recent.add_argument("-n", "--limit", type=int, default=20)
+    thumbnail = commands.add_parser("thumbnail", help="write a capture's thumbnail to a JPEG file")
+    thumbnail.add_argument("id", type=int)
+    thumbnail.add_argument("output")
+    commands.add_parser("stats", help="size and reuse counts")
+    commands.add_parser("clear", help="delete all captures")
+    args = parser.parse_args(argv)
+
+    history = CaptureHistory()
+    try:
+        if args.command == "search":
+            start = time.perf_counter()
+            rows = history.search(" ".join(args.query), args.limit)
+            _print_rows(rows, "snippet")
+            print(f"[INFO] {len(rows)} matches in {(time.perf_counter() - start) * 1000:.2f} ms")
+        elif args.command == "recent":
+            _print_rows(history.recent(args.limit))
+        elif args.command == "thumbnail":
+            data = history.thumbnail(args.id)
+            if data is None:
+                print(f"[ERROR] No capture #{args.id}")
+                return 1
+            with open(args.output, "wb") as f:
+                f.write(data)
+        elif args.command == "stats":
+            stats = history.stats()
+            print(f"[INFO] {stats['captures']} captures, {stats['reuses']} reused, "
+                  f"{stats['bytes'] / 1024:.0f} of {stats['max_bytes'] / 1024:.0f} KB")
+        elif args.command == "clear":
+            history.clear()
+            print("[INFO] Capture history cleared")
+    finally:
+        history.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
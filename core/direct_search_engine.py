@@ -1,102 +1,232 @@
 import os
 import tempfile
-import pyperclip
+import threading
+import time
 import webbrowser
-import mss
 from urllib.parse import quote_plus
-from PIL import Image
-from PySide6.QtCore import QRect, QThread, Signal
+from PySide6.QtCore import QRect
 from PySide6.QtGui import QGuiApplication
 
+from config import settings
 from core.ocr_processor import OCRProcessor
-from core.image_search import DirectImageSearchHandler
+from core.job_pipeline import SearchJobPipeline
+from core.routing import SearchRouter
+from core.screen_capture import CapturedFrame, ScreenCaptureBackend
+from utils.lazy_import import lazy_import
+from utils.tracing import tracer
 
-class SearchWorker(QThread):
-    """Worker thread for processing search operations"""
-    finished = Signal(bool, str)
-    
-    def __init__(self, search_engine, rect, image=None, text=None):
-        super().__init__()
-        self.search_engine = search_engine
-        self.rect = rect
-        self.image = image
-        self.text = text
-
-    def run(self):
-        """Run search operation in thread"""
-        try:
-            if self.text:
-                success = self.search_engine.search_text(self.text)
-                self.finished.emit(success, f"Text search: {self.text[:30]}...")
-            elif self.image:
-                success = self.search_engine.search_image(self.image)
-                self.finished.emit(success, "Direct image search")
-            else:
-                self.finished.emit(False, "No content to search")
-        except Exception as e:
-            print(f"[ERROR] Search worker error: {e}")
-            self.finished.emit(False, f"Error: {str(e)}")
+# Only needed once a search actually runs
+pyperclip = lazy_import("pyperclip")
 
 class DirectSearchEngine:
     """Main search engine handling both text and direct image search"""
     
-    def __init__(self):
-        self.ocr_processor = None  # Lazy initialization
+    def __init__(self, ocr_processor=None):
+        self.ocr_processor = ocr_processor  # Lazy initialization unless prewarmed
         self.image_handler = None  # Lazy initialization
-        self.current_worker = None
+        self.history = None  # Lazy initialization, see _get_history
+        self.history_enabled = settings.CAPTURE_HISTORY_ENABLED
+        self._init_lock = threading.Lock()
+        self.capture_backend = ScreenCaptureBackend()
+        # Text pre-check and preprocessing, shared with the headless batch command
+        self.router = SearchRouter()
+        # Capture -> preprocess -> OCR -> dispatch runs off the GUI thread
+        self.pipeline = SearchJobPipeline(
+            self._run_job,
+            max_workers=settings.SEARCH_JOB_WORKERS,
+            max_pending=settings.SEARCH_JOB_MAX_PENDING,
+            supersede=settings.SEARCH_JOB_SUPERSEDE,
+        )
+        self.pipeline.job_finished.connect(self._on_search_complete)
 
     def _initialize_ocr(self):
         """Initialize OCR processor only when needed"""
-        if self.ocr_processor is None:
-            self.ocr_processor = OCRProcessor()
+        with self._init_lock:
+            if self.ocr_processor is None:
+                self.ocr_processor = OCRProcessor()
 
     def _initialize_image_handler(self):
         """Initialize image handler only when needed"""
-        if self.image_handler is None:
-            self.image_handler = DirectImageSearchHandler()
+        with self._init_lock:
+            if self.image_handler is None:
+                # Pulls in the browser/upload stack only on the first image search
+                from core.image_search import DirectImageSearchHandler
+                self.image_handler = DirectImageSearchHandler()
+
+    def _get_history(self):
+        """Capture history store, or None when disabled or it cannot be opened"""
+        if not self.history_enabled:
+            return None
+        with self._init_lock:
+            if self.history is None:
+                try:
+                    from core.capture_history import CaptureHistory
+                    self.history = CaptureHistory()
+                except Exception as e:
+                    print(f"[WARNING] Capture history unavailable: {e}")
+                    self.history_enabled = False
+            return self.history
+
+    def prelaunch_browser(self):
+        """Warm up the image-search browser session in the background"""
+        self._initialize_image_handler()
+        self.image_handler.prelaunch_browser()
+
+    def to_capture_rect(self, rect: QRect):
+        """Convert a logical selection to a physical-pixel capture box (GUI thread only)"""
+        screen = QGuiApplication.primaryScreen()
+        pixel_ratio = screen.devicePixelRatio()
+        
+        return {
+            "top": int(rect.top() * pixel_ratio),
+            "left": int(rect.left() * pixel_ratio),
+            "width": int(rect.width() * pixel_ratio),
+            "height": int(rect.height() * pixel_ratio),
+        }
 
     def capture_region(self, rect: QRect):
         """Capture screen region and return PIL Image"""
         try:
-            screen = QGuiApplication.primaryScreen()
-            pixel_ratio = screen.devicePixelRatio()
-            
-            capture_rect = {
-                "top": int(rect.top() * pixel_ratio),
-                "left": int(rect.left() * pixel_ratio),
-                "width": int(rect.width() * pixel_ratio),
-                "height": int(rect.height() * pixel_ratio),
-            }
-            
-            with mss.mss() as sct:
-                sct_img = sct.grab(capture_rect)
-                pil_img = Image.frombytes("RGB", sct_img.size, sct_img.bgra, "raw", "BGRX")
-                return pil_img
-                
+            frame = self.grab_region(self.to_capture_rect(rect))
+            return frame.to_pil() if frame is not None else None
         except Exception as e:
             print(f"[ERROR] Screen capture failed: {e}")
             return None
 
-    def process_selection(self, rect: QRect):
-        """Process selected region for search"""
+    def grab_region(self, capture_rect):
+        """Grab a physical-pixel box as a CapturedFrame, safe to call from any thread"""
+        try:
+            return self.capture_backend.grab(capture_rect)
+        except Exception as e:
+            print(f"[ERROR] Screen capture failed: {e}")
+            return None
+
+    def process_selection(self, rect: QRect, snapshot=None):
+        """Queue the selected region for search, returns immediately with the job
+
+        With a DesktopSnapshot taken when the overlay opened, the selection is
+        an in-memory crop of it; otherwise the screen is grabbed in the job.
+        """
         print("[INFO] Processing selected region...")
+        selected_at = time.perf_counter()
+        if snapshot is not None:
+            frame = snapshot.crop(rect)
+            if frame is not None:
+                return self.pipeline.submit(frame, selected_at)
+            print("[WARNING] Selection outside the snapshot, grabbing the screen instead")
+        # Screen geometry must be read on the GUI thread; everything else runs in the pool
+        return self.pipeline.submit(self.to_capture_rect(rect), selected_at)
+
+    def process_regions(self, rects, snapshot=None):
+        """Queue several regions as one job: OCR runs over them as a batch and the texts are combined"""
+        print(f"[INFO] Processing {len(rects)} selected regions...")
+        selected_at = time.perf_counter()
+        payload = []
+        for rect in rects:
+            frame = snapshot.crop(rect) if snapshot is not None else None
+            payload.append(frame if frame is not None else self.to_capture_rect(rect))
+        return self.pipeline.submit(payload, selected_at)
+
+    def _run_job(self, job):
+        """Capture -> preprocess -> OCR -> dispatch for one job (worker thread)"""
+        if isinstance(job.payload, list):
+            return self._run_regions_job(job)
         
-        # Capture image
-        captured_image = self.capture_region(rect)
-        if not captured_image:
+        # Capture image (raw frame, OCR works on a zero-copy RGB view of it)
+        if isinstance(job.payload, CapturedFrame):
+            frame = job.payload
+        else:
+            frame = job.run_stage("capture", self.grab_region, job.payload)
+        if frame is None:
             print("[ERROR] Failed to capture region")
-            return
+            return False, "Screen capture"
+        tracer.record("selection.capture", time.perf_counter() - job.selected_at,
+                      source="snapshot" if isinstance(job.payload, CapturedFrame) else "grab")
+        pixels = frame.rgb
 
-        # Initialize OCR only when needed
-        self._initialize_ocr()
-        
-        # Perform OCR
-        ocr_text = self.ocr_processor.extract_text(captured_image)
+        history = self._get_history()
+        match = None
+        if history is not None and settings.CAPTURE_HISTORY_REUSE:
+            match = job.run_stage("history_lookup", history.find_same, frame.bgra)
+
+        ocr_text = ""
+        if match is not None:
+            # Identical pixels to an earlier capture: its text (or lack of it) still applies
+            print(f"[INFO] Same as capture #{match['id']}, "
+                  f"reusing its result (~{match['ocr_seconds']:.2f}s OCR saved)")
+            ocr_text = match["text"]
+        elif job.run_stage("precheck", self._may_contain_text, pixels):
+            # Initialize OCR only when needed
+            self._initialize_ocr()
+            
+            # Perform OCR
+            ocr_input = job.run_stage("preprocess", self._prepare_for_ocr, pixels)
+            ocr_text = job.run_stage("ocr", self.ocr_processor.extract_text, ocr_input)
         
+        # A newer selection replaced this one while OCR was running
+        job.token.raise_if_cancelled()
+        result = self._dispatch(job, ocr_text, frame)
+        if match is not None:
+            try:
+                history.mark_reused(match["id"])
+            except Exception as e:
+                print(f"[WARNING] Could not record capture history: {e}")
+        elif history is not None:
+            self._remember(history, frame, ocr_text, job.stage_seconds.get("ocr", 0.0))
+        return result
+
+    def _run_regions_job(self, job):
+        """Capture every region, OCR them in one batch and search the combined text (worker thread)"""
+        frames = job.run_stage("capture", lambda: [
+            payload if isinstance(payload, CapturedFrame) else self.grab_region(payload)
+            for payload in job.payload
+        ])
+        frames = [frame for frame in frames if frame is not None]
+        if not frames:
+            print("[ERROR] Failed to capture regions")
+            return False, "Screen capture"
+        tracer.record("selection.capture", time.perf_counter() - job.selected_at, regions=len(frames))
+
+        texts = []
+        with_text = [frame for frame in frames if job.run_stage("precheck", self._may_contain_text, frame.rgb)]
+        if with_text:
+            self._initialize_ocr()
+            ocr_inputs = job.run_stage("preprocess", lambda: [self._prepare_for_ocr(frame.rgb) for frame in with_text])
+            texts = job.run_stage("ocr", self.ocr_processor.extract_text_batch, ocr_inputs)
+
+        job.token.raise_if_cancelled()
+        # Regions in selection order, separated by a blank line
+        ocr_text = "\n\n".join(text.strip() for text in texts if text.strip())
+        # Without any text, search the largest region as an image
+        largest = max(frames, key=lambda frame: frame.size[0] * frame.size[1])
+        result = self._dispatch(job, ocr_text, largest)
+
+        # Each region is its own history entry, so a later single capture of it can match
+        history = self._get_history()
+        if history is not None:
+            region_texts = {id(frame): text.strip() for frame, text in zip(with_text, texts)}
+            ocr_seconds = job.stage_seconds.get("ocr", 0.0) / max(1, len(with_text))
+            for frame in frames:
+                text = region_texts.get(id(frame), "")
+                self._remember(history, frame, text, ocr_seconds if id(frame) in region_texts else 0.0)
+        return result
+
+    def _remember(self, history, frame, ocr_text, ocr_seconds):
+        """Add a finished capture to the history (hashed here, after dispatch); failures never affect the search"""
+        ocr_text = ocr_text.strip()
+        try:
+            with tracer.span("history.add"):
+                history.add(frame.bgra, ocr_text, "text" if ocr_text else "image", ocr_seconds=ocr_seconds)
+        except Exception as e:
+            print(f"[WARNING] Could not record capture history: {e}")
+
+    def _dispatch(self, job, ocr_text, frame):
+        """Copy recognized text and search it, or fall back to a reverse image search of frame"""
         # Auto-copy text to clipboard
         if ocr_text.strip():
             try:
-                pyperclip.copy(ocr_text.strip())
+                with tracer.span("clipboard.copy", chars=len(ocr_text.strip())):
+                    pyperclip.copy(ocr_text.strip())
                 print("[INFO] Text copied to clipboard")
             except Exception as e:
                 print(f"[WARNING] Could not copy text: {e}")
@@ -104,24 +234,25 @@ class DirectSearchEngine:
         # Determine search type and execute
         if ocr_text.strip():
             print(f"[INFO] 🔍 Performing text search: {ocr_text[:40]}...")
-            self._start_search_worker(rect, text=ocr_text.strip())
-        else:
-            print("[INFO] 🚀 Performing direct image search...")
-            # Initialize image handler only when needed
-            self._initialize_image_handler()
-            self._start_search_worker(rect, image=captured_image)
-
-    def _start_search_worker(self, rect, image=None, text=None):
-        """Start search in worker thread"""
-        if self.current_worker and self.current_worker.isRunning():
-            self.current_worker.quit()
-            self.current_worker.wait()
-            
-        self.current_worker = SearchWorker(self, rect, image, text)
-        self.current_worker.finished.connect(self._on_search_complete)
-        self.current_worker.start()
+            success = job.run_stage("dispatch", self.search_text, ocr_text.strip())
+            return success, f"Text search: {ocr_text.strip()[:30]}..."
+        
+        print("[INFO] 🚀 Performing direct image search...")
+        # Initialize image handler only when needed
+        self._initialize_image_handler()
+        # Only the image path needs a PIL image
+        success = job.run_stage("dispatch", self.search_image, frame.to_pil())
+        return success, "Direct image search"
+
+    def _prepare_for_ocr(self, pixels):
+        """Shrink the capture (RGB array) to the grayscale pixels OCR needs"""
+        return self.router.prepare_for_ocr(pixels)
+
+    def _may_contain_text(self, pixels):
+        """Cheap pre-check so photos and icons skip OCR entirely"""
+        return self.router.may_contain_text(pixels, self.ocr_processor)
 
-    def _on_search_complete(self, success, message):
+    def _on_search_complete(self, job_id, success, message):
         """Handle search completion"""
         if success:
             print(f"✅ {message} completed successfully!")
@@ -155,11 +286,12 @@ class DirectSearchEngine:
 
     def cleanup(self):
         """Cleanup resources and free memory - ONLY on app exit"""
+        self.pipeline.shutdown(wait=False)
+        self.capture_backend.close()
+        if self.history:
+            self.history.close()
         if self.ocr_processor:
             self.ocr_processor.cleanup()
         # Don't cleanup image_handler here - let browser stay open
         # if self.image_handler:
-        #     self.image_handler.cleanup()
-        if self.current_worker and self.current_worker.isRunning():
-            self.current_worker.quit()
-            self.current_worker.wait()
\ No newline at end of file
+        #     self.image_handler.cleanup()
\ No newline at end of file
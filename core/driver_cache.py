@@ -0,0 +1,126 @@
+import glob
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+
+
+def get_chrome_version():
+    """Installed Chrome version string without starting the browser, or None"""
+    try:
+        if sys.platform == "win32":
+            import winreg
+            # Updated by Chrome itself on every update; one registry read
+            for root in (winreg.HKEY_CURRENT_USER, winreg.HKEY_LOCAL_MACHINE):
+                try:
+                    with winreg.OpenKey(root, r"Software\Google\Chrome\BLBeacon") as key:
+                        return winreg.QueryValueEx(key, "version")[0]
+                except OSError:
+                    continue
+            return None
+        if sys.platform == "darwin":
+            plist = "/Applications/Google Chrome.app/Contents/Info.plist"
+            with open(plist, "rb") as f:
+                import plistlib
+                return plistlib.load(f).get("CFBundleShortVersionString")
+        for binary in ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser"):
+            try:
+                output = subprocess.run([binary, "--version"], capture_output=True, text=True, timeout=5).stdout
+            except (OSError, subprocess.TimeoutExpired):
+                continue
+            match = re.search(r"\d+(\.\d+)+", output)
+            if match:
+                return match.group(0)
+    except Exception as e:
+        print(f"[WARNING] Could not read Chrome version: {e}")
+    return None
+
+
+class DriverPathCache:
+    """Resolved chromedriver path cached on disk, keyed by the installed Chrome version
+
+    ``ChromeDriverManager().install()`` probes versions and may hit the network,
+    so it only runs when the browser version changed. Without a network, a
+    cached driver for the same major version (or any cached one) is used.
+    """
+
+    def __init__(self, path, install_driver=None, version_probe=get_chrome_version):
+        self.path = path
+        self.install_driver = install_driver or self._webdriver_manager_install
+        self.version_probe = version_probe
+        self.entries = {}  # browser version -> driver path
+        self.timings = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    @staticmethod
+    def _webdriver_manager_install():
+        from webdriver_manager.chrome import ChromeDriverManager
+        return ChromeDriverManager().install()
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f).get("drivers", {})
+        except Exception as e:
+            print(f"[WARNING] Could not load driver cache: {e}")
+
+    def _save(self):
+        if not self.path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temp_path = self.path + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump({"drivers": self.entries}, f)
+            os.replace(temp_path, self.path)
+        except Exception as e:
+            print(f"[WARNING] Could not save driver cache: {e}")
+
+    def _offline_candidate(self, version):
+        """Best cached driver when the exact version cannot be resolved"""
+        major = version.split(".")[0] if version else None
+        existing = {v: p for v, p in self.entries.items() if os.path.exists(p)}
+        for cached_version, driver_path in existing.items():
+            if major and cached_version.split(".")[0] == major:
+                return driver_path
+        # webdriver_manager's own download cache, newest first
+        pattern = os.path.join(os.path.expanduser("~"), ".wdm", "drivers", "chromedriver", "*", f"{major or '*'}*", "**", "chromedriver*")
+        found = sorted((p for p in glob.glob(pattern, recursive=True) if os.path.isfile(p)), key=os.path.getmtime, reverse=True)
+        if found:
+            return found[0]
+        return next(iter(existing.values()), None)
+
+    def resolve(self):
+        """Driver path for the installed browser, or None to let Selenium locate one"""
+        with self._lock:
+            self.timings = {}
+            start = time.perf_counter()
+            version = self.version_probe()
+            self.timings["version_probe"] = time.perf_counter() - start
+
+            cached = self.entries.get(version) if version else None
+            if cached and os.path.exists(cached):
+                self.timings["source"] = "cache"
+                return cached
+
+            start = time.perf_counter()
+            try:
+                driver_path = self.install_driver()
+                self.timings["install"] = time.perf_counter() - start
+                self.timings["source"] = "resolved"
+                if version:
+                    self.entries[version] = driver_path
+                    self._save()
+                return driver_path
+            except Exception as e:
+                self.timings["install"] = time.perf_counter() - start
+                print(f"[WARNING] Driver resolution failed ({e}), trying cached drivers")
+            driver_path = self._offline_candidate(version)
+            self.timings["source"] = "offline" if driver_path else "selenium"
+            return driver_path
@@ -0,0 +1,111 @@
+import http.client
+import json
+import threading
+import time
+import uuid
+from urllib.parse import urljoin, urlsplit
+
+
+class HTTPUploadBackend:
+    """Browserless reverse image search: multipart POST of the image, open the results URL
+
+    Connections are kept alive and reused per host, so repeated searches skip
+    the TCP and TLS handshakes. The results URL is taken from a redirect
+    ``Location`` header or, for JSON endpoints, a ``url`` field in the body.
+    """
+
+    def __init__(self, upload_url, field_name="encoded_image", timeout=10.0, user_agent=None):
+        self.upload_url = upload_url
+        self.field_name = field_name
+        self.timeout = timeout
+        self.user_agent = user_agent or "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+        self.last_upload_seconds = None
+        self._connections = {}  # (scheme, host, port) -> HTTPConnection
+        self._lock = threading.Lock()
+
+    def _connection(self, parts, fresh=False):
+        """Pooled keep-alive connection for the URL's host"""
+        key = (parts.scheme, parts.hostname, parts.port)
+        conn = self._connections.get(key)
+        if conn is None or fresh:
+            if conn is not None:
+                conn.close()
+            conn_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+            conn = conn_class(parts.hostname, parts.port, timeout=self.timeout)
+            self._connections[key] = conn
+        return conn
+
+    @staticmethod
+    def encode_multipart(field_name, filename, data, content_type="image/jpeg"):
+        """Build a multipart/form-data body with one file field, returns (body, content type)"""
+        boundary = uuid.uuid4().hex
+        head = (
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="{field_name}"; filename="{filename}"\r\n'
+            f"Content-Type: {content_type}\r\n\r\n"
+        ).encode()
+        tail = f"\r\n--{boundary}--\r\n".encode()
+        return b"".join((head, data, tail)), f"multipart/form-data; boundary={boundary}"
+
+    def _post(self, parts, body, headers):
+        """POST on the pooled connection, reconnecting once if the server dropped it"""
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        for attempt in range(2):
+            conn = self._connection(parts, fresh=attempt > 0)
+            try:
+                conn.request("POST", path, body=body, headers=headers)
+                response = conn.getresponse()
+                payload = response.read()  # drain so the connection can be reused
+                return response, payload
+            except (http.client.RemoteDisconnected, ConnectionError, http.client.CannotSendRequest,
+                    http.client.BadStatusLine):
+                if attempt:
+                    raise
+        return None, b""
+
+    def upload(self, image_bytes, filename="search_image.jpg", content_type="image/jpeg"):
+        """Upload encoded image bytes and return the results URL, or None"""
+        parts = urlsplit(self.upload_url)
+        body, multipart_type = self.encode_multipart(self.field_name, filename, image_bytes, content_type)
+        headers = {
+            "Content-Type": multipart_type,
+            "Content-Length": str(len(body)),
+            "User-Agent": self.user_agent,
+            "Connection": "keep-alive",
+        }
+        start = time.perf_counter()
+        try:
+            with self._lock:
+                response, payload = self._post(parts, body, headers)
+        except Exception as e:
+            print(f"[WARNING] HTTP image upload failed: {e}")
+            return None
+        finally:
+            self.last_upload_seconds = time.perf_counter() - start
+
+        results_url = self._results_url(response, payload)
+        if not results_url:
+            print(f"[WARNING] HTTP upload returned no results URL (status {response.status})")
+        return results_url
+
+    def _results_url(self, response, payload):
+        """Results URL from a redirect or a JSON body"""
+        location = response.getheader("Location")
+        if 300 <= response.status < 400 and location:
+            return urljoin(self.upload_url, location)
+        if response.status == 200 and "json" in (response.getheader("Content-Type") or ""):
+            try:
+                url = json.loads(payload.decode("utf-8")).get("url")
+                return urljoin(self.upload_url, url) if url else None
+            except (ValueError, AttributeError):
+                return None
+        return None
+
+    def close(self):
+        """Close all pooled connections"""
+        with self._lock:
+            for conn in self._connections.values():
+                conn.close()
+            self._connections.clear()
@@ -6,78 +6,127 @@ from PIL import Image
 import threading
 import sys
 
-# Selenium imports for direct image search
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.service import Service as ChromeService
+from config import settings
+from core.browser_session import BrowserSession
+from core.driver_cache import DriverPathCache
+from core.http_upload import HTTPUploadBackend
+from utils.image_processing import ImageEncoder
+from utils.lazy_import import is_available, lazy_import
+from utils.temp_store import TempFileStore
+from utils.tracing import tracer
+
+# Selenium for direct image search, imported only when the browser path runs
+webdriver = lazy_import("selenium.webdriver")
+By = lazy_import("selenium.webdriver.common.by", "By")
+WebDriverWait = lazy_import("selenium.webdriver.support.ui", "WebDriverWait")
+EC = lazy_import("selenium.webdriver.support.expected_conditions")
+selenium_exceptions = lazy_import("selenium.common.exceptions")
+ChromeService = lazy_import("selenium.webdriver.chrome.service", "Service")
 
 class DirectImageSearchHandler:
     """Handles DIRECT image search with automatic upload to Google Images"""
     
-    def __init__(self):
+    UPLOAD_URLS = {
+        "lens": "https://lens.google.com/",
+        "images": "https://images.google.com",
+        "endpoint": "https://www.google.com/searchbyimage/upload",
+    }
+    RACE_ORDER = ("lens", "images", "endpoint")
+    CAMERA_SELECTORS = [
+        "div[aria-label*='Search by image']",
+        "div[role='button'][aria-label*='image']",
+        ".LM8x9c",
+        ".nDcEnd"
+    ]
+    
+    def __init__(self, upload_urls=None):
         self.temp_dir = tempfile.gettempdir()
         self.driver = None
+        # Overridable so the strategies can run against a local stand-in
+        self.upload_urls = dict(self.UPLOAD_URLS, **(upload_urls or {}))
+        self.wait_seconds = settings.IMAGE_UPLOAD_WAIT_SECONDS
+        # perf_counter() deadline shared by the waits of the running upload chain
+        self.wait_deadline = None
+        self.race_strategies = settings.IMAGE_UPLOAD_RACE
+        # Time-to-upload of the last successful run, per strategy
+        self.strategy_seconds = {}
         self.selenium_available = self._check_selenium()
+        # Browserless upload tried first; Selenium is the fallback
+        self.upload_backend = settings.IMAGE_UPLOAD_BACKEND
+        self.http_backend = HTTPUploadBackend(
+            self.upload_urls.get("http", settings.IMAGE_UPLOAD_HTTP_URL),
+            field_name=settings.IMAGE_UPLOAD_HTTP_FIELD,
+            timeout=settings.IMAGE_UPLOAD_HTTP_TIMEOUT,
+        )
+        # Encode once in memory; files only go through the bounded temp store
+        self.encoder = ImageEncoder(
+            max_size=settings.IMAGE_SEARCH_MAX_SIZE,
+            byte_budget=settings.IMAGE_SEARCH_BYTE_BUDGET,
+        )
+        self.temp_store = TempFileStore(
+            os.path.join(self._get_safe_temp_dir(), "DirectSearch"),
+            max_files=settings.TEMP_STORE_MAX_FILES,
+            max_bytes=settings.TEMP_STORE_MAX_BYTES,
+            max_age_seconds=settings.TEMP_STORE_MAX_AGE_SECONDS,
+        )
+        # chromedriver path keyed by Chrome version, re-resolved only on a browser update
+        self.driver_cache = DriverPathCache(settings.DRIVER_CACHE_PATH)
+        self.driver_timings = {}
+        # One browser reused across searches, each search in a new tab
+        self.session = BrowserSession(self._create_driver)
     
     def _check_selenium(self):
-        """Check if Selenium is available"""
-        try:
-            from selenium import webdriver
+        """Check if Selenium is available (without importing it)"""
+        if is_available("selenium"):
             return True
-        except ImportError:
-            print("[WARNING] Selenium not available - direct image search disabled")
-            return False
+        print("[WARNING] Selenium not available - direct image search disabled")
+        return False
     
     def perform_direct_image_search(self, pil_image: Image.Image):
         """DIRECT image upload to Google Images using Selenium automation - BROWSER STAYS OPEN"""
+        with tracer.span("image.encode") as span:
+            encoded = self.encoder.encode(pil_image)
+            span.set(format=encoded.format, bytes=len(encoded.data), size=f"{encoded.size[0]}x{encoded.size[1]}")
+        if self.upload_backend == "http" and self._try_http_upload(encoded):
+            return True
+        
         if not self.selenium_available:
             print("[WARNING] Selenium not available, using fallback method")
-            return self._fallback_image_search(pil_image)
+            return self._fallback_image_search(pil_image, encoded)
         
         try:
             print("🚀 Starting DIRECT image search automation...")
+            self.strategy_seconds = {}
             
             # Save image to temporary file
-            temp_image_path = self._save_temp_image(pil_image)
+            temp_image_path = self._save_temp_image(encoded)
             print(f"📁 Temporary image saved: {temp_image_path}")
             
             # Setup Chrome driver
             if not self._setup_driver():
-                return self._fallback_image_search(pil_image)
+                return self._fallback_image_search(pil_image, encoded)
             
-            # METHOD 1: Try direct Google Lens URL first (most reliable)
-            print("🔧 Attempting Method 1: Direct Google Lens upload...")
-            if self._try_direct_lens_upload(temp_image_path):
-                print("✅ Google Lens search completed - browser will stay open for user to view results")
-                return True
-            
-            # METHOD 2: Try traditional Google Images flow
-            print("🔧 Attempting Method 2: Traditional Google Images...")
-            if self._try_google_images_upload(temp_image_path):
-                print("✅ Google Images search completed - browser will stay open for user to view results")
-                return True
+            if self.race_strategies:
+                print("🔧 Racing all upload methods in parallel tabs...")
+                if self._race_upload_strategies(temp_image_path):
+                    return True
+                if self._try_interactive_upload(temp_image_path):
+                    return True
+                print("❌ All direct upload methods failed, using fallback...")
+                return self._fallback_image_search(pil_image, encoded)
             
-            # METHOD 3: Last resort - use Google's upload endpoint directly
-            print("🔧 Attempting Method 3: Direct upload endpoint...")
-            if self._try_direct_upload_endpoint(temp_image_path):
-                print("✅ Direct upload search completed - browser will stay open for user to view results")
+            if self._upload_chain(temp_image_path):
                 return True
             
             # All methods failed
             print("❌ All direct upload methods failed, using fallback...")
-            self.temp_files = getattr(self, "temp_files", [])
-            self.temp_files.append(temp_image_path)
-            return self._fallback_image_search(pil_image)
+            return self._fallback_image_search(pil_image, encoded)
     
         
                 
         except Exception as e:
             print(f"❌ Direct image search failed: {e}")
-            return self._fallback_image_search(pil_image)
+            return self._fallback_image_search(pil_image, encoded)
         # finally:
         #     # Cleanup temp file only - DON'T cleanup driver
         #     if 'temp_image_path' in locals():
@@ -88,37 +137,103 @@ class DirectImageSearchHandler:
         
         
     
+    def _upload_chain(self, image_path):
+        """Try each upload method in turn; their waits share one wait_seconds budget"""
+        self.wait_deadline = time.perf_counter() + self.wait_seconds
+        try:
+            # METHOD 1: Try direct Google Lens URL first (most reliable)
+            print("🔧 Attempting Method 1: Direct Google Lens upload...")
+            if self._timed_strategy("lens", self._try_direct_lens_upload, image_path):
+                print("✅ Google Lens search completed - browser will stay open for user to view results")
+                return True
+            
+            # METHOD 2: Try traditional Google Images flow
+            print("🔧 Attempting Method 2: Traditional Google Images...")
+            if self._timed_strategy("images", self._try_google_images_upload, image_path):
+                print("✅ Google Images search completed - browser will stay open for user to view results")
+                return True
+            
+            # METHOD 3: Last resort - use Google's upload endpoint directly
+            print("🔧 Attempting Method 3: Direct upload endpoint...")
+            if self._timed_strategy("endpoint", self._try_direct_upload_endpoint, image_path):
+                print("✅ Direct upload search completed - browser will stay open for user to view results")
+                return True
+            return False
+        finally:
+            self.wait_deadline = None
+    
+    def _try_http_upload(self, encoded):
+        """Browserless upload: POST the image and open the results page in the default browser"""
+        try:
+            print("🚀 Uploading image over HTTP...")
+            with tracer.span("image.upload", strategy="http") as span:
+                results_url = self.http_backend.upload(encoded.data, "search_image" + encoded.extension, encoded.mime_type)
+                span.set(success=bool(results_url))
+            if not results_url:
+                print("🔧 HTTP upload gave no results page, falling back to browser automation...")
+                return False
+            webbrowser.open(results_url)
+            print("✅ Image search results opened in browser")
+            return True
+        except Exception as e:
+            print(f"❌ HTTP image upload failed: {e}")
+            return False
+    
+    def _timed_strategy(self, name, method, image_path):
+        """Run one upload strategy and record its time-to-upload (or time-to-fail)"""
+        start = time.perf_counter()
+        success = method(image_path)
+        self.strategy_seconds[name] = time.perf_counter() - start
+        tracer.record("image.upload", self.strategy_seconds[name], strategy=name, success=bool(success))
+        return success
+    
+    def _wait_for(self, condition, timeout=None):
+        """Wait for an expected condition, returning its value or None on timeout
+
+        Inside an upload chain the wait ends at the chain's deadline; once that
+        has passed the condition is still checked once, without waiting.
+        """
+        timeout = timeout or self.wait_seconds
+        if self.wait_deadline is not None:
+            timeout = max(0, min(timeout, self.wait_deadline - time.perf_counter()))
+        try:
+            return WebDriverWait(self.driver, timeout, poll_frequency=0.1).until(condition)
+        except selenium_exceptions.TimeoutException:
+            return None
+    
+    def _find_file_input(self):
+        """Non-blocking lookup of a file input on the current page"""
+        inputs = self.driver.find_elements(By.CSS_SELECTOR, "input[type='file']")
+        return inputs[0] if inputs else None
+    
+    def _click_camera_icon(self):
+        """Non-blocking: click the 'Search by image' camera icon if it is showing"""
+        for selector in self.CAMERA_SELECTORS:
+            for camera_btn in self.driver.find_elements(By.CSS_SELECTOR, selector):
+                try:
+                    if camera_btn.is_displayed() and camera_btn.is_enabled():
+                        camera_btn.click()
+                        print("✅ Camera icon clicked!")
+                        return True
+                except Exception:
+                    continue
+        return False
+    
     def _try_direct_lens_upload(self, image_path):
         """Method 1: Use Google Lens directly (most reliable)"""
         try:
             print("🌐 Opening Google Lens...")
-            self.driver.get("https://lens.google.com/")
-            time.sleep(3)
+            self.driver.get(self.upload_urls["lens"])
             
-            # Try to find the upload area
+            # Wait for the upload input instead of sleeping a fixed time
             print("📤 Looking for upload area...")
-            upload_selectors = [
-                "input[type='file']",
-                "div[role='button'][aria-label*='image']",
-                "div[data-query*='upload']",
-                "button[aria-label*='image']"
-            ]
-            
-            for selector in upload_selectors:
-                try:
-                    file_inputs = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    for element in file_inputs:
-                        try:
-                            if element.tag_name.lower() == "input" and element.get_attribute("type") == "file":
-                                print("✅ Found file input, uploading image...")
-                                element.send_keys(image_path)
-                                print("🎉 Image uploaded to Google Lens!")
-                                print("📖 Browser will stay open - close it manually when done")
-                                return True
-                        except Exception as e:
-                            continue
-                except:
-                    continue
+            file_input = self._wait_for(EC.presence_of_element_located((By.CSS_SELECTOR, "input[type='file']")))
+            if file_input:
+                print("✅ Found file input, uploading image...")
+                file_input.send_keys(image_path)
+                print("🎉 Image uploaded to Google Lens!")
+                print("📖 Browser will stay open - close it manually when done")
+                return True
             
             # If no file input found, try clicking around
             print("🔍 No direct file input found, trying interactive method...")
@@ -132,43 +247,24 @@ class DirectImageSearchHandler:
         """Method 2: Traditional Google Images upload"""
         try:
             print("🌐 Opening Google Images...")
-            self.driver.get("https://images.google.com")
-            time.sleep(2)
+            self.driver.get(self.upload_urls["images"])
             
             # Try to find and click the camera icon
             print("📷 Looking for camera icon...")
-            camera_selectors = [
-                "div[aria-label*='Search by image']",
-                "div[role='button'][aria-label*='image']",
-                ".LM8x9c",
-                ".nDcEnd"
-            ]
-            
-            for selector in camera_selectors:
-                try:
-                    camera_btn = self.driver.find_element(By.CSS_SELECTOR, selector)
-                    if camera_btn.is_displayed() and camera_btn.is_enabled():
-                        camera_btn.click()
-                        print("✅ Camera icon clicked!")
-                        time.sleep(2)
-                        break
-                except:
-                    continue
-            else:
+            if not self._wait_for(lambda driver: self._click_camera_icon()):
                 print("❌ Could not find camera icon")
                 return False
             
             # Try to find file input after camera click
             print("📤 Looking for file input after camera click...")
-            try:
-                file_input = self.driver.find_element(By.CSS_SELECTOR, "input[type='file']")
+            file_input = self._wait_for(EC.presence_of_element_located((By.CSS_SELECTOR, "input[type='file']")))
+            if file_input:
                 file_input.send_keys(image_path)
                 print("✅ Image uploaded via Google Images!")
                 print("📖 Browser will stay open - close it manually when done")
                 return True
-            except:
-                print("❌ File input not found after camera click")
-                return False
+            print("❌ File input not found after camera click")
+            return False
                 
         except Exception as e:
             print(f"❌ Google Images upload failed: {e}")
@@ -178,19 +274,17 @@ class DirectImageSearchHandler:
         """Method 3: Use Google's direct upload endpoint"""
         try:
             print("🌐 Using direct upload endpoint...")
-            self.driver.get("https://www.google.com/searchbyimage/upload")
-            time.sleep(2)
+            self.driver.get(self.upload_urls["endpoint"])
             
             # Look for file input on the upload page
-            try:
-                file_input = self.driver.find_element(By.CSS_SELECTOR, "input[type='file']")
+            file_input = self._wait_for(EC.presence_of_element_located((By.CSS_SELECTOR, "input[type='file']")))
+            if file_input:
                 file_input.send_keys(image_path)
                 print("✅ Image uploaded via direct endpoint!")
                 print("📖 Browser will stay open - close it manually when done")
                 return True
-            except:
-                print("❌ No file input found on upload page")
-                return False
+            print("❌ No file input found on upload page")
+            return False
                 
         except Exception as e:
             print(f"❌ Direct endpoint upload failed: {e}")
@@ -199,7 +293,7 @@ class DirectImageSearchHandler:
     def _try_interactive_upload(self, image_path):
         """Interactive method using JavaScript and click simulation"""
         try:
-            # Use JavaScript to create a file input element
+            # Use JavaScript to create a file input element (synchronous, no wait needed)
             js_script = """
             var input = document.createElement('input');
             input.type = 'file';
@@ -208,12 +302,10 @@ class DirectImageSearchHandler:
             document.body.appendChild(input);
             """
             self.driver.execute_script(js_script)
-            time.sleep(1)
             
             # Find the created input and upload file
             file_input = self.driver.find_element(By.ID, 'auto-upload-input')
             file_input.send_keys(image_path)
-            time.sleep(2)
             
             # Try to trigger form submission
             submit_script = """
@@ -231,8 +323,79 @@ class DirectImageSearchHandler:
             print(f"❌ Interactive upload failed: {e}")
             return False
     
+    def _race_upload_strategies(self, image_path):
+        """Load every upload page at once in its own tab and upload to whichever is ready first"""
+        start = time.perf_counter()
+        deadline = start + self.wait_seconds
+        tabs = {}
+        winner = None
+        search_tab = None
+        try:
+            handles_before = set(self.driver.window_handles)
+            search_tab = self.driver.current_window_handle
+            # Navigation via script returns immediately, so all pages load concurrently
+            for index, name in enumerate(self.RACE_ORDER):
+                if index > 0:
+                    self.driver.switch_to.new_window("tab")
+                self.driver.execute_script("window.location.href = arguments[0];", self.upload_urls[name])
+                tabs[name] = self.driver.current_window_handle
+            
+            clicked = set()
+            while winner is None and time.perf_counter() < deadline:
+                for name, handle in tabs.items():
+                    self.driver.switch_to.window(handle)
+                    file_input = self._find_file_input()
+                    if file_input is None and name == "images" and name not in clicked:
+                        if self._click_camera_icon():
+                            clicked.add(name)
+                        continue
+                    if file_input is not None:
+                        file_input.send_keys(image_path)
+                        winner = name
+                        break
+                else:
+                    time.sleep(0.05)
+            
+            if winner is None:
+                print("❌ No upload page became ready in time")
+                return False
+            
+            self.strategy_seconds[winner] = time.perf_counter() - start
+            print(f"🏁 {winner} upload won the race in {self.strategy_seconds[winner]:.2f}s")
+            print("📖 Browser will stay open - close it manually when done")
+            return True
+        except Exception as e:
+            print(f"❌ Racing upload strategies failed: {e}")
+            return False
+        finally:
+            if search_tab is not None:
+                # Keep only the winning tab, or the search's own tab when nothing won
+                self._close_race_tabs(search_tab, handles_before, tabs[winner] if winner else search_tab)
+    
+    def _close_race_tabs(self, search_tab, handles_before, keep):
+        """Close the tabs a race opened (and the search tab unless kept), then switch to keep"""
+        try:
+            opened = [handle for handle in self.driver.window_handles if handle not in handles_before]
+            for handle in [search_tab] + opened:
+                if handle != keep:
+                    self.driver.switch_to.window(handle)
+                    self.driver.close()
+            self.driver.switch_to.window(keep)
+        except Exception as e:
+            print(f"[WARNING] Could not close race tabs: {e}")
+    
+    def prelaunch_browser(self):
+        """Start the browser in the background so the first image search is warm"""
+        if self.selenium_available:
+            self.session.prelaunch()
+
     def _setup_driver(self):
-        """Setup Chrome driver with optimized options"""
+        """Get a live driver from the persistent session, on a fresh tab"""
+        self.driver = self.session.acquire()
+        return self.driver is not None
+
+    def _create_driver(self):
+        """Launch Chrome driver with optimized options"""
         try:
             chrome_options = webdriver.ChromeOptions()
             chrome_options.add_argument("--no-sandbox")
@@ -247,22 +410,34 @@ class DirectImageSearchHandler:
             # Set page load strategy to 'eager' to load quickly
             chrome_options.page_load_strategy = 'eager'
             
-            self.driver = webdriver.Chrome(
-                service=ChromeService(ChromeDriverManager().install()),
+            resolve_start = time.perf_counter()
+            driver_path = self.driver_cache.resolve()
+            resolve_seconds = time.perf_counter() - resolve_start
+            
+            launch_start = time.perf_counter()
+            driver = webdriver.Chrome(
+                # No path: Selenium Manager locates a driver itself
+                service=ChromeService(driver_path) if driver_path else ChromeService(),
                 options=chrome_options
             )
+            self.driver_timings = dict(self.driver_cache.timings, resolve=resolve_seconds,
+                                       launch=time.perf_counter() - launch_start)
+            tracer.record("browser.driver_launch", time.perf_counter() - resolve_start,
+                          resolve_ms=round(resolve_seconds * 1000, 1),
+                          launch_ms=round(self.driver_timings["launch"] * 1000, 1),
+                          source=self.driver_cache.timings.get("source"))
             
             # Remove webdriver property
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
             
             # Set implicit wait to 0 (no waiting)
-            self.driver.implicitly_wait(0)
+            driver.implicitly_wait(0)
             
-            return True
+            return driver
             
         except Exception as e:
             print(f"❌ Chrome driver setup failed: {e}")
-            return False
+            return None
         
     def _get_safe_temp_dir(self):
         """Get a safe temp directory that works in .exe"""
@@ -273,27 +448,15 @@ class DirectImageSearchHandler:
             # Running as script
             return tempfile.gettempdir()
         
-    def _save_temp_image(self, pil_image: Image.Image):
-        """Save image to temporary file"""
-        temp_dir = self._get_safe_temp_dir()
-        temp_path = os.path.join(temp_dir, f"search_image_{int(time.time())}.jpg")
-        
-        # Optimize image
-        img = pil_image.copy()
-        max_size = (1200, 800)
-        if img.size[0] > max_size[0] or img.size[1] > max_size[1]:
-            img.thumbnail(max_size, Image.Resampling.LANCZOS)
-        
-        img.save(temp_path, "JPEG", quality=85)
-        return temp_path
+    def _save_temp_image(self, encoded):
+        """Write the encoded image to a new file in the bounded temp store"""
+        return self.temp_store.write(encoded.data, encoded.extension)
     
-    def _fallback_image_search(self, pil_image: Image.Image):
+    def _fallback_image_search(self, pil_image: Image.Image, encoded=None):
         """Fallback method when direct upload fails"""
         try:
-            # Save to temp for manual upload
-            temp_dir = self._get_safe_temp_dir()
-            image_path = os.path.join(temp_dir, "search_image.jpg")
-            pil_image.save(image_path, "JPEG", quality=90)
+            # Save to temp for manual upload (reusing the bytes already encoded)
+            image_path = self._save_temp_image(encoded or self.encoder.encode(pil_image))
             
             # Open Google Lens with instructions
             webbrowser.open("https://lens.google.com")
@@ -312,21 +475,16 @@ class DirectImageSearchHandler:
     
     def cleanup(self):
         """Clean up browser driver and temp images"""
+        self.http_backend.close()
         if self.driver:
             try:
-                self.driver.quit()
+                self.session.close()
                 self.driver = None
                 print("[INFO] Browser driver cleaned up")
             except:
                 pass
         
-        # Clean temp files at exit
-        if hasattr(self, "temp_files"):
-            for f in self.temp_files:
-                if os.path.exists(f):
-                    try:
-                        os.remove(f)
-                    except:
-                        pass
-            self.temp_files.clear()
-            print("[INFO] Temporary images cleaned up")
+        # Files still used by an open browser tab are kept and aged out on the next start
+        removed = self.temp_store.prune()
+        if removed:
+            print(f"[INFO] {removed} temporary images cleaned up")
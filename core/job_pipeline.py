@@ -0,0 +1,141 @@
+import itertools
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from PySide6.QtCore import QObject, Signal
+
+from utils.tracing import tracer
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when its cancellation token has been set"""
+
+
+class CancellationToken:
+    """Thread-safe flag checked by a job between pipeline stages"""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise JobCancelled()
+
+
+class SearchJob:
+    """One capture -> preprocess -> OCR -> dispatch request"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, payload, selected_at=None):
+        self.job_id = next(self._ids)
+        self.payload = payload
+        self.token = CancellationToken()
+        self.created = time.perf_counter()
+        # When the user finished the selection (perf_counter), for selection -> capture spans
+        self.selected_at = selected_at or self.created
+        self.started = None
+        self.stage_seconds = {}
+
+    def run_stage(self, name, func, *args, **kwargs):
+        """Run one stage, recording its duration and honouring cancellation before it starts"""
+        self.token.raise_if_cancelled()
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.stage_seconds[name] = time.perf_counter() - start
+            tracer.record(f"job.{name}", self.stage_seconds[name], job=self.job_id)
+
+
+class SearchJobPipeline(QObject):
+    """Runs search jobs on a thread pool and reports back to the GUI thread via signals
+
+    A new job supersedes older ones: queued jobs are dropped and running jobs
+    are cancelled at their next stage boundary. Without superseding, at most
+    ``max_pending`` jobs wait in the queue and the oldest is dropped when a
+    burst overflows it.
+    """
+    job_started = Signal(int)
+    job_finished = Signal(int, bool, str)
+    job_cancelled = Signal(int)
+
+    def __init__(self, run_job, max_workers=1, max_pending=2, supersede=True):
+        super().__init__()
+        self.run_job = run_job
+        self.max_pending = max_pending
+        self.supersede = supersede
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="search-job")
+        self.pending = deque()
+        self.running = set()
+        self._lock = threading.Lock()
+
+    def submit(self, payload, selected_at=None):
+        """Queue a job for payload and return it; never blocks the caller"""
+        job = SearchJob(payload, selected_at)
+        with self._lock:
+            if self.supersede:
+                stale = list(self.pending) + list(self.running)
+                self.pending.clear()
+            else:
+                stale = []
+                while len(self.pending) >= self.max_pending:
+                    stale.append(self.pending.popleft())
+            self.pending.append(job)
+        for old in stale:
+            if old.token.cancelled:
+                continue
+            old.token.cancel()
+            tracer.event("job.superseded", job=old.job_id, by=job.job_id)
+        self.executor.submit(self._execute, job)
+        return job
+
+    def cancel_all(self):
+        """Cancel every queued and running job"""
+        with self._lock:
+            jobs = list(self.pending) + list(self.running)
+            self.pending.clear()
+        for job in jobs:
+            job.token.cancel()
+
+    def shutdown(self, wait=False):
+        """Cancel outstanding work and stop the pool"""
+        self.cancel_all()
+        # Queued jobs still get their turn but return at once on the cancelled token
+        # (cancel_futures would need Python 3.9)
+        self.executor.shutdown(wait=wait)
+
+    def _execute(self, job):
+        """Worker-thread body for one job"""
+        with self._lock:
+            if job in self.pending:
+                self.pending.remove(job)
+            if job.token.cancelled:
+                self.job_cancelled.emit(job.job_id)
+                return
+            self.running.add(job)
+        job.started = time.perf_counter()
+        self.job_started.emit(job.job_id)
+        try:
+            success, message = self.run_job(job)
+            stages = {name: round(seconds * 1000, 1) for name, seconds in job.stage_seconds.items()}
+            tracer.record("job.total", time.perf_counter() - job.selected_at, job=job.job_id, success=bool(success),
+                          stages=stages)
+            self.job_finished.emit(job.job_id, success, message)
+        except JobCancelled:
+            tracer.record("job.cancelled", time.perf_counter() - job.selected_at, job=job.job_id)
+            self.job_cancelled.emit(job.job_id)
+        except Exception as e:
+            print(f"[ERROR] Search job {job.job_id} failed: {e}")
+            self.job_finished.emit(job.job_id, False, f"Error: {str(e)}")
+        finally:
+            with self._lock:
+                self.running.discard(job)
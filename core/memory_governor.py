@@ -0,0 +1,123 @@
+import ctypes
+import gc
+import os
+import sys
+import threading
+import time
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from config import settings
+
+
+def get_rss_bytes():
+    """Resident set size (working set on Windows) of this process, or None"""
+    try:
+        if sys.platform == "win32":
+            from ctypes import wintypes
+
+            class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+                _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                            ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                            ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+            counters = PROCESS_MEMORY_COUNTERS()
+            counters.cb = ctypes.sizeof(counters)
+            process = ctypes.windll.kernel32.GetCurrentProcess()
+            if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+                return counters.WorkingSetSize
+            return None
+        if os.path.exists("/proc/self/statm"):
+            with open("/proc/self/statm") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        import psutil
+        return psutil.Process().memory_info().rss
+    except Exception:
+        return None
+
+
+def release_memory():
+    """Collect garbage and hand freed heap pages back to the OS"""
+    gc.collect()
+    try:
+        if sys.platform == "win32":
+            # Trim the working set; freed pages leave RSS immediately
+            process = ctypes.windll.kernel32.GetCurrentProcess()
+            ctypes.windll.psapi.EmptyWorkingSet(process)
+        elif sys.platform.startswith("linux"):
+            # glibc keeps freed small allocations in its arenas until trimmed
+            ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except Exception as e:
+        print(f"[WARNING] Could not return memory to the OS: {e}")
+
+
+def _format_mb(rss):
+    return f"{rss / 1024 / 1024:.1f} MB" if rss is not None else "n/a"
+
+
+class MemoryGovernor(QObject):
+    """Unloads the OCR reader after an idle period or when RSS crosses a watermark
+
+    The check timer only runs while the reader is loaded, so an unloaded app
+    causes no wakeups; ``arm()`` restarts it after the reader is used or
+    loaded again. OCR reloads the reader on demand after an unload.
+    """
+    unloaded = Signal(str, float, float)  # reason, RSS MB before, RSS MB after
+
+    def __init__(self, ocr_processor, idle_seconds=None, rss_watermark_mb=None, check_interval_ms=None):
+        super().__init__()
+        # A processor or a zero-argument factory, like the prewarmer
+        self.get_processor = ocr_processor if callable(ocr_processor) else (lambda: ocr_processor)
+        self.idle_seconds = settings.OCR_IDLE_UNLOAD_SECONDS if idle_seconds is None else idle_seconds
+        self.rss_watermark_mb = settings.OCR_RSS_WATERMARK_MB if rss_watermark_mb is None else rss_watermark_mb
+        self.unloads = 0
+        self._thread = None
+
+        self.check_timer = QTimer(self)
+        self.check_timer.setInterval(settings.MEMORY_CHECK_INTERVAL_MS if check_interval_ms is None else check_interval_ms)
+        self.check_timer.timeout.connect(self.check)
+
+    def arm(self, *args):
+        """Start watching (call after the reader was loaded or used)"""
+        if (self.idle_seconds or self.rss_watermark_mb) and not self.check_timer.isActive():
+            self.check_timer.start()
+
+    def stop(self):
+        self.check_timer.stop()
+
+    def check(self):
+        """Decide whether to unload now (GUI thread, cheap)"""
+        processor = self.get_processor()
+        if not processor.is_ready():
+            self.check_timer.stop()
+            return
+        if self._thread is not None and self._thread.is_alive():
+            return
+        reason = None
+        idle = processor.idle_seconds()
+        rss = get_rss_bytes()
+        if self.idle_seconds and idle is not None and idle >= self.idle_seconds:
+            reason = f"idle {idle:.0f}s"
+        elif (self.rss_watermark_mb and rss is not None and rss / 1024 / 1024 >= self.rss_watermark_mb
+              # Only between bursts of captures, so a large model does not thrash
+              and idle is not None and idle * 1000 >= self.check_timer.interval()):
+            reason = f"RSS {_format_mb(rss)} over {self.rss_watermark_mb} MB watermark"
+        if reason:
+            # Freeing the model and trimming the heap can take a moment; keep it off the GUI thread
+            self._thread = threading.Thread(target=self.unload, args=(reason,), name="ocr-unload", daemon=True)
+            self._thread.start()
+
+    def unload(self, reason="requested"):
+        """Drop the reader and return its memory to the OS, reporting RSS before and after"""
+        rss_before = get_rss_bytes()
+        start = time.perf_counter()
+        if not self.get_processor().unload():
+            return False
+        release_memory()
+        rss_after = get_rss_bytes()
+        self.unloads += 1
+        print(f"[INFO] OCR reader unloaded ({reason}) in {time.perf_counter() - start:.2f}s: "
+              f"RSS {_format_mb(rss_before)} -> {_format_mb(rss_after)}")
+        self.unloaded.emit(reason, (rss_before or 0) / 1024 / 1024, (rss_after or 0) / 1024 / 1024)
+        return True
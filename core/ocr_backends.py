@@ -0,0 +1,171 @@
+import json
+import os
+from abc import ABC, abstractmethod
+import numpy
+
+from config import settings
+from core.ocr_precision import apply_precision, reader_kwargs
+from utils.lazy_import import is_available
+
+
+class OCRBackend(ABC):
+    """One OCR engine behind OCRProcessor
+
+    ``readtext`` takes an RGB or grayscale uint8 array and returns EasyOCR-style
+    ``[(box, text, confidence), ...]`` with ``box`` as four [x, y] corners,
+    so tiling, merging and confidence filtering work the same for every engine.
+    """
+    name = None
+    module = None  # importable module that must be installed
+
+    def __init__(self, languages, precision="int8"):
+        self.languages = list(languages)
+        self.precision = precision
+
+    @classmethod
+    def is_available(cls):
+        return is_available(cls.module)
+
+    @abstractmethod
+    def load(self):
+        """Load the engine (slow), returns self"""
+
+    @abstractmethod
+    def readtext(self, image_np):
+        """[(box, text, confidence), ...] for one image"""
+
+    def signature(self):
+        """Settings of this engine that change its output"""
+        return self.name
+
+
+class EasyOCRBackend(OCRBackend):
+    """easyocr.Reader (PyTorch); other attributes are forwarded to the reader"""
+    name = "easyocr"
+    module = "easyocr"
+
+    def __init__(self, languages, precision="int8"):
+        super().__init__(languages, precision)
+        self.reader = None
+
+    def load(self):
+        import easyocr
+        reader = easyocr.Reader(self.languages, gpu=False, **reader_kwargs(self.precision))
+        self.reader = apply_precision(reader, self.precision)
+        return self
+
+    def readtext(self, image_np):
+        return self.reader.readtext(image_np)
+
+    def signature(self):
+        return f"{self.name}:{self.precision}"
+
+    def __getattr__(self, name):
+        # readtext_batched, detector, recognizer, ...
+        reader = self.__dict__.get("reader")
+        if reader is None:
+            raise AttributeError(name)
+        return getattr(reader, name)
+
+
+class TesseractBackend(OCRBackend):
+    """Tesseract via pytesseract (needs the tesseract binary on PATH)"""
+    name = "tesseract"
+    module = "pytesseract"
+    LANGUAGE_CODES = {"en": "eng", "de": "deu", "fr": "fra", "es": "spa", "it": "ita", "pt": "por",
+                      "ru": "rus", "ja": "jpn", "ko": "kor", "ch_sim": "chi_sim", "ch_tra": "chi_tra"}
+
+    @classmethod
+    def is_available(cls):
+        if not is_available(cls.module):
+            return False
+        try:
+            import pytesseract
+            pytesseract.get_tesseract_version()
+            return True
+        except Exception:
+            return False
+
+    def load(self):
+        import pytesseract
+        self.pytesseract = pytesseract
+        self.lang = "+".join(self.LANGUAGE_CODES.get(code, code) for code in self.languages)
+        return self
+
+    def readtext(self, image_np):
+        data = self.pytesseract.image_to_data(image_np, lang=self.lang, output_type=self.pytesseract.Output.DICT)
+        # Group words into lines, like EasyOCR's paragraph-less output
+        lines = {}
+        for i, word in enumerate(data["text"]):
+            confidence = float(data["conf"][i])
+            if not word.strip() or confidence < 0:
+                continue
+            key = (data["block_num"][i], data["par_num"][i], data["line_num"][i])
+            lines.setdefault(key, []).append((data["left"][i], data["top"][i], data["width"][i], data["height"][i], word, confidence))
+        results = []
+        for words in lines.values():
+            left = min(w[0] for w in words)
+            top = min(w[1] for w in words)
+            right = max(w[0] + w[2] for w in words)
+            bottom = max(w[1] + w[3] for w in words)
+            box = [[left, top], [right, top], [right, bottom], [left, bottom]]
+            text = " ".join(w[4] for w in words)
+            results.append((box, text, sum(w[5] for w in words) / len(words) / 100.0))
+        return results
+
+
+class ONNXBackend(OCRBackend):
+    """PaddleOCR models on ONNX Runtime via the rapidocr_onnxruntime package"""
+    name = "onnx"
+    module = "rapidocr_onnxruntime"
+
+    def load(self):
+        from rapidocr_onnxruntime import RapidOCR
+        self.engine = RapidOCR()
+        return self
+
+    def readtext(self, image_np):
+        if image_np.ndim == 2:
+            image_np = numpy.stack([image_np] * 3, axis=-1)
+        result, _ = self.engine(image_np)
+        return [(box, text, float(score)) for box, text, score in (result or [])]
+
+
+BACKENDS = {backend.name: backend for backend in (EasyOCRBackend, TesseractBackend, ONNXBackend)}
+
+
+def available_backends():
+    """Names of the backends that can run on this machine"""
+    return [name for name, backend in BACKENDS.items() if backend.is_available()]
+
+
+def load_calibration(path=None):
+    """Saved calibration result, or None"""
+    path = path or settings.OCR_CALIBRATION_PATH
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"[WARNING] Could not read OCR calibration: {e}")
+        return None
+
+
+def resolve_backend_name(name=None):
+    """Backend to use: an explicit name, or for "auto" the calibrated choice (easyocr without one)"""
+    name = name or settings.OCR_BACKEND
+    if name != "auto":
+        return name
+    calibration = load_calibration()
+    choice = calibration.get("choice") if calibration else None
+    if choice in BACKENDS and BACKENDS[choice].is_available():
+        return choice
+    return "easyocr"
+
+
+def create_backend(name, languages, precision="int8"):
+    """Unloaded backend instance by name"""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown OCR backend '{name}', expected one of {', '.join(BACKENDS)}")
+    return BACKENDS[name](languages, precision)
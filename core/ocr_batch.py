@@ -0,0 +1,61 @@
+import numpy
+
+
+def plan_batches(shapes, max_pad_ratio=2.0, max_batch=8):
+    """Group image indexes so padding each group to its largest member wastes little compute
+
+    shapes are NumPy shapes (height, width[, channels]). A group's padded
+    area (count x largest height x largest width) stays within
+    ``max_pad_ratio`` times its real pixel area. Returns a list of index lists.
+    """
+    order = sorted(range(len(shapes)), key=lambda i: shapes[i][0] * shapes[i][1], reverse=True)
+    groups = []
+    for index in order:
+        height, width = shapes[index][:2]
+        for group in groups:
+            if group["channels"] != shapes[index][2:] or len(group["members"]) >= max_batch:
+                continue
+            padded_height = max(group["height"], height)
+            padded_width = max(group["width"], width)
+            real_area = group["area"] + height * width
+            if padded_height * padded_width * (len(group["members"]) + 1) <= max_pad_ratio * real_area:
+                group["members"].append(index)
+                group["height"], group["width"], group["area"] = padded_height, padded_width, real_area
+                break
+        else:
+            groups.append({"members": [index], "channels": shapes[index][2:],
+                           "height": height, "width": width, "area": height * width})
+    return [group["members"] for group in groups]
+
+
+def _pad(image_np, height, width):
+    """Extend an image to height x width with its bottom-right pixel, so the padding looks like its background"""
+    if image_np.shape[0] == height and image_np.shape[1] == width:
+        return image_np
+    canvas = numpy.empty((height, width) + image_np.shape[2:], dtype=image_np.dtype)
+    canvas[...] = image_np[-1, -1]
+    canvas[:image_np.shape[0], :image_np.shape[1]] = image_np
+    return canvas
+
+
+def readtext_batch(reader, images, max_pad_ratio=2.0, max_batch=8):
+    """Run OCR over several images, one readtext_batched call per group of similar sizes
+
+    Returns one EasyOCR-style result list per image, in input order. Readers
+    without ``readtext_batched`` (other backends) get one call per image.
+    """
+    if not hasattr(reader, "readtext_batched"):
+        return [reader.readtext(image_np) for image_np in images]
+
+    results = [None] * len(images)
+    for group in plan_batches([image_np.shape for image_np in images], max_pad_ratio, max_batch):
+        if len(group) == 1:
+            results[group[0]] = reader.readtext(images[group[0]])
+            continue
+        # The detector runs on one stacked tensor, so every input needs the same size
+        height = max(images[i].shape[0] for i in group)
+        width = max(images[i].shape[1] for i in group)
+        padded = [_pad(images[i], height, width) for i in group]
+        for index, result in zip(group, reader.readtext_batched(padded, n_width=width, n_height=height)):
+            results[index] = result
+    return results
@@ -0,0 +1,119 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+import numpy
+
+
+class OCRResultCache:
+    """Bounded LRU cache of OCR results keyed by a hash of the captured pixels"""
+
+    def __init__(self, max_entries=256, max_bytes=2 * 1024 * 1024, path=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.path = path
+        self.entries = OrderedDict()  # key -> (text, ocr_seconds)
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+        self._lock = threading.Lock()
+        self._dirty = False
+
+        if self.path:
+            self.load()
+
+    @staticmethod
+    def make_key(image, settings_signature=""):
+        """Fast content hash of the image pixels (PIL image or NumPy array) plus the OCR settings"""
+        digest = hashlib.blake2b(digest_size=16)
+        if isinstance(image, numpy.ndarray):
+            digest.update(f"{image.dtype}:{image.shape}:{settings_signature}".encode())
+            digest.update(numpy.ascontiguousarray(image).data)
+        else:
+            digest.update(f"{image.mode}:{image.size}:{settings_signature}".encode())
+            digest.update(image.tobytes())
+        return digest.hexdigest()
+
+    def get(self, key):
+        """Return cached text or None, updating the hit/miss counters"""
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            self.saved_seconds += entry[1]
+            return entry[0]
+
+    def put(self, key, text, ocr_seconds=0.0):
+        """Store an OCR result, evicting least recently used entries over the limits"""
+        size = len(text.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self.entries.pop(key, None)
+            if old is not None:
+                self.total_bytes -= len(old[0].encode("utf-8"))
+            self.entries[key] = (text, ocr_seconds)
+            self.total_bytes += size
+            self._evict()
+            self._dirty = True
+
+    def _evict(self):
+        """Drop oldest entries until within the entry and byte budget"""
+        while self.entries and (len(self.entries) > self.max_entries or self.total_bytes > self.max_bytes):
+            _, (text, _) = self.entries.popitem(last=False)
+            self.total_bytes -= len(text.encode("utf-8"))
+
+    def stats(self):
+        """Hit/miss counters and the OCR time saved by cache hits"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self.entries),
+                "bytes": self.total_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "saved_seconds": self.saved_seconds,
+            }
+
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self.entries.clear()
+            self.total_bytes = 0
+            self._dirty = True
+
+    def load(self):
+        """Load persisted entries from disk"""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            for key, text, seconds in data.get("entries", []):
+                self.put(key, text, seconds)
+            self._dirty = False
+            print(f"[INFO] Loaded {len(self.entries)} cached OCR results")
+        except Exception as e:
+            print(f"[WARNING] Could not load OCR cache: {e}")
+
+    def save(self):
+        """Persist entries to disk (oldest first, so LRU order survives a restart)"""
+        if not self.path or not self._dirty:
+            return
+        try:
+            with self._lock:
+                data = {"entries": [[key, text, seconds] for key, (text, seconds) in self.entries.items()]}
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temp_path = self.path + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(temp_path, self.path)
+            self._dirty = False
+        except Exception as e:
+            print(f"[WARNING] Could not save OCR cache: {e}")
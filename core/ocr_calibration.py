@@ -0,0 +1,101 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import time
+import numpy
+
+from config import settings
+from core.ocr_backends import BACKENDS, available_backends, create_backend
+from core.ocr_corpus import screenshot_corpus, text_accuracy
+
+
+def measure_backend(name, corpus, languages=("en",), precision=None, repeat=2, min_confidence=0.3):
+    """Load one backend and run it over the corpus, returns a result dict"""
+    precision = precision or settings.OCR_PRECISION
+    start = time.perf_counter()
+    backend = create_backend(name, languages, precision).load()
+    load_seconds = time.perf_counter() - start
+
+    scores, latencies = [], []
+    for _, image, expected in corpus:
+        image_np = numpy.asarray(image)
+        backend.readtext(image_np)  # first call per size may pay one-off setup
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = backend.readtext(image_np)
+            samples.append(time.perf_counter() - start)
+        latencies.append(statistics.median(samples))
+        text = "\n".join(text for _, text, confidence in result if confidence > min_confidence)
+        scores.append(text_accuracy(expected, text))
+    return {
+        "backend": name,
+        "signature": backend.signature(),
+        "accuracy": statistics.mean(scores),
+        "corpus_seconds": sum(latencies),
+        "load_seconds": load_seconds,
+    }
+
+
+def pick_backend(results, accuracy_floor):
+    """Fastest backend meeting the accuracy floor, else the most accurate one"""
+    passing = [r for r in results if r["accuracy"] >= accuracy_floor]
+    if passing:
+        return min(passing, key=lambda r: r["corpus_seconds"])["backend"]
+    if results:
+        return max(results, key=lambda r: r["accuracy"])["backend"]
+    return None
+
+
+def calibrate(backends=None, accuracy_floor=None, repeat=2, path=None):
+    """Benchmark the installed backends on this machine and save the pick for OCR_BACKEND = "auto" """
+    accuracy_floor = settings.OCR_ACCURACY_FLOOR if accuracy_floor is None else accuracy_floor
+    path = path or settings.OCR_CALIBRATION_PATH
+    corpus = screenshot_corpus()
+    names = backends or available_backends()
+    print(f"[INFO] Calibrating OCR backends: {', '.join(names) or 'none installed'}")
+
+    results = []
+    for name in names:
+        try:
+            result = measure_backend(name, corpus, repeat=repeat)
+        except Exception as e:
+            print(f"[WARNING] OCR backend {name} failed during calibration: {e}")
+            continue
+        print(f"[INFO] {result['signature']}: accuracy {result['accuracy'] * 100:.1f}%, "
+              f"corpus {result['corpus_seconds']:.2f}s, load {result['load_seconds']:.1f}s")
+        results.append(result)
+
+    choice = pick_backend(results, accuracy_floor)
+    calibration = {
+        "choice": choice,
+        "accuracy_floor": accuracy_floor,
+        "machine": {"processor": platform.processor(), "machine": platform.machine(), "cpus": os.cpu_count()},
+        "calibrated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+    if choice and path:
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(calibration, f, indent=2)
+        except Exception as e:
+            print(f"[WARNING] Could not save OCR calibration: {e}")
+    print(f"[INFO] ✅ Selected OCR backend: {choice or 'none'} (accuracy floor {accuracy_floor * 100:.0f}%)")
+    return calibration
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the installed OCR backends and pick the fastest accurate one")
+    parser.add_argument("--backends", nargs="+", choices=list(BACKENDS), help="default: every installed backend")
+    parser.add_argument("--accuracy-floor", type=float, default=settings.OCR_ACCURACY_FLOOR)
+    parser.add_argument("--repeat", type=int, default=2)
+    args = parser.parse_args(argv)
+    calibration = calibrate(args.backends, args.accuracy_floor, args.repeat)
+    return 0 if calibration["choice"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,217 @@
+import itertools
+import json
+import os
+import select
+import socket
+import subprocess
+import sys
+import threading
+import time
+from multiprocessing import shared_memory
+
+from config import settings
+from core.ocr_ipc import daemon_address, encode_message, frames_size, read_token, write_frames
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class DaemonUnavailable(Exception):
+    """The OCR daemon could not be reached; nothing was sent"""
+
+
+class DaemonAuthError(DaemonUnavailable):
+    """A daemon is listening but refused this client's token"""
+
+
+class DaemonError(Exception):
+    """A request failed in the daemon, or the connection dropped while it ran"""
+
+
+class OCRDaemonClient:
+    """Blocking client for the OCR daemon, safe to share between threads
+
+    Frames are copied into one shared memory segment owned by the client
+    (grown when a request needs more) and only their layout travels over the
+    socket. A daemon that died or was restarted is reconnected to, or started
+    again, on the next request.
+    """
+    MIN_SEGMENT_BYTES = 8 * 1024 * 1024
+
+    def __init__(self, address=None, autostart=None, connect_timeout=None, request_timeout=None):
+        self.address = address or daemon_address()
+        self.autostart = settings.OCR_DAEMON_AUTOSTART if autostart is None else autostart
+        self.connect_timeout = settings.OCR_DAEMON_CONNECT_TIMEOUT if connect_timeout is None else connect_timeout
+        self.request_timeout = settings.OCR_DAEMON_REQUEST_TIMEOUT if request_timeout is None else request_timeout
+        self.sock = None
+        self.reader = None
+        self.segment = None
+        self.last_failure = None
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        family, target = self.address
+        sock = socket.socket(socket.AF_UNIX if family == "unix" else socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            sock.settimeout(self.connect_timeout)
+            sock.connect(target)
+        except OSError:
+            sock.close()
+            raise
+        self.sock = sock
+        self.reader = sock.makefile("rb")
+        try:
+            self._authenticate()
+        except (OSError, DaemonAuthError):
+            self._disconnect()
+            raise
+        sock.settimeout(self.request_timeout)
+
+    def _authenticate(self):
+        """Present the daemon's token, the first message on every connection"""
+        self.sock.sendall(encode_message({"op": "auth", "token": read_token()}))
+        line = self.reader.readline()
+        try:
+            accepted = bool(line) and json.loads(line).get("ok") is True
+        except (ValueError, AttributeError):
+            accepted = False
+        if not accepted:
+            # Not our daemon (e.g. another user's on the TCP port) or a stale token
+            raise DaemonAuthError(f"{self.address[1]}: daemon rejected the token in {settings.OCR_DAEMON_TOKEN_PATH}")
+
+    def _disconnect(self):
+        if self.reader is not None:
+            self.reader.close()
+        if self.sock is not None:
+            self.sock.close()
+        self.sock = None
+        self.reader = None
+
+    def _peer_closed(self):
+        """True if the daemon hung up since the last request (e.g. it was restarted)"""
+        try:
+            readable, _, _ = select.select([self.sock], [], [], 0)
+            return bool(readable) and not self.sock.recv(1, socket.MSG_PEEK)
+        except OSError:
+            return True
+
+    def _ensure_connected(self):
+        if self.sock is not None and not self._peer_closed():
+            return
+        self._disconnect()
+        # Right after a failed start, fail fast instead of stalling every capture
+        if self.last_failure and time.monotonic() - self.last_failure < settings.OCR_DAEMON_RETRY_SECONDS:
+            raise DaemonUnavailable("recently unreachable")
+        try:
+            self._connect()
+            return
+        except DaemonAuthError:
+            # Some daemon owns the address; starting another one could not bind it
+            self.last_failure = time.monotonic()
+            raise
+        except OSError as e:
+            error = e
+        if self.autostart:
+            self.start_daemon()
+            deadline = time.monotonic() + self.connect_timeout
+            while time.monotonic() < deadline:
+                time.sleep(0.1)
+                try:
+                    self._connect()
+                    self.last_failure = None
+                    return
+                except (OSError, DaemonAuthError) as e:
+                    # The new daemon writes its token file just after it starts listening
+                    error = e
+        self.last_failure = time.monotonic()
+        raise DaemonUnavailable(f"{self.address[1]}: {error}")
+
+    def start_daemon(self):
+        """Launch a detached daemon process that outlives this one"""
+        if getattr(sys, "frozen", False):
+            command = [sys.executable, "--ocr-daemon"]
+        else:
+            command = [sys.executable, "-m", "core.ocr_daemon"]
+        os.makedirs(os.path.dirname(settings.OCR_DAEMON_LOG_PATH), exist_ok=True)
+        kwargs = {}
+        if sys.platform == "win32":
+            kwargs["creationflags"] = (subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+                                       | subprocess.CREATE_NO_WINDOW)
+        else:
+            kwargs["start_new_session"] = True
+        with open(settings.OCR_DAEMON_LOG_PATH, "ab") as log:
+            subprocess.Popen(command, cwd=PROJECT_ROOT, stdin=subprocess.DEVNULL, stdout=log,
+                             stderr=subprocess.STDOUT, close_fds=True,
+                             env=dict(os.environ, PYTHONUNBUFFERED="1"), **kwargs)
+        print(f"[INFO] Started OCR daemon ({' '.join(command)})")
+
+    def _stage(self, arrays):
+        """Copy frames into the shared segment, returns the message fields describing them"""
+        size = frames_size(arrays)
+        if self.segment is None or self.segment.size < size:
+            self._release_segment()
+            self.segment = shared_memory.SharedMemory(create=True, size=max(size, self.MIN_SEGMENT_BYTES))
+        return {"shm": self.segment.name, "frames": write_frames(self.segment, arrays)}
+
+    def _release_segment(self):
+        if self.segment is not None:
+            self.segment.close()
+            self.segment.unlink()
+            self.segment = None
+
+    def request(self, message, arrays=()):
+        """Send one request and wait for its reply"""
+        with self._lock:
+            self._ensure_connected()
+            message = dict(message, id=next(self._ids))
+            if arrays:
+                message.update(self._stage(arrays))
+            try:
+                self.sock.sendall(encode_message(message))
+                line = self.reader.readline()
+            except OSError as e:
+                self._abandon()
+                raise DaemonError(f"connection lost: {e}")
+            if not line:
+                # The daemon died while handling this request; the next one restarts it
+                self._abandon()
+                raise DaemonError("daemon closed the connection")
+            reply = json.loads(line)
+            if not reply.get("ok"):
+                self._release_segment()
+                raise DaemonError(reply.get("error", "request failed"))
+        return reply
+
+    def _abandon(self):
+        """Drop the connection and the segment after a failed request
+
+        After a timeout the daemon may still be reading frames from the
+        segment, so the next request must not overwrite them.
+        """
+        self._disconnect()
+        self._release_segment()
+
+    def ocr(self, arrays, mode="text"):
+        """One result per array: text, or [(text, confidence), ...] for mode "lines" """
+        reply = self.request({"op": "ocr", "mode": mode}, arrays)
+        if mode == "lines":
+            return [[(text, confidence) for text, confidence in lines] for lines in reply["results"]]
+        return reply["results"]
+
+    def warm_up(self):
+        """Have the daemon load its reader, returns its load time in seconds"""
+        return self.request({"op": "warm_up"})["warmup_seconds"]
+
+    def ping(self):
+        """Daemon status: pid, readiness, queue length, clients, requests served"""
+        return self.request({"op": "ping"})
+
+    def shutdown(self):
+        """Ask the daemon to exit"""
+        return self.request({"op": "shutdown"})
+
+    def close(self):
+        """Drop the connection and the segment; the daemon keeps running"""
+        with self._lock:
+            self._disconnect()
+            self._release_segment()
@@ -0,0 +1,84 @@
+import difflib
+import random
+from PIL import Image, ImageDraw, ImageFont
+
+# Fixed, seeded screenshot-like crops with their ground truth, so OCR
+# engines and precision modes can be compared on any machine without
+# shipping image files.
+CAPTIONS = [
+    "OK", "Cancel", "Settings", "Save changes", "def main():",
+    "FileNotFoundError: config.json", "Connection timed out", "Search results",
+    "Downloads 42%", "user@example.com", "Version 2.4.1", "Apply filter",
+]
+
+WORDS = (
+    "error warning file open save cancel retry network timeout connection "
+    "python module import class return value search capture screen region "
+    "settings options apply close window button label status progress"
+).split()
+
+
+def load_font(size=18):
+    """Best available TrueType font, falling back to PIL's built-in bitmap font"""
+    for name in ("DejaVuSans.ttf", "arial.ttf", "Arial.ttf", "segoeui.ttf"):
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            continue
+    return ImageFont.load_default()
+
+
+def render_text_image(width, height, font_size=18, line_spacing=1.6, seed=0, background="white"):
+    """Render a screenshot-like image filled with lines of random words"""
+    rng = random.Random(seed)
+    image = Image.new("RGB", (width, height), background)
+    draw = ImageDraw.Draw(image)
+    font = load_font(font_size)
+    lines = []
+    y = font_size // 2
+    while y + font_size < height:
+        line = " ".join(rng.choice(WORDS) for _ in range(max(1, width // (font_size * 5))))
+        draw.text((font_size // 2, y), line, fill="black", font=font)
+        lines.append(line)
+        y += int(font_size * line_spacing)
+    return image, lines
+
+
+def render_word_image(text, font_size=16, padding=8, foreground="black", background="white"):
+    """Render a single UI label / button caption"""
+    font = load_font(font_size)
+    probe = ImageDraw.Draw(Image.new("RGB", (1, 1)))
+    left, top, right, bottom = probe.textbbox((0, 0), text, font=font)
+    image = Image.new("RGB", (right - left + 2 * padding, bottom - top + 2 * padding), background)
+    ImageDraw.Draw(image).text((padding - left, padding - top), text, fill=foreground, font=font)
+    return image
+
+
+def screenshot_corpus(seed=0):
+    """List of (name, RGB image, expected text): UI labels, dark-theme labels and paragraphs"""
+    rng = random.Random(seed)
+    corpus = []
+    for index, caption in enumerate(CAPTIONS):
+        size = (12, 14, 16, 20)[index % 4]
+        if index % 3 == 2:
+            image = render_word_image(caption, size, foreground="#e0e0e0", background="#202124")
+            corpus.append((f"dark label '{caption}'", image, caption))
+        else:
+            corpus.append((f"label '{caption}'", render_word_image(caption, size), caption))
+    for width, lines, size in [(420, 2, 14), (640, 3, 16), (900, 4, 12)]:
+        # Tall enough for exactly `lines` lines at the default spacing
+        image, texts = render_text_image(width, lines * int(size * 1.6) + size, size, seed=rng.randrange(1 << 30))
+        corpus.append((f"paragraph {width}px x{lines}@{size}px", image, "\n".join(texts)))
+    return corpus
+
+
+def _normalize(text):
+    return " ".join(text.lower().split())
+
+
+def text_accuracy(expected, actual):
+    """Character-level similarity of two texts in [0, 1], ignoring case and whitespace layout"""
+    expected, actual = _normalize(expected), _normalize(actual)
+    if not expected:
+        return 1.0 if not actual else 0.0
+    return difflib.SequenceMatcher(None, expected, actual, autojunk=False).ratio()
@@ -0,0 +1,240 @@
+import argparse
+import asyncio
+import json
+import os
+import secrets
+import signal
+import socket
+import time
+
+from config import settings
+from core.ocr_ipc import attach_segment, create_token, daemon_address, encode_message, read_frames, token_matches
+
+
+class OCRDaemon:
+    """Serves OCR to local clients from one warm reader
+
+    Each client connection authenticates with the token the daemon wrote
+    on start, then sends JSON-line requests; frames arrive in the
+    client's shared memory segment. OCR requests from all clients wait in
+    one bounded queue and run one at a time on a worker thread, so the event
+    loop keeps answering pings and accepting clients during inference.
+    """
+
+    def __init__(self, address=None, max_queue=None):
+        self.address = address or daemon_address()
+        self.max_queue = settings.OCR_DAEMON_MAX_QUEUE if max_queue is None else max_queue
+        self.processor = None
+        self.queue = None
+        self.stop_event = None
+        self.clients = 0
+        self.served = 0
+        self.token = None
+
+    async def serve(self):
+        """Run until a shutdown request or SIGTERM/SIGINT"""
+        from core.ocr_processor import OCRProcessor
+        from utils.tracing import tracer
+        # The client traces these requests; one process writing the trace log keeps rotation safe
+        tracer.log_path = None
+        # In-process reader; the result cache stays with the clients
+        self.processor = OCRProcessor(use_daemon=False)
+        self.processor.cache = None
+        self.queue = asyncio.Queue(maxsize=self.max_queue)
+        self.stop_event = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            try:
+                loop.add_signal_handler(signum, self.stop_event.set)
+            except (NotImplementedError, RuntimeError):
+                pass  # Windows: Ctrl+C still raises KeyboardInterrupt
+
+        # Known before the first client is accepted, but written to the token file only
+        # once listening, so a second daemon that fails to start cannot replace it
+        self.token = secrets.token_hex(32)
+        server = await self._start_server()
+        create_token(token=self.token)
+        print(f"[INFO] OCR daemon {os.getpid()} listening on {self.address[1]}")
+        worker = asyncio.create_task(self._run_queue())
+        # Load the model in the background so clients can connect (and queue) meanwhile
+        asyncio.create_task(self._enqueue({"op": "warm_up"}))
+        try:
+            async with server:
+                await self.stop_event.wait()
+        finally:
+            worker.cancel()
+            paths = [settings.OCR_DAEMON_TOKEN_PATH]
+            if self.address[0] == "unix":
+                paths.append(self.address[1])
+            for path in paths:
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+            print(f"[INFO] OCR daemon stopped after {self.served} requests")
+
+    async def _start_server(self):
+        family, target = self.address
+        if family == "tcp":
+            return await asyncio.start_server(self._handle_client, *target)
+        if os.path.exists(target):
+            if _is_listening(target):
+                raise RuntimeError(f"an OCR daemon is already listening on {target}")
+            os.unlink(target)  # left over from a daemon that crashed
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        server = await asyncio.start_unix_server(self._handle_client, path=target)
+        os.chmod(target, 0o600)
+        return server
+
+    async def _handle_client(self, reader, writer):
+        self.clients += 1
+        segments = {}  # shared memory this client wrote frames to, attached once
+        authenticated = False
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                    if not authenticated:
+                        authenticated = message.get("op") == "auth" and token_matches(self.token, message.get("token"))
+                        reply = {"ok": authenticated} if authenticated else {"ok": False, "error": "unauthorized"}
+                    else:
+                        reply = await self._dispatch(message, segments)
+                except Exception as e:
+                    message, reply = {}, {"ok": False, "error": f"{type(e).__name__}: {e}"}
+                reply["id"] = message.get("id") if isinstance(message, dict) else None
+                writer.write(encode_message(reply))
+                await writer.drain()
+                if not authenticated:
+                    # Nothing else is read from an unauthenticated peer
+                    break
+        except ConnectionError:
+            pass
+        except ValueError as e:
+            # readline() past the stream limit: no way to resync, drop this client only
+            print(f"[WARNING] Dropping OCR client: {e}")
+        finally:
+            self.clients -= 1
+            for segment in segments.values():
+                _close_segment(segment)
+            writer.close()
+
+    async def _dispatch(self, message, segments):
+        op = message.get("op")
+        if op == "ping":
+            return {
+                "ok": True,
+                "pid": os.getpid(),
+                "ready": self.processor.is_ready(),
+                "backend": f"{self.processor.backend_name}:{self.processor.precision}",
+                "queued": self.queue.qsize(),
+                "clients": self.clients,
+                "served": self.served,
+            }
+        if op in ("ocr", "warm_up"):
+            if self.queue.full():
+                return {"ok": False, "error": "busy: OCR queue is full"}
+            return await self._enqueue(message, segments)
+        if op == "shutdown":
+            self.stop_event.set()
+            return {"ok": True}
+        return {"ok": False, "error": f"unknown op '{op}'"}
+
+    async def _enqueue(self, message, segments=None):
+        """Queue a request for the OCR worker and wait for its reply"""
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((message, segments, future, time.perf_counter()))
+        return await future
+
+    async def _run_queue(self):
+        """Run queued requests one at a time on the warm reader"""
+        loop = asyncio.get_running_loop()
+        while True:
+            message, segments, future, queued_at = await self.queue.get()
+            started = time.perf_counter()
+            try:
+                reply = await loop.run_in_executor(None, self._run_request, message, segments)
+                reply["queue_ms"] = round((started - queued_at) * 1000, 2)
+                reply["run_ms"] = round((time.perf_counter() - started) * 1000, 2)
+            except Exception as e:
+                reply = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+            self.served += 1
+            if not future.done():
+                future.set_result(reply)
+
+    def _run_request(self, message, segments):
+        """OCR on the worker thread"""
+        if message["op"] == "warm_up":
+            return {"ok": True, "warmup_seconds": self.processor.warm_up()}
+        name = message["shm"]
+        if name not in segments:
+            # The client grew its segment; the old one is gone
+            for segment in segments.values():
+                _close_segment(segment)
+            segments.clear()
+            segments[name] = attach_segment(name)
+        frames = read_frames(segments[name], message["frames"])
+        try:
+            if message.get("mode") == "lines":
+                results = [self.processor.extract_lines(frame) for frame in frames]
+            elif len(frames) == 1:
+                results = [self.processor.extract_text(frames[0])]
+            else:
+                results = self.processor.extract_text_batch(frames)
+        finally:
+            # Views must be gone before the segment can be closed
+            del frames
+        return {"ok": True, "results": results}
+
+
+def _close_segment(segment):
+    try:
+        segment.close()
+    except BufferError:
+        pass  # a view is still alive; the mapping goes away with it
+
+
+def _is_listening(path):
+    """True if something accepts connections on the Unix socket path"""
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        probe.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local OCR service that keeps the reader warm for the tray app and other tools")
+    parser.add_argument("--status", action="store_true", help="print the running daemon's status and exit")
+    parser.add_argument("--stop", action="store_true", help="stop the running daemon")
+    args = parser.parse_args(argv)
+
+    if args.status or args.stop:
+        from core.ocr_client import DaemonUnavailable, OCRDaemonClient
+        client = OCRDaemonClient(autostart=False)
+        try:
+            print(json.dumps(client.shutdown() if args.stop else client.ping()))
+            return 0
+        except DaemonUnavailable as e:
+            print(f"[ERROR] OCR daemon not running: {e}")
+            return 1
+        finally:
+            client.close()
+
+    try:
+        asyncio.run(OCRDaemon().serve())
+    except (RuntimeError, OSError) as e:
+        print(f"[ERROR] OCR daemon could not start: {e}")
+        return 1
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
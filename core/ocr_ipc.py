@@ -0,0 +1,102 @@
+import hmac
+import json
+import os
+import secrets
+import socket
+import sys
+from multiprocessing import shared_memory
+import numpy
+
+from config import settings
+
+# Frames start on cache-line boundaries inside a segment
+FRAME_ALIGNMENT = 64
+
+
+def daemon_address():
+    """("unix", socket path) or, where asyncio has no Unix sockets, ("tcp", (host, port))"""
+    if sys.platform != "win32" and hasattr(socket, "AF_UNIX"):
+        return "unix", settings.OCR_DAEMON_SOCKET
+    return "tcp", ("127.0.0.1", settings.OCR_DAEMON_PORT)
+
+
+def create_token(path=None, token=None):
+    """Write token (a fresh random secret if None) to a file only this user can read, returns it
+
+    Clients must present it first on every connection: the TCP fallback is
+    reachable by any local process, and the daemon attaches whatever shared
+    memory a request names. On Windows the file inherits the per-user ACL
+    of the app data directory.
+    """
+    path = path or settings.OCR_DAEMON_TOKEN_PATH
+    token = token or secrets.token_hex(32)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w") as f:
+        f.write(token)
+    os.replace(temp_path, path)
+    return token
+
+
+def read_token(path=None):
+    """The running daemon's secret, or None if it has not written one"""
+    try:
+        with open(path or settings.OCR_DAEMON_TOKEN_PATH, encoding="utf-8") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def token_matches(expected, given):
+    """Constant-time comparison of a presented token"""
+    return isinstance(expected, str) and isinstance(given, str) and hmac.compare_digest(expected.encode(), given.encode())
+
+
+def encode_message(message):
+    """One protocol message: a JSON object on a single line"""
+    return (json.dumps(message, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def _aligned(size):
+    return (size + FRAME_ALIGNMENT - 1) // FRAME_ALIGNMENT * FRAME_ALIGNMENT
+
+
+def frames_size(arrays):
+    """Segment bytes needed to hold the arrays back to back"""
+    return sum(_aligned(array.nbytes) for array in arrays)
+
+
+def write_frames(segment, arrays):
+    """Copy arrays into a shared memory segment, returns their JSON descriptors"""
+    descriptors = []
+    offset = 0
+    for array in arrays:
+        view = numpy.ndarray(array.shape, dtype=array.dtype, buffer=segment.buf, offset=offset)
+        # Packs strided views (e.g. RGB over BGRA) on the way in
+        view[...] = array
+        descriptors.append({"offset": offset, "shape": list(array.shape), "dtype": array.dtype.str})
+        offset += _aligned(array.nbytes)
+    return descriptors
+
+
+def read_frames(segment, descriptors):
+    """Zero-copy array views over the frames a client wrote"""
+    return [
+        numpy.ndarray(tuple(d["shape"]), dtype=numpy.dtype(d["dtype"]), buffer=segment.buf, offset=d["offset"])
+        for d in descriptors
+    ]
+
+
+def attach_segment(name):
+    """Open a client's segment without taking ownership of it"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        segment = shared_memory.SharedMemory(name=name)
+        if os.name == "posix":
+            # Attaching registers the segment with this process's resource
+            # tracker, which would unlink it under the client at daemon exit
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(segment._name, "shared_memory")
+        return segment
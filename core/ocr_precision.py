@@ -0,0 +1,60 @@
+# Reduced-precision CPU inference for the EasyOCR networks.
+# EasyOCR's ``quantize`` flag applies dynamic int8 quantization on CPU, which
+# covers the Linear/LSTM layers (most of the recognizer). The CRAFT detector
+# is convolutional and stays fp32 under dynamic quantization; "int8-bf16"
+# additionally runs it under CPU bfloat16 autocast, which pays off on CPUs
+# with native bf16 support (AVX512-BF16 / AMX).
+
+PRECISIONS = ("fp32", "int8", "int8-bf16")
+
+
+def reader_kwargs(precision):
+    """Extra easyocr.Reader arguments for a precision mode"""
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unknown OCR precision '{precision}', expected one of {', '.join(PRECISIONS)}")
+    return {"quantize": precision != "fp32"}
+
+
+def _bf16_module(module):
+    """Wrap a torch module so its forward runs under CPU bf16 autocast and returns fp32"""
+    import torch
+
+    class BFloat16Autocast(torch.nn.Module):
+        def __init__(self, inner):
+            super().__init__()
+            self.inner = inner
+
+        def forward(self, *args, **kwargs):
+            with torch.autocast("cpu", dtype=torch.bfloat16):
+                outputs = self.inner(*args, **kwargs)
+            if isinstance(outputs, tuple):
+                return tuple(o.float() if torch.is_tensor(o) else o for o in outputs)
+            return outputs.float()
+
+    return BFloat16Autocast(module)
+
+
+def apply_precision(reader, precision):
+    """Post-load adjustments to a reader created with reader_kwargs(precision)"""
+    if precision == "int8-bf16" and getattr(reader, "detector", None) is not None:
+        try:
+            reader.detector = _bf16_module(reader.detector)
+        except Exception as e:
+            print(f"[WARNING] bf16 detector not available, keeping fp32: {e}")
+    return reader
+
+
+def model_bytes(reader):
+    """Bytes of parameters and buffers held by the reader's networks (quantized weights included)"""
+    total = 0
+    for name in ("detector", "recognizer"):
+        module = getattr(reader, name, None)
+        if module is None or not hasattr(module, "state_dict"):
+            continue
+        for value in module.state_dict().values():
+            if hasattr(value, "element_size"):
+                total += value.numel() * value.element_size()
+            elif isinstance(value, tuple):
+                # Packed dynamic-quantized Linear weights are (weight, bias) tuples
+                total += sum(v.numel() * v.element_size() for v in value if hasattr(v, "element_size"))
+    return total
@@ -1,54 +1,319 @@
-import easyocr
+import threading
+import time
 import numpy
 from PIL import Image
 
+from config import settings
+from core.ocr_cache import OCRResultCache
+from core.ocr_backends import create_backend, resolve_backend_name
+from core.ocr_batch import readtext_batch
+from core.ocr_client import DaemonUnavailable
+from core.ocr_tiling import readtext_tiled
+from utils.tracing import tracer
+
 class OCRProcessor:
     """Handles OCR text extraction from images with memory optimization"""
     
-    def __init__(self):
+    def __init__(self, use_daemon=None):
         self.reader = None
+        self.warmup_seconds = None
+        self.last_ocr_seconds = None
+        self._reader_lock = threading.Lock()
+        self._in_use = 0  # OCR calls currently running on the reader
+        self.last_used = None
+        self.languages = ['en']
+        self.min_confidence = 0.3
+        self.precision = settings.OCR_PRECISION
+        # easyocr, tesseract or onnx; "auto" uses the result of --calibrate-ocr
+        self.backend_name = resolve_backend_name(settings.OCR_BACKEND)
+        self.tiling_enabled = settings.OCR_TILING_ENABLED
+        self.tiling_min_pixels = settings.OCR_TILING_MIN_PIXELS
+        self.tile_size = settings.OCR_TILE_SIZE
+        self.tile_overlap = settings.OCR_TILE_OVERLAP
+        self.tile_mode = settings.OCR_TILE_MODE
+        self.tile_workers = settings.OCR_TILE_WORKERS
+        self.batch_max_size = settings.OCR_BATCH_MAX_SIZE
+        self.batch_max_pad_ratio = settings.OCR_BATCH_MAX_PAD_RATIO
+        # Optional out-of-process OCR: frames go to the OCR daemon's warm reader
+        self.client = None
+        if settings.OCR_DAEMON_ENABLED if use_daemon is None else use_daemon:
+            from core.ocr_client import OCRDaemonClient
+            self.client = OCRDaemonClient()
+        self.cache = None
+        if settings.OCR_CACHE_ENABLED:
+            self.cache = OCRResultCache(
+                max_entries=settings.OCR_CACHE_MAX_ENTRIES,
+                max_bytes=settings.OCR_CACHE_MAX_BYTES,
+                path=settings.OCR_CACHE_PATH if settings.OCR_CACHE_PERSIST else None,
+            )
         
     def _initialize_reader(self):
-        """Initialize EasyOCR reader only when needed"""
-        if self.reader is None:
-            print("[INFO] Initializing EasyOCR Reader...")
-            # Use CPU only to save memory and avoid GPU issues
-            self.reader = easyocr.Reader(['en'], gpu=False)
-            print("[INFO] EasyOCR Reader initialized.")
+        """Initialize the OCR backend only when needed"""
+        if self.reader is not None:
+            return
+        # A background warm-up may already be building the reader - wait for it
+        # instead of loading a second copy of the model
+        with self._reader_lock:
+            if self.reader is None:
+                print(f"[INFO] Initializing {self.backend_name} OCR backend...")
+                start = time.perf_counter()
+                # CPU only (easyocr: gpu=False) to save memory and avoid GPU issues
+                with tracer.span("ocr.reader_init", backend=self.backend_name, precision=self.precision):
+                    self.reader = create_backend(self.backend_name, self.languages, self.precision).load()
+                self.warmup_seconds = time.perf_counter() - start
+                self.last_used = time.monotonic()
+                print(f"[INFO] {self.reader.signature()} OCR backend initialized in {self.warmup_seconds:.2f}s.")
     
-    def extract_text(self, pil_image: Image.Image):
-        """Extract text from PIL Image using OCR"""
+    def warm_up(self):
+        """Load the reader ahead of the first capture, returns load time in seconds"""
+        if self.client is not None:
+            try:
+                self.warmup_seconds = self.client.warm_up()
+                return self.warmup_seconds
+            except DaemonUnavailable as e:
+                if not settings.OCR_DAEMON_FALLBACK_LOCAL:
+                    raise
+                print(f"[WARNING] OCR daemon unavailable ({e}), loading the reader in-process")
         self._initialize_reader()
+        return self.warmup_seconds or 0.0
+    
+    def is_ready(self):
+        """True once the reader is loaded and OCR runs at steady-state speed"""
+        return self.reader is not None
+    
+    def idle_seconds(self):
+        """Seconds since the reader was loaded or last used, None while unloaded or busy"""
+        if self.reader is None or self._in_use or self.last_used is None:
+            return None
+        return time.monotonic() - self.last_used
+    
+    def unload(self):
+        """Release the reader (it reloads on the next OCR); False if it is in use or not loaded"""
+        with self._reader_lock:
+            if self.reader is None or self._in_use:
+                return False
+            del self.reader
+            self.reader = None
+            self.warmup_seconds = None
+        return True
+    
+    def _settings_signature(self):
+        """Everything besides the pixels that changes the OCR output"""
+        signature = f"{','.join(self.languages)}|{self.min_confidence}|{self.backend_name}:{self.precision}"
+        if self.tiling_enabled:
+            signature += f"|tiles:{self.tiling_min_pixels}:{self.tile_size}:{self.tile_overlap}"
+        return signature
+    
+    def _should_tile(self, image_np):
+        """Only selections well beyond a single detector pass are worth tiling"""
+        height, width = image_np.shape[:2]
+        return (self.tiling_enabled and width * height > self.tiling_min_pixels
+                and max(width, height) > self.tile_size)
+    
+    def extract_text(self, pil_image: Image.Image):
+        """Extract text from PIL Image (or preprocessed NumPy array) using OCR"""
+        if isinstance(pil_image, numpy.ndarray):
+            # Strided views (e.g. RGB over a BGRA capture) are packed once here,
+            # contiguous arrays pass through without a copy
+            pil_image = numpy.ascontiguousarray(pil_image)
+        
+        cache_key = None
+        if self.cache is not None:
+            cache_key = OCRResultCache.make_key(pil_image, self._settings_signature())
+            cached_text = self.cache.get(cache_key)
+            if cached_text is not None:
+                print("[INFO] OCR cache hit, skipping inference")
+                return cached_text
         
+        if self.client is not None:
+            texts, seconds = self._extract_remote([pil_image], "text", "")
+            if texts is not None:
+                # A failed request yields "" but nothing cached, so the next capture retries
+                if cache_key is not None and seconds is not None:
+                    self.cache.put(cache_key, texts[0], seconds)
+                return texts[0]
+        
+        reader = self._acquire_reader()
         try:
+            start = time.perf_counter()
+            
             # Convert to numpy array
-            image_np = numpy.array(pil_image)
+            if isinstance(pil_image, numpy.ndarray):
+                image_np = pil_image
+            else:
+                image_np = numpy.array(pil_image)
             
             # Perform OCR with confidence threshold
-            result = self.reader.readtext(image_np)
-            
-            # Filter results by confidence
-            recognized_texts = [text for bbox, text, conf in result if conf > 0.3]
-            full_text = "\n".join(recognized_texts)
-            
-            print(f"[INFO] OCR extracted {len(recognized_texts)} text elements")
+            result = self._recognize(reader, image_np)
+            full_text = self._filter_text(result)
             
             # Clear large variables
             del image_np
             del result
             
+            self.last_ocr_seconds = time.perf_counter() - start
+            if cache_key is not None:
+                self.cache.put(cache_key, full_text, self.last_ocr_seconds)
+            
             return full_text
             
         except Exception as e:
             print(f"[ERROR] OCR processing failed: {e}")
             return ""
+        finally:
+            self._release_reader()
+    
+    def extract_text_batch(self, images):
+        """Extract text from several images (PIL or NumPy) in batched model calls, returns one text per image"""
+        arrays = [numpy.ascontiguousarray(image) if isinstance(image, numpy.ndarray) else numpy.array(image)
+                  for image in images]
+        texts = [None] * len(arrays)
+        cache_keys = [None] * len(arrays)
+        if self.cache is not None:
+            signature = self._settings_signature()
+            for index, image_np in enumerate(arrays):
+                cache_keys[index] = OCRResultCache.make_key(image_np, signature)
+                texts[index] = self.cache.get(cache_keys[index])
+        pending = [index for index, text in enumerate(texts) if text is None]
+        if len(pending) < len(arrays):
+            print(f"[INFO] OCR cache hit for {len(arrays) - len(pending)} of {len(arrays)} regions")
+        if not pending:
+            return texts
+        
+        if self.client is not None:
+            remote, seconds = self._extract_remote([arrays[index] for index in pending], "text", "")
+            if remote is not None:
+                for index, text in zip(pending, remote):
+                    texts[index] = text
+                    if cache_keys[index] is not None and seconds is not None:
+                        self.cache.put(cache_keys[index], text, seconds / len(pending))
+                return texts
+        
+        reader = self._acquire_reader()
+        try:
+            start = time.perf_counter()
+            # Selections big enough to tile go through the tiled path on their own
+            tiled = [index for index in pending if self._should_tile(arrays[index])]
+            batched = [index for index in pending if index not in tiled]
+            results = dict(zip(batched, readtext_batch(
+                reader, [arrays[index] for index in batched],
+                max_pad_ratio=self.batch_max_pad_ratio,
+                max_batch=self.batch_max_size,
+            )))
+            for index in tiled:
+                results[index] = self._readtext_tiled(reader, arrays[index])
+            
+            seconds = time.perf_counter() - start
+            self.last_ocr_seconds = seconds
+            tracer.record("ocr.inference", seconds, backend=self.backend_name, regions=len(pending))
+            for index in pending:
+                texts[index] = self._filter_text(results[index])
+                if cache_keys[index] is not None:
+                    self.cache.put(cache_keys[index], texts[index], seconds / len(pending))
+            return texts
+        
+        except Exception as e:
+            print(f"[ERROR] Batched OCR failed: {e}")
+            return [text or "" for text in texts]
+        finally:
+            self._release_reader()
+    
+    def extract_lines(self, image):
+        """Uncached OCR returning [(text, confidence), ...] above the confidence threshold"""
+        image_np = numpy.ascontiguousarray(image) if isinstance(image, numpy.ndarray) else numpy.array(image)
+        if self.client is not None:
+            lines, _ = self._extract_remote([image_np], "lines", [])
+            if lines is not None:
+                return lines[0]
+        reader = self._acquire_reader()
+        try:
+            start = time.perf_counter()
+            lines = [(text, float(conf)) for bbox, text, conf in self._recognize(reader, image_np)
+                     if conf > self.min_confidence]
+            self.last_ocr_seconds = time.perf_counter() - start
+            return lines
+        finally:
+            self._release_reader()
+    
+    def _recognize(self, reader, image_np):
+        """Raw (box, text, confidence) results, tiled for large selections"""
+        with tracer.span("ocr.inference", backend=self.backend_name, pixels=image_np.shape[0] * image_np.shape[1]) as span:
+            if self._should_tile(image_np):
+                span.set(tiled=True)
+                return self._readtext_tiled(reader, image_np)
+            return reader.readtext(image_np)
+    
+    def _extract_remote(self, images, mode, failed):
+        """(results, seconds) from the OCR daemon
+
+        On errors the results are ``failed`` per image and seconds is None, so
+        callers must not cache them; (None, None) means run in-process instead.
+        """
+        arrays = [image if isinstance(image, numpy.ndarray) else numpy.asarray(image) for image in images]
+        start = time.perf_counter()
+        try:
+            results = self.client.ocr(arrays, mode)
+            seconds = time.perf_counter() - start
+            self.last_ocr_seconds = seconds
+            tracer.record("ocr.inference", seconds, backend="daemon", regions=len(arrays))
+            return results, seconds
+        except DaemonUnavailable as e:
+            if settings.OCR_DAEMON_FALLBACK_LOCAL:
+                print(f"[WARNING] OCR daemon unavailable ({e}), running OCR in-process")
+                return None, None
+            print(f"[ERROR] OCR daemon unavailable: {e}")
+        except Exception as e:
+            # Not retried in-process: a frame that crashed the daemon would crash the app
+            print(f"[ERROR] OCR daemon request failed: {e}")
+        return [failed] * len(arrays), None
+    
+    def _acquire_reader(self):
+        """Loaded reader, marked in use so it cannot be unloaded until _release_reader"""
+        while True:
+            self._initialize_reader()
+            with self._reader_lock:
+                # The reader may have been unloaded between the two calls
+                if self.reader is not None:
+                    self._in_use += 1
+                    return self.reader
+    
+    def _release_reader(self):
+        with self._reader_lock:
+            self._in_use -= 1
+            self.last_used = time.monotonic()
+    
+    def _readtext_tiled(self, reader, image_np):
+        print(f"[INFO] Large selection {image_np.shape[1]}x{image_np.shape[0]}, using tiled OCR")
+        return readtext_tiled(
+            reader, image_np,
+            tile_size=self.tile_size,
+            overlap=self.tile_overlap,
+            workers=self.tile_workers,
+            mode=self.tile_mode,
+        )
+    
+    def _filter_text(self, result):
+        """Join the recognized lines above the confidence threshold"""
+        recognized_texts = [text for bbox, text, conf in result if conf > self.min_confidence]
+        print(f"[INFO] OCR extracted {len(recognized_texts)} text elements")
+        return "\n".join(recognized_texts)
     
     def cleanup(self):
         """Cleanup OCR reader to free memory"""
+        if self.client is not None:
+            # The daemon keeps running for the next start and for other tools
+            self.client.close()
+        if self.cache is not None:
+            stats = self.cache.stats()
+            print(f"[INFO] OCR cache: {stats['hits']} hits, {stats['misses']} misses, "
+                  f"~{stats['saved_seconds']:.1f}s of OCR saved")
+            self.cache.save()
         if self.reader:
             try:
-                del self.reader
-                self.reader = None
+                with self._reader_lock:
+                    del self.reader
+                    self.reader = None
+                    self.warmup_seconds = None
                 print("[INFO] OCR reader cleaned up")
             except:
                 pass
\ No newline at end of file
@@ -0,0 +1,140 @@
+from concurrent.futures import ThreadPoolExecutor
+import numpy
+
+
+def plan_tiles(width, height, tile_size, overlap):
+    """Return (left, top, right, bottom) tiles covering the image with the given overlap"""
+    if tile_size <= overlap:
+        raise ValueError("tile_size must be larger than overlap")
+    step = tile_size - overlap
+
+    def starts(length):
+        if length <= tile_size:
+            return [0]
+        positions = list(range(0, length - tile_size, step))
+        # Last tile is aligned to the edge instead of running past it
+        positions.append(length - tile_size)
+        return positions
+
+    return [
+        (left, top, min(left + tile_size, width), min(top + tile_size, height))
+        for top in starts(height)
+        for left in starts(width)
+    ]
+
+
+def _core_region(tile, width, height, overlap):
+    """Part of a tile that owns the boxes centred in it (half the overlap on interior edges)"""
+    left, top, right, bottom = tile
+    half = overlap / 2.0
+    return (
+        left + half if left > 0 else 0,
+        top + half if top > 0 else 0,
+        right - half if right < width else width,
+        bottom - half if bottom < height else height,
+    )
+
+
+def _bounds(bbox):
+    """Axis-aligned bounds of an EasyOCR quadrilateral"""
+    xs = [p[0] for p in bbox]
+    ys = [p[1] for p in bbox]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def _overlap_ratio(a, b):
+    """Intersection area divided by the smaller box area"""
+    ix = min(a[2], b[2]) - max(a[0], b[0])
+    iy = min(a[3], b[3]) - max(a[1], b[1])
+    if ix <= 0 or iy <= 0:
+        return 0.0
+    smaller = min((a[2] - a[0]) * (a[3] - a[1]), (b[2] - b[0]) * (b[3] - b[1]))
+    return (ix * iy) / smaller if smaller > 0 else 0.0
+
+
+def merge_tile_results(tile_results, width, height, overlap, duplicate_ratio=0.7):
+    """Shift per-tile boxes to page coordinates and drop duplicates along the seams
+
+    tile_results is a list of (tile, [(bbox, text, conf), ...]).
+    """
+    merged = []
+    for tile, results in tile_results:
+        left, top = tile[0], tile[1]
+        core = _core_region(tile, width, height, overlap)
+        for bbox, text, conf in results:
+            page_bbox = [[float(x) + left, float(y) + top] for x, y in bbox]
+            x0, y0, x1, y1 = _bounds(page_bbox)
+            cx, cy = (x0 + x1) / 2.0, (y0 + y1) / 2.0
+            # Each box belongs to the tile whose core contains its centre
+            if not (core[0] <= cx <= core[2] and core[1] <= cy <= core[3]):
+                continue
+            merged.append((page_bbox, text, conf))
+
+    # Text cut by a seam can still be seen whole by one tile and in part by
+    # its neighbour; keep the larger, more confident detection.
+    merged.sort(key=lambda r: (_area(r[0]), r[2]), reverse=True)
+    kept = []
+    for candidate in merged:
+        bounds = _bounds(candidate[0])
+        if any(_overlap_ratio(bounds, _bounds(k[0])) >= duplicate_ratio for k in kept):
+            continue
+        kept.append(candidate)
+    return sort_reading_order(kept)
+
+
+def _area(bbox):
+    """Area of the axis-aligned bounds of a box"""
+    x0, y0, x1, y1 = _bounds(bbox)
+    return (x1 - x0) * (y1 - y0)
+
+
+def sort_reading_order(results):
+    """Order boxes top-to-bottom, then left-to-right within a line"""
+    if not results:
+        return []
+    boxes = [(_bounds(r[0]), r) for r in results]
+    heights = sorted(b[3] - b[1] for b, _ in boxes)
+    line_tolerance = max(heights[len(heights) // 2] * 0.5, 1.0)
+
+    boxes.sort(key=lambda item: (item[0][1] + item[0][3]) / 2.0)
+    lines = []
+    for bounds, result in boxes:
+        cy = (bounds[1] + bounds[3]) / 2.0
+        if lines and abs(cy - lines[-1][0]) <= line_tolerance:
+            lines[-1][1].append((bounds, result))
+        else:
+            lines.append([cy, [(bounds, result)]])
+
+    ordered = []
+    for _, members in lines:
+        members.sort(key=lambda item: item[0][0])
+        ordered.extend(result for _, result in members)
+    return ordered
+
+
+def readtext_tiled(reader, image_np, tile_size=1024, overlap=96, workers=1, mode="threads"):
+    """Run EasyOCR over overlapping tiles of image_np and return merged results in reading order"""
+    height, width = image_np.shape[:2]
+    tiles = plan_tiles(width, height, tile_size, overlap)
+    # Slices are views, no pixel data is copied here
+    crops = [image_np[top:bottom, left:right] for left, top, right, bottom in tiles]
+
+    if mode == "batched" and hasattr(reader, "readtext_batched"):
+        # readtext_batched wants equally sized inputs; pad edge tiles with white
+        padded = []
+        for crop in crops:
+            if crop.shape[0] == tile_size and crop.shape[1] == tile_size:
+                padded.append(crop)
+                continue
+            canvas = numpy.full((tile_size, tile_size) + crop.shape[2:], 255, dtype=crop.dtype)
+            canvas[:crop.shape[0], :crop.shape[1]] = crop
+            padded.append(canvas)
+        per_tile = reader.readtext_batched(padded, n_width=tile_size, n_height=tile_size)
+    elif workers > 1 and len(crops) > 1:
+        # Torch releases the GIL during inference, so threads share one model
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ocr-tile") as pool:
+            per_tile = list(pool.map(reader.readtext, crops))
+    else:
+        per_tile = [reader.readtext(crop) for crop in crops]
+
+    return merge_tile_results(list(zip(tiles, per_tile)), width, height, overlap)
@@ -0,0 +1,109 @@
+import os
+import sys
+import threading
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from config import settings
+from utils.tracing import tracer
+
+
+def _lower_current_thread_priority():
+    """Drop the calling thread to background priority so warm-up never competes with the UI"""
+    try:
+        if sys.platform == "win32":
+            import ctypes
+            THREAD_PRIORITY_LOWEST = -2
+            kernel32 = ctypes.windll.kernel32
+            kernel32.SetThreadPriority(kernel32.GetCurrentThread(), THREAD_PRIORITY_LOWEST)
+        elif hasattr(os, "setpriority"):
+            # On Linux the nice value is per-thread when given the native thread id
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 10)
+    except Exception as e:
+        print(f"[WARNING] Could not lower warm-up thread priority: {e}")
+
+
+def _get_idle_seconds():
+    """Seconds since the last user input, or None if it cannot be determined"""
+    try:
+        from utils.system_integration import WindowsIntegration
+        return WindowsIntegration.get_idle_seconds()
+    except Exception:
+        return None
+
+
+class OCRPrewarmer(QObject):
+    """Loads the OCR reader on a low-priority background thread after a delay or when the user goes idle"""
+    warmed_up = Signal(float)
+    warmup_failed = Signal(str)
+
+    def __init__(self, ocr_processor, delay_seconds=None, idle_seconds=None):
+        super().__init__()
+        # A processor or a zero-argument factory, so its imports can wait until the warm-up
+        self.get_processor = ocr_processor if callable(ocr_processor) else (lambda: ocr_processor)
+        self.delay_seconds = settings.OCR_PREWARM_DELAY_SECONDS if delay_seconds is None else delay_seconds
+        self.idle_seconds = settings.OCR_PREWARM_IDLE_SECONDS if idle_seconds is None else idle_seconds
+        self.cancelled = threading.Event()
+        self.thread = None
+
+        self.delay_timer = QTimer(self)
+        self.delay_timer.setSingleShot(True)
+        self.delay_timer.timeout.connect(self._begin_warmup)
+
+        self.idle_timer = QTimer(self)
+        self.idle_timer.setInterval(settings.OCR_PREWARM_IDLE_POLL_MS)
+        self.idle_timer.timeout.connect(self._check_idle)
+
+    def start(self):
+        """Schedule the warm-up, returns immediately"""
+        self.cancelled.clear()
+        self.delay_timer.start(int(self.delay_seconds * 1000))
+        if self.idle_seconds and _get_idle_seconds() is not None:
+            self.idle_timer.start()
+        print(f"[INFO] OCR prewarm scheduled in {self.delay_seconds}s"
+              + (f" or after {self.idle_seconds}s idle" if self.idle_timer.isActive() else ""))
+
+    def cancel(self):
+        """Cancel a pending warm-up; a load already in progress is discarded when it finishes"""
+        self.cancelled.set()
+        self.delay_timer.stop()
+        self.idle_timer.stop()
+
+    def is_running(self):
+        """True while the background load is in progress"""
+        return self.thread is not None and self.thread.is_alive()
+
+    def _check_idle(self):
+        """Start warming up early once the machine has been idle long enough"""
+        idle = _get_idle_seconds()
+        if idle is not None and idle >= self.idle_seconds:
+            tracer.event("ocr.prewarm_idle", idle_s=round(idle))
+            self._begin_warmup()
+
+    def _begin_warmup(self):
+        """Kick off the background load once"""
+        self.delay_timer.stop()
+        self.idle_timer.stop()
+        if self.cancelled.is_set() or self.is_running() or self.get_processor().is_ready():
+            return
+        self.thread = threading.Thread(target=self._run, name="ocr-prewarm", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        """Background thread body"""
+        _lower_current_thread_priority()
+        try:
+            print("[INFO] 🔥 Prewarming OCR reader in background...")
+            seconds = self.get_processor().warm_up()
+        except Exception as e:
+            print(f"[ERROR] OCR prewarm failed: {e}")
+            self.warmup_failed.emit(str(e))
+            return
+
+        if self.cancelled.is_set():
+            # Cancelled mid-load (e.g. app exiting) - don't keep the model around
+            print("[INFO] OCR prewarm cancelled, releasing reader")
+            self.get_processor().cleanup()
+            return
+
+        print(f"[INFO] ✅ OCR reader ready (warm-up took {seconds:.2f}s)")
+        self.warmed_up.emit(seconds)
@@ -0,0 +1,61 @@
+from config import settings
+from core.text_presence import TextPresenceDetector
+from utils.image_processing import OCRPreprocessor
+from utils.tracing import tracer
+
+
+class SearchRouter:
+    """Text pre-check and OCR preprocessing that decide between text and image search
+
+    Free of Qt so the tray app and the headless batch command route captures
+    the same way.
+    """
+
+    def __init__(self):
+        self.text_detector = None
+        if settings.TEXT_PRESENCE_ENABLED:
+            self.text_detector = TextPresenceDetector(
+                min_score=settings.TEXT_PRESENCE_MIN_SCORE,
+                edge_threshold=settings.TEXT_PRESENCE_EDGE_THRESHOLD,
+                min_row_transitions=settings.TEXT_PRESENCE_MIN_ROW_TRANSITIONS,
+            )
+        self.preprocessor = None
+        if settings.OCR_PREPROCESS_ENABLED:
+            self.preprocessor = OCRPreprocessor(
+                trim_borders=settings.OCR_PREPROCESS_TRIM_BORDERS,
+                trim_tolerance=settings.OCR_PREPROCESS_TRIM_TOLERANCE,
+                target_line_height=settings.OCR_PREPROCESS_TARGET_LINE_HEIGHT,
+                min_scale=settings.OCR_PREPROCESS_MIN_SCALE,
+                max_scale=settings.OCR_PREPROCESS_MAX_SCALE,
+                max_pixels=settings.OCR_PREPROCESS_MAX_PIXELS,
+                normalize_contrast=settings.OCR_PREPROCESS_NORMALIZE_CONTRAST,
+            )
+
+    def may_contain_text(self, pixels, ocr_processor=None):
+        """Cheap pre-check so photos and icons skip OCR entirely"""
+        if self.text_detector is None:
+            return True
+        has_text, score, seconds = self.text_detector.has_text(pixels)
+        tracer.record("text.precheck", seconds, score=round(float(score), 3), has_text=bool(has_text))
+        if has_text:
+            return True
+        last_ocr = ocr_processor.last_ocr_seconds if ocr_processor else None
+        saved = f", ~{last_ocr:.2f}s OCR saved" if last_ocr else ""
+        print(f"[INFO] No text detected (score {score:.3f}, {seconds * 1000:.1f} ms{saved}), skipping OCR")
+        return False
+
+    def prepare_for_ocr(self, pixels):
+        """Shrink the capture (RGB array) to the grayscale pixels OCR needs"""
+        if self.preprocessor is None:
+            return pixels
+        try:
+            image_np = self.preprocessor.process(pixels)
+            tracer.event("ocr.preprocess", size_in=f"{pixels.shape[1]}x{pixels.shape[0]}",
+                         size_out=f"{image_np.shape[1]}x{image_np.shape[0]}",
+                         scale=round(self.preprocessor.last_scale, 2),
+                         stages={name: round(seconds * 1000, 1)
+                                 for name, seconds in self.preprocessor.stage_seconds.items()})
+            return image_np
+        except Exception as e:
+            print(f"[WARNING] Preprocessing failed, using raw capture: {e}")
+            return pixels
@@ -0,0 +1,155 @@
+import threading
+import numpy
+from PySide6.QtCore import QRect
+from PySide6.QtGui import QGuiApplication, QImage
+
+from utils.lazy_import import lazy_import
+
+# Only needed to hand a frame to PIL consumers or to rescale mixed-DPI crops
+Image = lazy_import("PIL.Image")
+
+
+class CapturedFrame:
+    """Raw BGRA pixels from a screen grab, exposed as NumPy views
+
+    Nothing is converted up front: ``rgb`` is a strided view over the BGRA
+    buffer and a PIL image is only built by ``to_pil`` when a consumer
+    (the image-search path) really needs one.
+    """
+
+    def __init__(self, bgra, left=0, top=0, owner=None):
+        self.bgra = bgra
+        self.left = left
+        self.top = top
+        # Object that owns the memory behind bgra (e.g. a QImage), kept alive with the view
+        self.owner = owner
+
+    @property
+    def size(self):
+        """(width, height) like PIL's Image.size"""
+        return self.bgra.shape[1], self.bgra.shape[0]
+
+    @property
+    def rgb(self):
+        """Zero-copy RGB view (reversed channel stride, alpha dropped)"""
+        return self.bgra[..., 2::-1]
+
+    def crop(self, left, top, width, height):
+        """Zero-copy sub-frame, coordinates relative to this frame"""
+        return CapturedFrame(
+            self.bgra[top:top + height, left:left + width],
+            self.left + left,
+            self.top + top,
+            self.owner,
+        )
+
+    def to_pil(self):
+        """Materialize an RGB PIL image (one conversion copy)"""
+        bgra = numpy.ascontiguousarray(self.bgra)
+        return Image.frombuffer("RGB", self.size, bgra, "raw", "BGRX", 0, 1)
+
+
+class ScreenCaptureBackend:
+    """Long-lived mss capture backend
+
+    mss handles are bound to the thread that created them, so one instance
+    is kept per thread and reused for every grab instead of opening a new
+    context per capture.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._instances = []
+        self._lock = threading.Lock()
+
+    def _get_sct(self):
+        sct = getattr(self._local, "sct", None)
+        if sct is None:
+            import mss
+            sct = mss.mss()
+            self._local.sct = sct
+            with self._lock:
+                self._instances.append(sct)
+        return sct
+
+    def grab(self, capture_rect):
+        """Grab a physical-pixel box and return it as a CapturedFrame"""
+        shot = self._get_sct().grab(capture_rect)
+        # shot.raw is a fresh bytearray owned by the screenshot; view it in place
+        bgra = numpy.frombuffer(shot.raw, dtype=numpy.uint8).reshape(shot.height, shot.width, 4)
+        return CapturedFrame(bgra, capture_rect["left"], capture_rect["top"])
+
+    def close(self):
+        """Release all mss instances"""
+        with self._lock:
+            instances, self._instances = self._instances, []
+        for sct in instances:
+            try:
+                sct.close()
+            except Exception:
+                pass
+        self._local = threading.local()
+
+
+class DesktopSnapshot:
+    """Freeze-frame of every screen, taken once when the overlay opens
+
+    Each screen is grabbed at its own native resolution, so selections are
+    cropped with that screen's real pixel ratio even on mixed-DPI setups.
+    Cropping is in-memory slicing, no second screen grab after selection.
+    """
+
+    def __init__(self, screens):
+        # [(logical QRect, pixel ratio, CapturedFrame)]
+        self.screens = screens
+
+    @classmethod
+    def grab(cls):
+        """Grab all screens (GUI thread only)"""
+        screens = []
+        for screen in QGuiApplication.screens():
+            geometry = screen.geometry()
+            image = screen.grabWindow(0).toImage().convertToFormat(QImage.Format_RGB32)
+            if image.isNull() or geometry.width() <= 0:
+                continue
+            # Format_RGB32 is B,G,R,0xFF in memory on little-endian machines;
+            # rows may be padded, so view with bytesPerLine and trim
+            buffer = numpy.frombuffer(image.constBits(), dtype=numpy.uint8)
+            rows = buffer[:image.bytesPerLine() * image.height()].reshape(image.height(), image.bytesPerLine() // 4, 4)
+            frame = CapturedFrame(rows[:, :image.width()], owner=image)
+            # Actual grabbed size beats devicePixelRatio() for fractional scaling
+            ratio = image.width() / geometry.width()
+            screens.append((QRect(geometry), ratio, frame))
+        return cls(screens)
+
+    @staticmethod
+    def _crop_screen(geometry, ratio, frame, rect):
+        """Crop the part of one screen covered by rect (logical global coordinates)"""
+        left = int(round((rect.x() - geometry.x()) * ratio))
+        top = int(round((rect.y() - geometry.y()) * ratio))
+        width = min(int(round(rect.width() * ratio)), frame.size[0] - left)
+        height = min(int(round(rect.height() * ratio)), frame.size[1] - top)
+        return frame.crop(max(left, 0), max(top, 0), width, height)
+
+    def crop(self, rect: QRect):
+        """Return the selection as a CapturedFrame, or None if it misses every screen"""
+        parts = [(g, r, f, g.intersected(rect)) for g, r, f in self.screens if g.intersects(rect)]
+        if not parts:
+            return None
+        if len(parts) == 1:
+            geometry, ratio, frame, area = parts[0]
+            return self._crop_screen(geometry, ratio, frame, area)
+
+        # Selection spans screens: compose at the sharpest screen's ratio
+        ratio = max(part[1] for part in parts)
+        canvas = numpy.zeros((int(round(rect.height() * ratio)), int(round(rect.width() * ratio)), 4), dtype=numpy.uint8)
+        for geometry, screen_ratio, frame, area in parts:
+            piece = self._crop_screen(geometry, screen_ratio, frame, area).bgra
+            size = (int(round(area.width() * ratio)), int(round(area.height() * ratio)))
+            if screen_ratio != ratio:
+                piece = numpy.asarray(Image.fromarray(numpy.ascontiguousarray(piece)).resize(size, Image.Resampling.BILINEAR))
+            x = int(round((area.x() - rect.x()) * ratio))
+            y = int(round((area.y() - rect.y()) * ratio))
+            piece = piece[:canvas.shape[0] - y, :canvas.shape[1] - x]
+            canvas[y:y + piece.shape[0], x:x + piece.shape[1]] = piece
+        return CapturedFrame(canvas, rect.x(), rect.y())
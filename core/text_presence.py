@@ -0,0 +1,52 @@
+import time
+import numpy
+from PIL import Image
+
+
+class TextPresenceDetector:
+    """Cheap edge/stroke-density check that decides "no text here" before running OCR
+
+    Rendered text produces many short, high-contrast transitions along each
+    text row, while photos and icons have smooth areas with only a few hard
+    outlines. The score is the fraction of rows that look like text rows.
+    """
+
+    def __init__(self, min_score=0.04, edge_threshold=48, min_row_transitions=6, max_pixels=1_000_000):
+        self.min_score = min_score
+        self.edge_threshold = edge_threshold
+        self.min_row_transitions = min_row_transitions
+        self.max_pixels = max_pixels
+
+    def _to_gray(self, image):
+        """Grayscale int16 array, subsampled for very large captures"""
+        if isinstance(image, Image.Image):
+            gray = numpy.asarray(image.convert("L"), dtype=numpy.int16)
+        elif image.ndim == 3:
+            # ITU-R 601 luma with integer weights, same as PIL's "L" conversion
+            rgb = image[..., :3].astype(numpy.int32)
+            gray = ((rgb[..., 0] * 299 + rgb[..., 1] * 587 + rgb[..., 2] * 114) // 1000).astype(numpy.int16)
+        else:
+            gray = image.astype(numpy.int16)
+
+        step = 1
+        while gray.size / (step * step) > self.max_pixels:
+            step += 1
+        # Only subsample rows: columns keep full resolution so thin strokes survive
+        return gray[::step] if step > 1 else gray
+
+    def score(self, image):
+        """Fraction of rows with enough sharp transitions to be text"""
+        gray = self._to_gray(image)
+        if gray.shape[0] < 2 or gray.shape[1] < 2:
+            return 0.0
+        strong = numpy.abs(numpy.diff(gray, axis=1)) > self.edge_threshold
+        # Count rising edges of the strong-edge mask so one thick edge counts once
+        transitions = numpy.count_nonzero(strong[:, 1:] & ~strong[:, :-1], axis=1)
+        needed = max(self.min_row_transitions, gray.shape[1] // 200)
+        return float(numpy.count_nonzero(transitions >= needed)) / gray.shape[0]
+
+    def has_text(self, image):
+        """Return (has_text, score, seconds) for routing a capture"""
+        start = time.perf_counter()
+        value = self.score(image)
+        return value >= self.min_score, value, time.perf_counter() - start
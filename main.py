@@ -1,16 +1,22 @@
 import sys
 import os
 import atexit
+import html
+import time
 from PySide6.QtWidgets import QApplication, QSystemTrayIcon, QMenu
 from PySide6.QtGui import QIcon, QAction, QPixmap, QPainter
-from PySide6.QtCore import QLockFile, QDir, Qt, QPoint
+from PySide6.QtCore import QLockFile, QDir, Qt, QPoint, QTimer
+
+from config import settings
+from utils.tracing import tracer
 
 class DirectSearchApplication:
     """Main application controller with system tray"""
     
     def __init__(self, app: QApplication, start_minimized=False):
         self.app = app
-        print("[DEBUG] Initializing Direct Search Application...")
+        self.start_minimized = start_minimized
+        init_span = tracer.start("app.init")
         
         # Set up system tray
         self.setup_system_tray()
@@ -19,45 +25,126 @@ class DirectSearchApplication:
         self.search_engine = None
         self.overlay = None
         self.hotkey_manager = None
+        self.ocr_processor = None
+        self.ocr_prewarmer = None
+        self.memory_governor = None
         
         # Start minimal hotkey listener (lightweight)
         self.setup_minimal_hotkey_manager()
         
+        # Unload the OCR model again when it sits idle or memory runs high
+        self.setup_memory_governor()
+        
+        # Load the OCR model in the background so the first capture is fast
+        self.setup_ocr_prewarm()
+        
         if not start_minimized:
             self.show_notification("Direct Search", "Application started! Press Ctrl+Shift+Space to capture.")
         
-        print("[DEBUG] Direct Search Application initialized in low-memory mode!")
+        init_span.finish()
 
     def setup_minimal_hotkey_manager(self):
         """Setup minimal hotkey manager without loading heavy dependencies"""
         try:
             from utils.hotkey_manager import HotkeyManager
-            self.hotkey_manager = HotkeyManager()
-            self.hotkey_manager.hotkey_pressed.connect(self.handle_show_overlay)
+            self.hotkey_manager = HotkeyManager(settings.HOTKEYS, settings.HOTKEY_DEBOUNCE_SECONDS)
+            self.hotkey_manager.hotkey_triggered.connect(self.on_hotkey)
             self.hotkey_manager.start_listening()
             print("[INFO] Minimal hotkey manager started")
         except Exception as e:
             print(f"[WARNING] Failed to setup hotkey manager: {e}")
 
+    def on_hotkey(self, action):
+        """Dispatch a configured hotkey action"""
+        actions = {
+            "show_overlay": lambda: self.handle_show_overlay(self.hotkey_manager.triggered_at(action), "hotkey"),
+            "quit": self.cleanup_and_exit,
+        }
+        handler = actions.get(action)
+        if handler is None:
+            print(f"[WARNING] Unknown hotkey action: {action}")
+            return
+        handler()
+
+    def get_ocr_processor(self):
+        """Shared OCR processor (cheap to create, the model itself loads lazily)"""
+        if self.ocr_processor is None:
+            from core.ocr_processor import OCRProcessor
+            self.ocr_processor = OCRProcessor()
+        return self.ocr_processor
+
+    def setup_ocr_prewarm(self):
+        """Schedule a low-priority background load of the OCR reader"""
+        if not settings.OCR_PREWARM_ENABLED or "--no-prewarm" in sys.argv:
+            print("[INFO] OCR prewarm disabled")
+            return
+        try:
+            from core.prewarm import OCRPrewarmer
+            delay = (settings.OCR_PREWARM_AUTOSTART_DELAY_SECONDS if self.start_minimized
+                     else settings.OCR_PREWARM_DELAY_SECONDS)
+            self.ocr_prewarmer = OCRPrewarmer(self.get_ocr_processor, delay_seconds=delay)
+            self.ocr_prewarmer.warmed_up.connect(self.on_ocr_warmed_up)
+            if self.memory_governor:
+                self.ocr_prewarmer.warmed_up.connect(self.memory_governor.arm)
+            self.ocr_prewarmer.start()
+        except Exception as e:
+            print(f"[WARNING] Failed to setup OCR prewarm: {e}")
+
+    def setup_memory_governor(self):
+        """Watch the loaded OCR reader for idle time and RSS growth"""
+        if not settings.MEMORY_GOVERNOR_ENABLED:
+            return
+        try:
+            from core.memory_governor import MemoryGovernor
+            self.memory_governor = MemoryGovernor(self.get_ocr_processor)
+            self.memory_governor.unloaded.connect(self.on_ocr_unloaded)
+        except Exception as e:
+            print(f"[WARNING] Failed to setup memory governor: {e}")
+
+    def on_ocr_unloaded(self, reason, rss_before_mb, rss_after_mb):
+        """Report that OCR will reload on the next capture"""
+        self.tray_icon.setToolTip(f"Direct Search (OCR unloaded to save memory, {rss_before_mb - rss_after_mb:.0f} MB freed)\n"
+                                  "Press Ctrl+Shift+Space to capture")
+
+    def on_ocr_warmed_up(self, seconds):
+        """Report that OCR is ready"""
+        self.tray_icon.setToolTip(f"Direct Search (OCR ready, warm-up {seconds:.1f}s)\nPress Ctrl+Shift+Space to capture")
+
     def lazy_load_components(self):
-        """Lazy load heavy components only when needed"""
-        if self.search_engine is None:
-            print("[DEBUG] 🚀 Lazy loading core components...")
+        """Lazy load the overlay only when needed (the search engine follows once it is shown)"""
+        if self.overlay is None:
             try:
-                from core.direct_search_engine import DirectSearchEngine
-                from overlay import OverlayWindow
-                
-                self.search_engine = DirectSearchEngine()
-                self.overlay = OverlayWindow()
+                with tracer.span("overlay.load"):
+                    from overlay import OverlayWindow
+                    
+                    self.overlay = OverlayWindow()
                 
                 # Connect signals
                 self.overlay.region_selected.connect(self.on_region_selected)
-                print("[DEBUG] Core components loaded successfully")
+                self.overlay.regions_selected.connect(self.on_regions_selected)
             except Exception as e:
                 print(f"[ERROR] Failed to load core components: {e}")
                 return False
         return True
 
+    def load_search_engine(self):
+        """Lazy load the search engine; runs while the user is still dragging"""
+        if self.search_engine is None:
+            try:
+                with tracer.span("engine.load"):
+                    from core.direct_search_engine import DirectSearchEngine
+                    
+                    self.search_engine = DirectSearchEngine(ocr_processor=self.get_ocr_processor())
+                if self.memory_governor:
+                    self.search_engine.pipeline.job_finished.connect(self.memory_governor.arm)
+                
+                if settings.BROWSER_PRELAUNCH:
+                    self.search_engine.prelaunch_browser()
+            except Exception as e:
+                print(f"[ERROR] Failed to load search engine: {e}")
+                return False
+        return True
+
     def create_default_icon(self):
         """Create a default icon programmatically if no icon file exists"""
         pixmap = QPixmap(64, 64)
@@ -102,9 +189,16 @@ class DirectSearchApplication:
         
         # Show overlay action
         show_action = QAction("📷 Capture Screen", self.app)
-        show_action.triggered.connect(self.handle_show_overlay)
+        # triggered(bool) would otherwise land in requested_at
+        show_action.triggered.connect(lambda: self.handle_show_overlay())
         tray_menu.addAction(show_action)
         
+        # Latency histograms of the traced pipeline stages
+        if settings.TRACING_ENABLED:
+            stats_action = QAction("📊 Latency Stats", self.app)
+            stats_action.triggered.connect(self.show_latency_stats)
+            tray_menu.addAction(stats_action)
+        
         # Separator
         tray_menu.addSeparator()
         
@@ -157,26 +251,55 @@ class DirectSearchApplication:
         """Show system tray notification"""
         self.tray_icon.showMessage(title, message, QSystemTrayIcon.Information, 3000)
 
-    def handle_show_overlay(self):
+    def show_latency_stats(self):
+        """Show p50/p95/p99 per traced stage over the recent window"""
+        from PySide6.QtWidgets import QMessageBox
+        box = QMessageBox()
+        box.setWindowTitle("Direct Search - Latency")
+        box.setText(f"<pre>{html.escape(tracer.format_summary())}</pre>")
+        box.setInformativeText(f"Last {tracer.samples} samples per stage. Spans are logged to {settings.TRACE_LOG_PATH}"
+                               if settings.TRACE_LOG_PATH else f"Last {tracer.samples} samples per stage.")
+        box.exec()
+
+    def handle_show_overlay(self, requested_at=None, trigger="tray"):
         """Show the capture overlay with lazy loading"""
-        print("[DEBUG] 🎯 Activating overlay with lazy loading...")
+        if self.overlay and self.overlay.isVisible():
+            # Repeated hotkey while selecting: keep the current overlay
+            return
         try:
             # Lazy load components first
             if not self.lazy_load_components():
                 self.show_notification("Error", "Failed to load application components")
                 return
                 
-            self.overlay.show_overlay()
-            print("[DEBUG] Overlay activated")
+            self.overlay.show_overlay(requested_at or time.perf_counter(), trigger)
+            if self.search_engine is None:
+                # Deferred so its imports do not delay the overlay appearing
+                QTimer.singleShot(0, self.load_search_engine)
         except Exception as e:
             print(f"[ERROR] Failed to show overlay: {e}")
             self.show_notification("Error", "Failed to show overlay")
 
     def on_region_selected(self, rect):
         """Handle region selection with direct search"""
-        print(f"[DEBUG] Region selected: {rect}")
-        if self.search_engine:
-            self.search_engine.process_selection(rect)
+        tracer.event("selection.region", rect=[rect.x(), rect.y(), rect.width(), rect.height()])
+        if self.load_search_engine():
+            snapshot = self.overlay.snapshot if self.overlay else None
+            self.search_engine.process_selection(rect, snapshot=snapshot)
+            # The crop holds what it needs; release the full-desktop frame
+            if self.overlay:
+                self.overlay.snapshot = None
+        else:
+            print("[ERROR] Search engine not initialized")
+
+    def on_regions_selected(self, rects):
+        """Handle a multi-region selection (shift-drag, then Enter) as one batched search"""
+        tracer.event("selection.regions", count=len(rects))
+        if self.load_search_engine():
+            snapshot = self.overlay.snapshot if self.overlay else None
+            self.search_engine.process_regions(rects, snapshot=snapshot)
+            if self.overlay:
+                self.overlay.snapshot = None
         else:
             print("[ERROR] Search engine not initialized")
 
@@ -187,6 +310,10 @@ class DirectSearchApplication:
 
     def cleanup(self):
         """Cleanup resources"""
+        if self.ocr_prewarmer:
+            self.ocr_prewarmer.cancel()
+        if self.memory_governor:
+            self.memory_governor.stop()
         if self.search_engine:
             self.search_engine.cleanup()
         if self.hotkey_manager:
@@ -197,8 +324,33 @@ class DirectSearchApplication:
 
         
 def main():
+    if getattr(sys, "frozen", False):
+        # Batch OCR workers are spawned by re-running the bundled executable
+        import multiprocessing
+        multiprocessing.freeze_support()
+    
+    # Headless: OCR and route screenshots, JSON lines on stdout (so no banner)
+    if "--batch" in sys.argv:
+        from core.batch_ocr import main as batch_ocr
+        sys.exit(batch_ocr(sys.argv[sys.argv.index("--batch") + 1:]))
+    
+    # Out-of-process OCR service (started by the app when OCR_DAEMON_ENABLED)
+    if "--ocr-daemon" in sys.argv:
+        from core.ocr_daemon import main as ocr_daemon
+        sys.exit(ocr_daemon(sys.argv[sys.argv.index("--ocr-daemon") + 1:]))
+    
+    # Search or manage the capture history without starting the tray app
+    if "--history" in sys.argv:
+        from core.capture_history import main as capture_history
+        sys.exit(capture_history(sys.argv[sys.argv.index("--history") + 1:]))
+    
     print("🚀 Starting Direct Search Application (Lazy Load Mode)")
     
+    # One-off: benchmark the installed OCR backends for OCR_BACKEND = "auto"
+    if "--calibrate-ocr" in sys.argv:
+        from core.ocr_calibration import main as calibrate_ocr
+        sys.exit(calibrate_ocr(sys.argv[sys.argv.index("--calibrate-ocr") + 1:]))
+    
     # Single instance lock
     lock_file = QLockFile(os.path.join(QDir.tempPath(), "direct-search-app.lock"))
     if not lock_file.tryLock(100):
@@ -1,9 +1,18 @@
 from PySide6.QtWidgets import QWidget
-from PySide6.QtCore import Qt, QRect, QPoint, Signal
-from PySide6.QtGui import QPainter, QColor, QPen, QGuiApplication
+from PySide6.QtCore import Qt, QRect, QPoint, QTimer, Signal
+from PySide6.QtGui import QPainter, QColor, QPen, QPixmap, QGuiApplication
+
+from config import settings
+from core.screen_capture import DesktopSnapshot
+from utils.tracing import tracer
 
 class OverlayWindow(QWidget):
     region_selected = Signal(QRect)
+    regions_selected = Signal(list)  # QRects in selection order (multi-select)
+
+    DIM_COLOR = QColor(0, 0, 0, 80)
+    BORDER_WIDTH = 2
+    DIM_TILE_SIZE = 256
 
     def __init__(self):
         super().__init__()
@@ -18,9 +27,66 @@ class OverlayWindow(QWidget):
         self.begin_pos = QPoint()
         self.end_pos = QPoint()
         self.is_selecting = False
+        self.freeze_frame = settings.CAPTURE_FREEZE_FRAME
+        self.snapshot = None
+        # Request -> first frame on screen, finished by the first paint
+        self.show_span = None
+        # Shift-drag collects regions here (local coordinates) until Enter
+        self.regions = []
+
+        # Selection rect as last painted, to repaint only what changed
+        self.painted_rect = QRect()
+        self.dim_tile = self._render_dim_tile()
+        # Mouse moves are applied at most once per display refresh
+        self.pending_pos = None
+        self.move_timer = QTimer(self)
+        self.move_timer.setSingleShot(True)
+        self.move_timer.setTimerType(Qt.PreciseTimer)
+        self.move_timer.timeout.connect(self._apply_pending_move)
+
+    def _render_dim_tile(self):
+        """Dim layer rendered once as a tile, blitted into dirty areas without blending"""
+        tile = QPixmap(self.DIM_TILE_SIZE, self.DIM_TILE_SIZE)
+        tile.fill(self.DIM_COLOR)
+        return tile
+
+    def _frame_interval_ms(self):
+        """One display refresh period of the screen under the overlay"""
+        screen = self.screen() or QGuiApplication.primaryScreen()
+        refresh_rate = screen.refreshRate() if screen else 60.0
+        return max(1, int(1000 / (refresh_rate or 60.0)))
+
+    def selection_rect(self):
+        return QRect(self.begin_pos, self.end_pos).normalized()
 
-    def show_overlay(self):
+    def _dirty_rect(self, rect):
+        """Area a selection rect touches, including its border"""
+        margin = self.BORDER_WIDTH
+        return rect.adjusted(-margin, -margin, margin, margin)
+
+    def _update_selection(self):
+        """Repaint only the union of the previously painted and the new selection"""
+        new_rect = self.selection_rect() if self.is_selecting else QRect()
+        dirty = self._dirty_rect(new_rect) if new_rect.isValid() else QRect()
+        if self.painted_rect.isValid():
+            dirty = dirty.united(self._dirty_rect(self.painted_rect))
+        self.painted_rect = new_rect
+        if dirty.isValid():
+            self.update(dirty)
+
+    def show_overlay(self, requested_at=None, trigger="tray"):
         """Shows the simplified overlay across all screens."""
+        self.show_span = tracer.start("overlay.shown", start=requested_at, trigger=trigger)
+        # Freeze what the user sees now, before the overlay covers it
+        self.snapshot = None
+        if self.freeze_frame:
+            try:
+                self.snapshot = DesktopSnapshot.grab()
+            except Exception as e:
+                print(f"[WARNING] Desktop snapshot failed, will grab after selection: {e}")
+        self.is_selecting = False
+        self.regions = []
+        self.painted_rect = QRect()
         desktop_geometry = self.get_desktop_geometry()
         self.setGeometry(desktop_geometry)
         self.showFullScreen()
@@ -34,25 +100,40 @@ class OverlayWindow(QWidget):
         return total_geometry
 
     def paintEvent(self, event):
-        """A much simpler paint event for debugging."""
+        """Paint the dim layer and selection, limited to the dirty rect"""
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
+        dirty = event.rect()
+        if self.show_span is not None:
+            self.show_span.finish()
+            self.show_span = None
 
-        # 1. Draw a semi-transparent black overlay over the entire screen area.
-        overlay_color = QColor(0, 0, 0, 80)
-        painter.fillRect(self.rect(), overlay_color)
+        # 1. Copy the pre-rendered dim layer over the dirty area (no alpha blending).
+        painter.setCompositionMode(QPainter.CompositionMode_Source)
+        painter.drawTiledPixmap(dirty, self.dim_tile, dirty.topLeft())
+
+        # 2. Cut out the regions already added, numbered in selection order.
+        pen = QPen(QColor("#FFFFFF"), self.BORDER_WIDTH, Qt.SolidLine)
+        for number, region in enumerate(self.regions, 1):
+            if not self._dirty_rect(region).intersects(dirty):
+                continue
+            painter.setCompositionMode(QPainter.CompositionMode_Source)
+            painter.fillRect(region.intersected(dirty), Qt.transparent)
+            painter.setCompositionMode(QPainter.CompositionMode_SourceOver)
+            painter.setPen(pen)
+            painter.setBrush(Qt.NoBrush)
+            painter.drawRect(region)
+            painter.drawText(region.adjusted(4, 2, 0, 0), Qt.AlignLeft | Qt.AlignTop, str(number))
 
-        # 2. If selecting, draw a border for the selection rectangle.
+        # 3. If selecting, cut the selection out and draw its border.
         if self.is_selecting:
-            selection_rect = QRect(self.begin_pos, self.end_pos).normalized()
-            
-            # Draw a clear rectangle inside the selection
-            painter.setCompositionMode(QPainter.CompositionMode_Clear)
-            painter.fillRect(selection_rect, Qt.transparent)
+            painter.setCompositionMode(QPainter.CompositionMode_Source)
+            selection_rect = self.selection_rect()
+            clear_rect = selection_rect.intersected(dirty)
+            if not clear_rect.isEmpty():
+                painter.fillRect(clear_rect, Qt.transparent)
             painter.setCompositionMode(QPainter.CompositionMode_SourceOver)
 
             # Draw a white border around it
-            pen = QPen(QColor("#FFFFFF"), 2, Qt.SolidLine)
             painter.setPen(pen)
             painter.setBrush(Qt.NoBrush)
             painter.drawRect(selection_rect)
@@ -61,23 +142,63 @@ class OverlayWindow(QWidget):
         self.is_selecting = True
         self.begin_pos = event.position().toPoint()
         self.end_pos = self.begin_pos
-        self.update()
+        self._update_selection()
 
     def mouseMoveEvent(self, event):
         if self.is_selecting:
-            self.end_pos = event.position().toPoint()
-            self.update()
+            self.pending_pos = event.position().toPoint()
+            if not self.move_timer.isActive():
+                self.move_timer.start(self._frame_interval_ms())
+
+    def _apply_pending_move(self):
+        """Apply the latest of the mouse moves received since the last frame"""
+        if self.is_selecting and self.pending_pos is not None:
+            self.end_pos = self.pending_pos
+            self.pending_pos = None
+            self._update_selection()
 
     def mouseReleaseEvent(self, event):
         if self.is_selecting:
+            self.move_timer.stop()
+            self.pending_pos = None
+            self.end_pos = event.position().toPoint()
             self.is_selecting = False
             selection_rect = QRect(self.begin_pos, self.end_pos).normalized()
+            big_enough = selection_rect.width() > 5 and selection_rect.height() > 5
+            
+            # Shift-drag, or any drag once regions are collected, adds a region; Enter commits
+            if event.modifiers() & Qt.ShiftModifier or self.regions:
+                if big_enough:
+                    self.regions.append(selection_rect)
+                # Clears the rubber band; the added region paints over the same area
+                self._update_selection()
+                self.update(self._dirty_rect(selection_rect))
+                return
+            
+            # Global desktop coordinates, so the rect matches the snapshot
+            selection_rect.translate(self.mapToGlobal(QPoint(0, 0)))
             self.hide()
             
-            if selection_rect.width() > 5 and selection_rect.height() > 5:
+            if big_enough:
                 self.region_selected.emit(selection_rect)
 
+    def commit_regions(self):
+        """Emit the collected regions in global desktop coordinates and close the overlay"""
+        offset = self.mapToGlobal(QPoint(0, 0))
+        regions = [region.translated(offset) for region in self.regions]
+        self.regions = []
+        self.hide()
+        if regions:
+            self.regions_selected.emit(regions)
+
     def keyPressEvent(self, event):
         if event.key() == Qt.Key_Escape:
+            self.move_timer.stop()
             self.is_selecting = False
-            self.hide()
\ No newline at end of file
+            self.regions = []
+            self.snapshot = None
+            self.hide()
+        elif event.key() in (Qt.Key_Return, Qt.Key_Enter) and not self.is_selecting:
+            self.commit_regions()
+        elif event.key() == Qt.Key_Backspace and self.regions and not self.is_selecting:
+            self.update(self._dirty_rect(self.regions.pop()))
\ No newline at end of file
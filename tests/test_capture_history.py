@@ -0,0 +1,154 @@
+import random
+
+import numpy
+import pytest
+from PIL import Image, ImageDraw
+
+from core.capture_history import BKTree, CaptureHistory, hamming, perceptual_hash
+
+
+def label(text, size=(160, 40)):
+    """BGRA pixels of black text on white, like a captured UI label"""
+    image = Image.new("RGB", size, "white")
+    ImageDraw.Draw(image).text((10, 12), text, fill="black")
+    return numpy.ascontiguousarray(numpy.array(image.convert("RGBA"))[..., [2, 1, 0, 3]])
+
+
+@pytest.fixture
+def history(tmp_path):
+    store = CaptureHistory(str(tmp_path / "history.db"), max_bytes=1 << 30, match_distance=3)
+    yield store
+    store.close()
+
+
+def test_hamming():
+    assert hamming(0, 0) == 0
+    assert hamming(0b1011, 0b0001) == 2
+    assert hamming(0, (1 << 64) - 1) == 64
+
+
+def test_bktree_search_matches_brute_force():
+    rng = random.Random(0)
+    # Clustered hashes, so radius queries have several hits
+    centers = [rng.getrandbits(64) for _ in range(20)]
+    values = [center ^ (1 << rng.randrange(64)) ^ (1 << rng.randrange(64)) for center in centers for _ in range(20)]
+    tree = BKTree()
+    for item, value in enumerate(values):
+        tree.add(value, item)
+    assert tree.size == len(values)
+    for query in centers[:5] + [rng.getrandbits(64)]:
+        for radius in (0, 2, 5, 12):
+            expected = sorted((hamming(query, value), item) for item, value in enumerate(values)
+                              if hamming(query, value) <= radius)
+            assert tree.search(query, radius) == expected
+
+
+def test_bktree_remove_keeps_other_items_reachable():
+    rng = random.Random(1)
+    values = [rng.getrandbits(64) for _ in range(200)]
+    tree = BKTree()
+    for item, value in enumerate(values):
+        tree.add(value, item)
+    tree.add(values[0], "duplicate")
+    removed = set(range(0, 200, 3))
+    for item in removed:
+        tree.remove(values[item], item)
+    tree.remove(values[1], "never added")
+    assert tree.size == 201 - len(removed)
+    assert tree.search(values[0], 0) == [(0, "duplicate")]
+    for item, value in enumerate(values):
+        found = [hit for _, hit in tree.search(value, 0)]
+        assert (item in found) == (item not in removed)
+
+
+def test_search_finds_words_and_last_word_prefix(history):
+    history.add(label("a"), "connection timed out", "text")
+    history.add(label("b"), "file not found", "text")
+    assert [row["text"] for row in history.search("connection timed")] == ["connection timed out"]
+    assert [row["text"] for row in history.search("timed ou")] == ["connection timed out"]
+    assert history.search("timed xyz") == []
+    assert history.search("   ") == []
+
+
+@pytest.mark.parametrize("query", ['"', 'a"b', "NOT", "x AND y", "a OR b", "NEAR(a b)", "text:found", "foo-bar",
+                                   "c++", "(", "*", "^found"])
+def test_search_takes_fts_syntax_literally(history, query):
+    history.add(label("a"), 'foo-bar c++ NOT found a"b', "text")
+    # Never an FTS syntax error; operators are plain words
+    history.search(query)
+
+
+def test_search_operators_are_words(history):
+    history.add(label("a"), "cats AND dogs", "text")
+    history.add(label("b"), "cats only", "text")
+    assert [row["text"] for row in history.search("cats AND")] == ["cats AND dogs"]
+    assert [row["text"] for row in history.search("NOT only")] == []
+
+
+def test_search_is_newest_first(history):
+    ids = [history.add(label(str(index)), f"report {index}", "text") for index in range(5)]
+    assert [row["id"] for row in history.search("report")] == ids[::-1]
+    assert len(history.search("report", limit=2)) == 2
+
+
+def test_prune_keeps_within_max_bytes_dropping_least_recently_used(tmp_path):
+    history = CaptureHistory(str(tmp_path / "history.db"), max_bytes=1 << 30)
+    ids = [history.add(label(f"item {index}"), f"entry{index} " + "x" * 2000, "text") for index in range(10)]
+    entry_bytes = history.total_bytes // 10
+    history.close()
+
+    history = CaptureHistory(str(tmp_path / "history.db"), max_bytes=entry_bytes * 5)
+    history.mark_reused(ids[0])  # oldest, but just used again
+    history.add(label("new"), "fresh " + "x" * 2000, "text")
+    kept = {row["id"] for row in history.recent(limit=100)}
+    assert history.total_bytes <= history.max_bytes
+    assert ids[0] in kept
+    assert ids[1] not in kept
+    assert len(kept) <= 5
+    # Pruned captures leave the text index and the hash tree too
+    assert history.search("entry1") == []
+    assert len(history.sizes) == len(kept) == history.tree.size
+    assert history.stats()["captures"] == len(kept)
+    history.close()
+
+
+def test_reuse_requires_identical_pixels(history):
+    first, second = label("ABC123"), label("XYZ789")
+    # Same layout: the perceptual hash alone cannot tell these apart reliably
+    assert first.shape == second.shape
+    history.add(first, "ABC123", "text")
+    assert history.find_same(second) is None
+    match = history.find_same(first.copy())
+    assert match is not None and match["text"] == "ABC123"
+
+
+def test_find_similar_uses_hash_and_size(history):
+    pixels = label("hello")
+    capture_id = history.add(pixels, "hello", "text")
+    phash = perceptual_hash(pixels)
+    assert history.find_similar(phash, (160, 40))["id"] == capture_id
+    assert history.find_similar(phash, (320, 80)) is None
+
+
+def test_find_same_uses_the_content_key_index(history):
+    plan = " ".join(row[-1] for row in history.db.execute(
+        "EXPLAIN QUERY PLAN SELECT id FROM captures WHERE content_key = ? ORDER BY used DESC LIMIT 1", ("x",)))
+    assert "captures_content_key" in plan
+
+
+def test_reopen_restores_index(tmp_path):
+    path = str(tmp_path / "history.db")
+    history = CaptureHistory(path)
+    pixels = label("persist")
+    history.add(pixels, "persisted text", "text")
+    total = history.total_bytes
+    history.close()
+
+    history = CaptureHistory(path)
+    assert history.total_bytes == total
+    assert history.find_same(pixels)["text"] == "persisted text"
+    assert history.search("persisted")[0]["text"] == "persisted text"
+    history.clear()
+    assert history.stats()["captures"] == 0
+    assert history.find_same(pixels) is None
+    history.close()
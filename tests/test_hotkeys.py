@@ -0,0 +1,61 @@
+import pytest
+
+from benchmarks.bench_hotkeys import burst, context_switches, idle_wakeups, polling_loop
+from utils.hotkey_manager import PYNPUT_AVAILABLE, GlobalHotkeyListener
+
+# The old listener woke 10 times a second; an idle process sleeps through
+POLLING_RATE = 10
+IDLE_SECONDS = 1.0
+
+needs_counter = pytest.mark.skipif(context_switches() is None, reason="no context switch counter on this OS")
+
+
+def test_burst_inside_debounce_window_emits_once():
+    presses = 50
+    emitted, dropped = burst(presses, interval=0.001, debounce=1.0)
+    assert emitted == 1
+    assert dropped == presses - 1
+
+
+def test_presses_further_apart_than_debounce_all_emit():
+    emitted, dropped = burst(3, interval=0.15, debounce=0.05)
+    assert (emitted, dropped) == (3, 0)
+
+
+def test_actions_are_debounced_independently():
+    listener = GlobalHotkeyListener(debounce_seconds=1.0)
+    listener.active = True
+    fired = []
+    listener.hotkey_triggered.connect(fired.append)
+    for action in ("show_overlay", "quit", "show_overlay", "quit"):
+        listener._on_hotkey(action)
+    assert fired == ["show_overlay", "quit"]
+    assert listener.dropped == 2
+    assert listener.triggered_at.keys() == {"show_overlay", "quit"}
+
+
+def test_inactive_listener_ignores_presses():
+    listener = GlobalHotkeyListener()
+    fired = []
+    listener.hotkey_triggered.connect(fired.append)
+    listener._on_hotkey("show_overlay")
+    assert fired == []
+
+
+@needs_counter
+def test_wakeup_counter_detects_polling():
+    # Control: the measurement must be able to see the old loop
+    assert idle_wakeups(IDLE_SECONDS, *polling_loop()) >= POLLING_RATE * 0.7
+
+
+@needs_counter
+@pytest.mark.skipif(not PYNPUT_AVAILABLE, reason="pynput not installed")
+def test_idle_listener_has_no_polling_wakeups():
+    listener = GlobalHotkeyListener()
+    if not listener.start_listening():
+        pytest.skip("no keyboard hook in this session")
+    try:
+        wakeups = idle_wakeups(IDLE_SECONDS)
+    finally:
+        listener.stop_listening()
+    assert wakeups < POLLING_RATE / 2
@@ -0,0 +1,127 @@
+import asyncio
+import json
+import socket
+import threading
+
+import numpy
+import pytest
+
+from core.ocr_cache import OCRResultCache
+from core.ocr_client import DaemonAuthError, DaemonError, OCRDaemonClient
+from core.ocr_daemon import OCRDaemon
+from core.ocr_ipc import encode_message
+from core.ocr_processor import OCRProcessor
+
+
+class FlakyClient:
+    """Stand-in daemon client: fails the first `failures` requests, then reads "text" per frame"""
+
+    def __init__(self, failures):
+        self.failures = failures
+
+    def ocr(self, arrays, mode="text"):
+        if self.failures:
+            self.failures -= 1
+            raise DaemonError("daemon closed the connection")
+        return ["text"] * len(arrays)
+
+
+def remote_processor(failures):
+    processor = OCRProcessor(use_daemon=False)
+    processor.client = FlakyClient(failures)
+    processor.cache = OCRResultCache(max_entries=16, max_bytes=1 << 20)
+    return processor
+
+
+def frame(value):
+    return numpy.full((8, 8, 3), value, dtype=numpy.uint8)
+
+
+def test_failed_daemon_request_is_not_cached():
+    processor = remote_processor(failures=1)
+    assert processor.extract_text(frame(1)) == ""
+    assert len(processor.cache.entries) == 0
+    # The same pixels again go to the daemon rather than a cached ""
+    assert processor.extract_text(frame(1)) == "text"
+    assert processor.extract_text(frame(1)) == "text"
+    assert processor.cache.hits == 1
+
+
+def test_failed_daemon_batch_is_not_cached():
+    processor = remote_processor(failures=1)
+    frames = [frame(1), frame(2)]
+    assert processor.extract_text_batch(frames) == ["", ""]
+    assert len(processor.cache.entries) == 0
+    assert processor.extract_text_batch(frames) == ["text", "text"]
+    assert processor.extract_text_batch(frames) == ["text", "text"]
+    assert processor.cache.hits == 2
+
+
+def rejecting_server():
+    """TCP listener answering every auth message with a rejection, like another user's daemon"""
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen()
+
+    def serve():
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            with conn:
+                conn.makefile("rb").readline()
+                conn.sendall(encode_message({"ok": False, "error": "unauthorized"}))
+
+    threading.Thread(target=serve, daemon=True).start()
+    return server
+
+
+def test_rejected_token_does_not_start_another_daemon():
+    server = rejecting_server()
+    client = OCRDaemonClient(("tcp", server.getsockname()), autostart=True, connect_timeout=1.0)
+    started = []
+    client.start_daemon = lambda: started.append(True)
+    try:
+        with pytest.raises(DaemonAuthError):
+            client.ping()
+        assert started == []
+    finally:
+        client.close()
+        server.close()
+
+
+async def exchange(daemon, payload):
+    """Send payload to the daemon's client handler, returns (reply lines, clients still open)"""
+    server = await asyncio.start_server(daemon._handle_client, "127.0.0.1", 0)
+    async with server:
+        reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname())
+        writer.write(payload)
+        await writer.drain()
+        replies = []
+        while True:
+            try:
+                line = await asyncio.wait_for(reader.readline(), 5)
+            except ConnectionResetError:
+                break  # closed with our unread bytes still queued
+            if not line:
+                break
+            replies.append(json.loads(line))
+        writer.close()
+        await asyncio.sleep(0.05)
+    return replies, daemon.clients
+
+
+def test_daemon_without_token_rejects_cleanly():
+    daemon = OCRDaemon(("tcp", ("127.0.0.1", 0)))
+    replies, clients = asyncio.run(exchange(daemon, encode_message({"op": "auth", "token": "guess"})))
+    assert replies == [{"ok": False, "error": "unauthorized", "id": None}]
+    assert clients == 0
+
+
+def test_daemon_drops_client_sending_overlong_line():
+    daemon = OCRDaemon(("tcp", ("127.0.0.1", 0)))
+    daemon.token = "secret"
+    replies, clients = asyncio.run(exchange(daemon, b"x" * (256 * 1024) + b"\n"))
+    assert replies == []
+    assert clients == 0
@@ -0,0 +1,43 @@
+import json
+import threading
+
+from utils.tracing import Tracer
+
+
+def read_entries(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_spans_and_events_reach_the_log_after_close(tmp_path):
+    path = str(tmp_path / "trace.jsonl")
+    tracer = Tracer(enabled=True, log_path=path)
+    with tracer.span("stage", job=1):
+        pass
+    tracer.event("job.superseded", job=1, by=2)
+    tracer.close()
+
+    span, event = read_entries(path)
+    assert span["span"] == "stage" and span["job"] == 1 and span["ms"] >= 0
+    assert event == {"event": "job.superseded", "ts": event["ts"], "thread": threading.current_thread().name,
+                     "job": 1, "by": 2}
+    # Events are log-only, they do not show up in the latency histograms
+    assert list(tracer.histograms) == ["stage"]
+
+
+def test_log_is_written_by_the_writer_thread(tmp_path):
+    path = str(tmp_path / "trace.jsonl")
+    tracer = Tracer(enabled=True, log_path=path)
+    tracer.record("stage", 0.01)
+    writer = tracer._writer._thread
+    assert writer is not None and writer is not threading.current_thread()
+    tracer.close()
+    assert len(read_entries(path)) == 1
+
+
+def test_disabled_tracer_writes_nothing(tmp_path):
+    path = tmp_path / "trace.jsonl"
+    tracer = Tracer(enabled=False, log_path=str(path))
+    tracer.record("stage", 0.01)
+    tracer.event("something")
+    assert not path.exists() and tracer.histograms == {}
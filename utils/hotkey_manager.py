@@ -1,6 +1,7 @@
 import threading
 import time
 from PySide6.QtCore import QObject, Signal
+from utils.tracing import tracer
 
 try:
     from pynput import keyboard
@@ -10,13 +11,28 @@ except ImportError:
     print("[WARNING] pynput not available, hotkeys disabled")
 
 class GlobalHotkeyListener(QObject):
-    """Global hotkey listener using pynput for system-wide shortcuts"""
+    """Global hotkey listener using pynput for system-wide shortcuts
+
+    pynput's listener is its own thread blocked on OS keyboard events, so
+    nothing here polls: an idle listener causes no wakeups. Each action
+    fires on the first press of a burst; presses less than
+    ``debounce_seconds`` after the previous one are dropped.
+    """
     hotkey_pressed = Signal()
+    hotkey_triggered = Signal(str)
 
-    def __init__(self):
+    def __init__(self, hotkeys=None, debounce_seconds=0.3):
         super().__init__()
         self.active = False
         self.listener = None
+        # pynput hotkey string -> action name
+        self.hotkeys = dict(hotkeys or {'<ctrl>+<shift>+<space>': 'show_overlay'})
+        self.debounce_seconds = debounce_seconds
+        self.last_pressed = {}
+        # perf_counter() of each action's last accepted press, for hotkey -> overlay spans
+        self.triggered_at = {}
+        self.dropped = 0
+        self._lock = threading.Lock()
 
     def start_listening(self):
         """Start global hotkey listening"""
@@ -28,30 +44,37 @@ class GlobalHotkeyListener(QObject):
             return True
             
         try:
+            callbacks = {combo: self._make_callback(action) for combo, action in self.hotkeys.items()}
+            self.listener = keyboard.GlobalHotKeys(callbacks)
+            self.listener.daemon = True
+            self.listener.start()
             self.active = True
-            listener_thread = threading.Thread(target=self._run_listener, daemon=True)
-            listener_thread.start()
-            print("[INFO] ✅ Global hotkeys started: Ctrl+Shift+Space")
+            print(f"[INFO] ✅ Global hotkeys started: {', '.join(self.hotkeys)}")
             return True
         except Exception as e:
             print(f"[ERROR] Failed to start global hotkeys: {e}")
+            self.listener = None
             return False
 
-    def _run_listener(self):
-        """Run the global hotkey listener"""
-        try:
-            with keyboard.GlobalHotKeys({
-                '<ctrl>+<shift>+<space>': self._on_hotkey,
-            }) as self.listener:
-                while self.active:
-                    time.sleep(0.1)
-        except Exception as e:
-            print(f"[ERROR] Hotkey listener error: {e}")
+    def _make_callback(self, action):
+        return lambda: self._on_hotkey(action)
 
-    def _on_hotkey(self):
-        """Handle hotkey activation"""
-        if self.active:
-            print("[DEBUG] 🎯 Global hotkey activated!")
+    def _on_hotkey(self, action='show_overlay'):
+        """Handle hotkey activation (listener thread), coalescing bursts"""
+        if not self.active:
+            return
+        now = time.monotonic()
+        with self._lock:
+            # Any press extends the quiet window, so mashing a key fires once
+            last = self.last_pressed.get(action)
+            self.last_pressed[action] = now
+            if last is not None and now - last < self.debounce_seconds:
+                self.dropped += 1
+                return
+            self.triggered_at[action] = time.perf_counter()
+        tracer.event("hotkey.triggered", action=action)
+        self.hotkey_triggered.emit(action)
+        if action == 'show_overlay':
             self.hotkey_pressed.emit()
 
     def stop_listening(self):
@@ -62,17 +85,20 @@ class GlobalHotkeyListener(QObject):
                 self.listener.stop()
             except:
                 pass
+            self.listener = None
 
 class HotkeyManager(QObject):
     """Manages hotkey functionality"""
     
     hotkey_pressed = Signal()
+    hotkey_triggered = Signal(str)
     
-    def __init__(self):
+    def __init__(self, hotkeys=None, debounce_seconds=0.3):
         super().__init__()
         if PYNPUT_AVAILABLE:
-            self.listener = GlobalHotkeyListener()
+            self.listener = GlobalHotkeyListener(hotkeys, debounce_seconds)
             self.listener.hotkey_pressed.connect(self.hotkey_pressed)
+            self.listener.hotkey_triggered.connect(self.hotkey_triggered)
         else:
             print("[WARNING] Hotkeys disabled - pynput not available")
     
@@ -85,4 +111,10 @@ class HotkeyManager(QObject):
     def stop_listening(self):
         """Stop hotkey listening"""
         if PYNPUT_AVAILABLE:
-            self.listener.stop_listening()
\ No newline at end of file
+            self.listener.stop_listening()
+    
+    def triggered_at(self, action):
+        """perf_counter() of the last accepted press of action, or None"""
+        if PYNPUT_AVAILABLE:
+            return self.listener.triggered_at.get(action)
+        return None
\ No newline at end of file
@@ -0,0 +1,69 @@
+import importlib
+import importlib.util
+import threading
+import time
+
+# module name -> seconds its first (lazy) import took
+IMPORT_SECONDS = {}
+_lock = threading.Lock()
+
+
+def import_timed(name):
+    """Import a module, recording how long the first import took"""
+    with _lock:
+        start = time.perf_counter()
+        module = importlib.import_module(name)
+        IMPORT_SECONDS.setdefault(name, time.perf_counter() - start)
+        return module
+
+
+class LazyModule:
+    """Stand-in for a module (or one of its attributes) that is imported on first use
+
+    ``LazyModule("selenium.webdriver")`` behaves like the module once an
+    attribute is touched; with ``attribute`` it stands for that object and
+    can also be called, e.g. ``LazyModule("pyperclip", "copy")("text")``.
+    Exception classes cannot be proxied in an ``except`` clause, resolve
+    those with ``resolve()``.
+    """
+
+    def __init__(self, name, attribute=None):
+        self._name = name
+        self._attribute = attribute
+        self._target = None
+
+    def resolve(self):
+        """The real module or attribute, importing it if needed"""
+        if self._target is None:
+            module = import_timed(self._name)
+            self._target = getattr(module, self._attribute) if self._attribute else module
+        return self._target
+
+    @property
+    def loaded(self):
+        return self._target is not None
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.resolve(), name)
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __repr__(self):
+        target = f"{self._name}.{self._attribute}" if self._attribute else self._name
+        return f"<lazy {target} ({'loaded' if self.loaded else 'not loaded'})>"
+
+
+def lazy_import(name, attribute=None):
+    """Module (or module attribute) imported on first use"""
+    return LazyModule(name, attribute)
+
+
+def is_available(name):
+    """Check that a module can be imported, without importing it"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
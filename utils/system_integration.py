@@ -35,6 +35,20 @@ class WindowsIntegration:
             print(f"[ERROR] Failed to remove from startup: {e}")
             return False
     
+    @staticmethod
+    def get_idle_seconds():
+        """Seconds since the last keyboard/mouse input"""
+        class LASTINPUTINFO(ctypes.Structure):
+            _fields_ = [("cbSize", wintypes.UINT), ("dwTime", wintypes.DWORD)]
+        
+        info = LASTINPUTINFO()
+        info.cbSize = ctypes.sizeof(LASTINPUTINFO)
+        if not ctypes.windll.user32.GetLastInputInfo(ctypes.byref(info)):
+            return None
+        # GetTickCount wraps after ~49 days, keep the subtraction in 32 bits
+        elapsed_ms = (ctypes.windll.kernel32.GetTickCount() - info.dwTime) & 0xFFFFFFFF
+        return elapsed_ms / 1000.0
+    
     @staticmethod
     def is_admin():
         """Check if running as administrator"""
@@ -0,0 +1,85 @@
+import os
+import threading
+import time
+import uuid
+
+
+class TempFileStore:
+    """Bounded, self-cleaning directory of temporary search images
+
+    Every file gets a unique name, so searches in the same second never
+    overwrite each other. Files are written once and never reused, so
+    writes evict the oldest files beyond ``max_files`` / ``max_bytes`` and
+    anything older than ``max_age_seconds``; leftovers from a previous run
+    are pruned the same way on start.
+    """
+
+    def __init__(self, directory, prefix="search_image_", max_files=20,
+                 max_bytes=50 * 1024 * 1024, max_age_seconds=3600):
+        self.directory = directory
+        self.prefix = prefix
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+        self.prune()
+
+    def write(self, data, suffix=".jpg"):
+        """Write bytes to a new unique file and return its path"""
+        path = os.path.join(self.directory, f"{self.prefix}{time.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}{suffix}")
+        temp_path = path + ".part"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+        self.prune(keep=path)
+        return path
+
+    def _files(self):
+        """(mtime, size, path) of owned files, oldest first"""
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.name.startswith(self.prefix) and entry.is_file():
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        files.sort()
+        return files
+
+    def prune(self, keep=None):
+        """Apply the age, count and size limits; returns the number of files removed"""
+        removed = 0
+        with self._lock:
+            try:
+                files = self._files()
+            except OSError:
+                return 0
+            now = time.time()
+            total_bytes = sum(size for _, size, _ in files)
+            count = len(files)
+            for mtime, size, path in files:
+                expired = self.max_age_seconds and now - mtime > self.max_age_seconds
+                over = count > self.max_files or total_bytes > self.max_bytes
+                if path == keep or not (expired or over):
+                    continue
+                try:
+                    os.remove(path)
+                except OSError:
+                    # Still open elsewhere (e.g. a browser upload); retry on the next prune
+                    continue
+                removed += 1
+                count -= 1
+                total_bytes -= size
+        return removed
+
+    def clear(self):
+        """Remove every file of this store"""
+        with self._lock:
+            for _, _, path in self._files():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
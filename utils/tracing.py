@@ -0,0 +1,214 @@
+import atexit
+import json
+import logging
+import math
+import os
+import queue
+import threading
+import time
+from collections import deque
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+from config import settings
+
+
+class Span:
+    """One timed stage; finish() records it (at most once)"""
+    __slots__ = ("tracer", "name", "start", "attrs")
+
+    def __init__(self, tracer, name, start, attrs):
+        self.tracer = tracer
+        self.name = name
+        self.start = start
+        self.attrs = attrs
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def finish(self, **attrs):
+        if self.tracer is None:
+            return
+        if attrs:
+            self.attrs.update(attrs)
+        self.tracer.record(self.name, time.perf_counter() - self.start, **self.attrs)
+        self.tracer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        self.finish()
+        return False
+
+
+class _NoopSpan:
+    """Shared stand-in returned while tracing is off"""
+    __slots__ = ()
+
+    def set(self, **attrs):
+        pass
+
+    def finish(self, **attrs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class _EntryQueueHandler(QueueHandler):
+    """Hands records to the writer thread as they are; same process, so nothing to format or pickle"""
+
+    def prepare(self, record):
+        return record
+
+
+class _JsonLineFormatter(logging.Formatter):
+    """One JSON object per line, serialized on the writer thread"""
+
+    def format(self, record):
+        return json.dumps(record.msg, ensure_ascii=False, default=str)
+
+
+def percentile(sorted_samples, fraction):
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_samples:
+        return None
+    return sorted_samples[max(0, math.ceil(fraction * len(sorted_samples)) - 1)]
+
+
+class Tracer:
+    """Records per-stage spans into rolling histograms and a JSON-lines log
+
+    Disabled, ``span``/``start`` hand back a shared no-op object and
+    ``record``/``event`` return at once, so instrumented code pays one
+    attribute check per call. Log entries are queued to a writer thread
+    (started with the first entry), so recording never waits on the disk,
+    even from the GUI thread.
+    """
+
+    def __init__(self, enabled=None, log_path=None, samples=None, log_max_bytes=None):
+        self.enabled = settings.TRACING_ENABLED if enabled is None else enabled
+        self.log_path = settings.TRACE_LOG_PATH if log_path is None else log_path
+        self.samples = settings.TRACE_HISTOGRAM_SAMPLES if samples is None else samples
+        self.log_max_bytes = settings.TRACE_LOG_MAX_BYTES if log_max_bytes is None else log_max_bytes
+        self.histograms = {}  # span name -> deque of recent durations in seconds
+        self.counts = {}
+        self._logger = None
+        self._writer = None
+        self._lock = threading.Lock()
+        self._logger_lock = threading.Lock()
+
+    def span(self, name, **attrs):
+        """Context manager timing the enclosed block"""
+        if not self.enabled:
+            return NOOP_SPAN
+        return Span(self, name, time.perf_counter(), attrs)
+
+    def start(self, name, start=None, **attrs):
+        """Span finished later (possibly elsewhere); start is a perf_counter() value"""
+        if not self.enabled:
+            return NOOP_SPAN
+        return Span(self, name, time.perf_counter() if start is None else start, attrs)
+
+    def record(self, name, seconds, **attrs):
+        """Add a duration measured elsewhere"""
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = deque(maxlen=self.samples)
+            histogram.append(seconds)
+            self.counts[name] = self.counts.get(name, 0) + 1
+        if self.log_path:
+            self._log({"span": name, "ms": round(seconds * 1000, 3)}, attrs)
+
+    def event(self, name, **attrs):
+        """Structured diagnostic without a duration; goes to the trace log only"""
+        if self.enabled and self.log_path:
+            self._log({"event": name}, attrs)
+
+    def _log(self, entry, attrs):
+        entry["ts"] = round(time.time(), 3)
+        entry["thread"] = threading.current_thread().name
+        entry.update(attrs)
+        try:
+            self._get_logger().info(entry)
+        except Exception as e:
+            print(f"[WARNING] Trace log disabled: {e}")
+            self.log_path = None
+
+    def _get_logger(self):
+        if self._logger is not None:
+            return self._logger
+        with self._logger_lock:
+            if self._logger is None:
+                os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+                # Opened here so a bad path fails in the caller, which turns logging off
+                file_handler = RotatingFileHandler(self.log_path, maxBytes=self.log_max_bytes, backupCount=2,
+                                                   encoding="utf-8")
+                file_handler.setFormatter(_JsonLineFormatter())
+                entries = queue.SimpleQueue()
+                self._writer = QueueListener(entries, file_handler)
+                self._writer.start()
+                atexit.register(self.close)
+                # Private to this tracer: handlers never pile up on a shared named logger
+                logger = logging.Logger("directsearch.trace", logging.INFO)
+                logger.addHandler(_EntryQueueHandler(entries))
+                self._logger = logger
+        return self._logger
+
+    def close(self):
+        """Write out queued log entries and stop the writer thread"""
+        with self._logger_lock:
+            if self._writer is not None:
+                self._writer.stop()
+                for handler in self._writer.handlers:
+                    handler.close()
+                self._writer = None
+                self.log_path = None
+
+    def summary(self):
+        """Per span: total count and p50/p95/p99/max milliseconds over the rolling window"""
+        with self._lock:
+            snapshot = {name: (sorted(samples), self.counts[name]) for name, samples in self.histograms.items()}
+        return {
+            name: {
+                "count": count,
+                "window": len(samples),
+                "p50_ms": percentile(samples, 0.50) * 1000,
+                "p95_ms": percentile(samples, 0.95) * 1000,
+                "p99_ms": percentile(samples, 0.99) * 1000,
+                "max_ms": samples[-1] * 1000,
+            }
+            for name, (samples, count) in sorted(snapshot.items())
+        }
+
+    def format_summary(self):
+        """Fixed-width table of summary() for display"""
+        rows = self.summary()
+        if not rows:
+            return "No spans recorded yet."
+        width = max(len(name) for name in rows)
+        lines = [f"{'span'.ljust(width)}  {'n':>6}  {'p50 ms':>9}  {'p95 ms':>9}  {'p99 ms':>9}  {'max ms':>9}"]
+        for name, row in rows.items():
+            lines.append(f"{name.ljust(width)}  {row['count']:>6}  {row['p50_ms']:>9.1f}  {row['p95_ms']:>9.1f}  "
+                         f"{row['p99_ms']:>9.1f}  {row['max_ms']:>9.1f}")
+        return "\n".join(lines)
+
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+            self.counts.clear()
+
+
+# Process-wide tracer used by the instrumented modules
+tracer = Tracer()